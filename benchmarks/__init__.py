@@ -0,0 +1,53 @@
+import time
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.game_objects import Game
+from hearthbreaker.simulation import load_deck
+
+__doc__ = """
+Benchmarks for the engine's hot paths.  Each module in this package can be run on its own, for example
+``python -m benchmarks.copy_benchmark``, and prints its results.  They are not part of the unit tests.
+"""
+
+
+def mid_game_boards(count=20, turns=12, seed=0, deck1="example.hsdeck", deck2="zoo.hsdeck"):
+    """
+    Generate games which have been played part of the way through by random agents, so that each has minions,
+    effects and auras on the board and cards in hand.
+
+    :param int count: How many games to generate
+    :param int turns: How many turns to play in each game
+    :param int seed: The seed for the first game.  Game ``i`` uses ``seed + i``
+    :rtype: list[hearthbreaker.game_objects.Game]
+    """
+    games = []
+    seed_offset = 0
+    while len(games) < count:
+        game = Game([load_deck(deck1), load_deck(deck2)], [RandomAgent(), RandomAgent()], seed + seed_offset)
+        seed_offset += 1
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, turns):
+            game.play_single_turn()
+            if game.game_ended:
+                break
+        if not game.game_ended:
+            games.append(game)
+    return games
+
+
+def rate(func, items, repeat=5):
+    """
+    Time how many times per second ``func`` can be called, once for each of ``items``.  The best of ``repeat`` runs
+    is used.
+
+    :rtype: float
+    """
+    best = None
+    for run in range(0, repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return len(items) / best
@@ -0,0 +1,48 @@
+import time
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.cards import RaidLeader, StormwindChampion, DireWolfAlpha, RiverCrocolisk, MurlocRaider
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Game, Deck
+
+
+def aura_board():
+    """
+    Build a game where both players have Raid Leader, Stormwind Champion and Dire Wolf Alpha on the board, along
+    with three other minions, leaving room for one more minion each.
+
+    :rtype: hearthbreaker.game_objects.Game
+    """
+    decks = [Deck([RiverCrocolisk() for i in range(0, 30)], CHARACTER_CLASS.MAGE) for player in range(0, 2)]
+    game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 0)
+    game.pre_game()
+    for player in game.players:
+        for card in [RiverCrocolisk(), RaidLeader(), RiverCrocolisk(), StormwindChampion(), DireWolfAlpha(),
+                     RiverCrocolisk()]:
+            card.summon(player, game, len(player.minions))
+    return game
+
+
+def main():
+    game = aura_board()
+    player = game.players[0]
+    cycles = 2000
+    best = None
+    for run in range(0, 5):
+        start = time.perf_counter()
+        for cycle in range(0, cycles):
+            MurlocRaider().summon(player, game, 3)
+            player.minions[3].die(None)
+            game.check_delayed()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print("{0} minions and {1} minion auras on the board".format(
+        sum(len(p.minions) for p in game.players), sum(len(p.minion_auras) for p in game.players)))
+    print("summon and kill a minion: {0:.0f} cycles/sec".format(cycles / best))
+    print("attack of each of the first player's minions: {0}".format(
+        [minion.calculate_attack() for minion in player.minions]))
+
+
+if __name__ == "__main__":
+    main()
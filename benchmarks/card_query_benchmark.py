@@ -0,0 +1,40 @@
+from benchmarks import rate
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.cards import RiverCrocolisk
+from hearthbreaker.constants import CHARACTER_CLASS, CARD_RARITY, MINION_TYPE
+from hearthbreaker.game_objects import Game, Deck, get_cards
+from hearthbreaker.tags.base import CardQuery
+from hearthbreaker.tags.condition import IsMinion, ManaCost, CardRarity, IsWeapon, IsType, OneIn
+
+
+def _filter_every_card(query, player):
+    """
+    Choose a card the way queries did before the card table was indexed, by checking every card in the collection
+    """
+    cards = get_cards()
+    for condition in query.conditions:
+        cards = [card for card in cards if condition.evaluate(player, card)]
+    return player.game.random_choice(cards)
+
+
+def main():
+    decks = [Deck([RiverCrocolisk() for i in range(0, 30)], CHARACTER_CLASS.MAGE) for player in range(0, 2)]
+    game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 0)
+    player = game.players[0]
+    queries = [
+        ("any minion", [IsMinion()]),
+        ("2 mana minion (Piloted Shredder)", [ManaCost(2), IsMinion()]),
+        ("legendary minion (Sneed's Old Shredder)", [CardRarity(CARD_RARITY.LEGENDARY), IsMinion()]),
+        ("weapon (Blingtron 3000)", [IsWeapon()]),
+        ("beast (Webspinner)", [IsType(MINION_TYPE.BEAST)]),
+        ("beast, then a condition the index can't answer", [IsType(MINION_TYPE.BEAST), OneIn(2)]),
+    ]
+    for name, conditions in queries:
+        query = CardQuery(conditions=conditions)
+        print("{0}: {1:.0f} cards/sec checking every card, {2:.0f} cards/sec from the index".format(
+            name, rate(lambda q: _filter_every_card(q, player), [query] * 20),
+            rate(lambda q: q.get_card(player), [query] * 20)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from benchmarks import mid_game_boards, rate
+
+
+def _draw_all(deck, game):
+    while deck.can_draw():
+        deck.draw(game)
+
+
+def main():
+    games = mid_game_boards(count=50)
+    minions = sum(len(player.minions) for game in games for player in game.players)
+    print("{0} mid-game boards, {1:.1f} minions per board".format(len(games), minions / len(games)))
+    print("Game.copy(): {0:.0f} copies/sec".format(rate(lambda game: game.copy(), games)))
+    decks = [player.deck for game in games for player in game.players]
+    print("Deck.copy(): {0:.0f} copies/sec".format(rate(lambda deck: deck.copy(), decks)))
+    print("Deck.copy() then draw the rest of the deck: {0:.0f} decks/sec".format(
+        rate(lambda deck: _draw_all(deck.copy(), games[0]), decks)))
+    hands = [player.hand for game in games for player in game.players]
+    print("construct each card in a hand: {0:.0f} hands/sec".format(
+        rate(lambda hand: [type(card)() for card in hand], hands)))
+    print("Card.create() each card in a hand: {0:.0f} hands/sec".format(
+        rate(lambda hand: [type(card).create() for card in hand], hands)))
+    print("Game.checkpoint(): {0:.0f} checkpoints/sec".format(rate(lambda game: game.checkpoint(), games)))
+    checkpoints = {game: game.checkpoint() for game in games}
+    print("Game.rollback(): {0:.0f} rollbacks/sec".format(rate(lambda game: game.rollback(checkpoints[game]),
+                                                               games)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import time
+
+from hearthbreaker.game_objects import Bindable
+
+
+def unbind_time(count):
+    """
+    Time how long it takes to unbind each of ``count`` functions bound to the same event, in the order they were bound.
+
+    :param int count: How many functions to bind
+    :rtype: float
+    """
+    binder = Bindable()
+    handlers = [lambda: None for i in range(0, count)]
+    for handler in handlers:
+        binder.bind("test", handler)
+    start = time.perf_counter()
+    for handler in handlers:
+        binder.unbind("test", handler)
+    return time.perf_counter() - start
+
+
+def main():
+    # Unbinding is constant time, so unbinding four times as many handlers should take about four times as long,
+    # rather than sixteen
+    small = min(unbind_time(1000) for i in range(0, 5))
+    large = min(unbind_time(4000) for i in range(0, 5))
+    print("unbind 1000 handlers: {0:.2f} ms".format(small * 1000))
+    print("unbind 4000 handlers: {0:.2f} ms ({1:.1f} times as long)".format(large * 1000, large / small))
+
+    binder = Bindable()
+    for i in range(0, 5):
+        binder.bind("test", lambda: None)
+    triggers = 20000
+    best = None
+    for run in range(0, 5):
+        start = time.perf_counter()
+        for i in range(0, triggers):
+            binder.trigger("test")
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print("trigger an event with 5 handlers: {0:.0f} triggers/sec".format(triggers / best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import time
+
+from benchmarks import mid_game_boards
+from hearthbreaker.encoder import GameEncoder
+
+
+def _states_per_second(encoder, games, batch_size, repeat=5):
+    batches = [games[start:start + batch_size] for start in range(0, len(games), batch_size)]
+    best = None
+    for run in range(0, repeat):
+        start = time.perf_counter()
+        for batch in batches:
+            encoder.encode(batch)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return len(games) / best
+
+
+def main():
+    games = mid_game_boards(count=128)
+    print("{0} mid-game boards".format(len(games)))
+    for batch_size in [1, 16, 128]:
+        encoder = GameEncoder(batch_size)
+        rate = _states_per_second(encoder, games, batch_size)
+        print("batches of {0}: {1:.0f} states/sec".format(batch_size, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import time
+
+import numpy
+
+from hearthbreaker.environment import VectorEnvironment, GameEnvironment
+from hearthbreaker.simulation import load_deck
+
+
+def _play(count, games, seed=0):
+    # Plays ``games`` games in total, ``count`` at a time, choosing uniformly among the legal actions with one call
+    # for the whole batch
+    environment = VectorEnvironment([load_deck("example.hsdeck"), load_deck("zoo.hsdeck")], count, seed)
+    rng = numpy.random.RandomState(seed)
+    masks = environment.reset()
+    started = count
+    finished = 0
+    steps = 0
+    start = time.perf_counter()
+    while finished < games:
+        actions = numpy.where(masks, rng.random_sample(masks.shape), -1).argmax(axis=1)
+        playing = ~environment.dones
+        steps += int(playing.sum())
+        masks, rewards, dones = environment.step(actions)
+        ended = numpy.flatnonzero(dones & playing)
+        finished += len(ended)
+        # Finished games are replaced until enough have been started, and the rest are left ended
+        restart = ended[:max(0, games - started)]
+        if len(restart):
+            started += len(restart)
+            environment.reset(restart)
+    elapsed = time.perf_counter() - start
+    return steps / elapsed, finished / elapsed
+
+
+def _play_single(games, seed=0):
+    # The same, one game at a time through the reset/step interface
+    environment = GameEnvironment([load_deck("example.hsdeck"), load_deck("zoo.hsdeck")])
+    rng = numpy.random.RandomState(seed)
+    steps = 0
+    start = time.perf_counter()
+    for game in range(0, games):
+        environment.reset(seed + game)
+        done = False
+        while not done:
+            action = numpy.where(environment.mask, rng.random_sample(environment.mask.shape), -1).argmax()
+            observation, reward, done, mask = environment.step(action)
+            steps += 1
+    elapsed = time.perf_counter() - start
+    return steps / elapsed, games / elapsed
+
+
+def main():
+    for count in [1, 16, 128]:
+        steps, games = _play(count, 128)
+        print("{0} games at once: {1:.0f} moves/sec, {2:.1f} games/sec".format(count, steps, games))
+    steps, games = _play_single(128)
+    print("reset/step with observations: {0:.0f} moves/sec, {1:.1f} games/sec".format(steps, games))
+
+
+if __name__ == "__main__":
+    main()
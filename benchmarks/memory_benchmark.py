@@ -0,0 +1,52 @@
+import gc
+import tracemalloc
+
+from benchmarks import mid_game_boards, rate
+
+
+def _bytes_per_item(make, items):
+    """
+    The memory held by the objects that ``make`` creates for each item, on average
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        made = [make(item) for item in items]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size / len(made)
+
+
+def _read_attributes(minion):
+    total = 0
+    for read in range(0, 100):
+        total += minion.health + minion.base_attack + minion.attack_delta + minion.aura_attack
+        if minion.frozen or minion.dead or minion.removed:
+            total -= 1
+    return total
+
+
+def _write_attributes(minion):
+    health = minion.health
+    for write in range(0, 100):
+        minion.health = write
+        minion.frozen_this_turn = False
+    minion.health = health
+
+
+def main():
+    games = mid_game_boards(count=50)
+    minions = [minion for game in games for player in game.players for minion in player.minions]
+    cards = [card for game in games for player in game.players for card in player.hand]
+    print("{0} mid-game boards".format(len(games)))
+    print("memory per game copy: {0:.0f} bytes".format(_bytes_per_item(lambda game: game.copy(), games * 4)))
+    print("memory per minion copy: {0:.0f} bytes".format(
+        _bytes_per_item(lambda minion: minion.copy(minion.player, minion.game), minions)))
+    print("memory per card: {0:.0f} bytes".format(_bytes_per_item(lambda card: type(card)(), cards)))
+    print("minion attribute reads: {0:.0f}/sec".format(rate(_read_attributes, minions) * 100 * 7))
+    print("minion attribute writes: {0:.0f}/sec".format(rate(_write_attributes, minions) * 100 * 2))
+
+
+if __name__ == "__main__":
+    main()
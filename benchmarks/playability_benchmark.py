@@ -0,0 +1,37 @@
+from benchmarks import mid_game_boards, rate
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.game_objects import Game
+from hearthbreaker.simulation import load_deck
+
+
+def _check_hand(game):
+    player = game.current_player
+    return [card for card in player.hand if card.can_use(player, game)]
+
+
+def _check_interleaved(games):
+    # As when many games are stepped in lockstep, another game changes between two looks at the same one
+    for game, other in zip(games, games[1:] + games[:1]):
+        _check_hand(game)
+        other.current_player.trigger("interleaved")
+        _check_hand(game)
+
+
+def _play_game(seed):
+    game = Game([load_deck("example.hsdeck"), load_deck("zoo.hsdeck")], [RandomAgent(), RandomAgent()], seed)
+    game.start()
+
+
+def main():
+    games = mid_game_boards(count=50)
+    cards = sum(len(game.current_player.hand) for game in games)
+    print("{0} mid-game boards, {1:.1f} cards in the current player's hand".format(len(games), cards / len(games)))
+    print("can_use() for each card in hand: {0:.0f} hands/sec".format(rate(_check_hand, games)))
+    print("can_use() for each card in hand, twice, with an event in another game between: {0:.0f} hands/sec".format(
+        rate(_check_interleaved, [games]) * len(games) * 2))
+    print("Game.legal_moves(): {0:.0f} calls/sec".format(rate(lambda game: game.legal_moves(), games)))
+    print("whole games between random agents: {0:.1f} games/sec".format(rate(_play_game, range(0, 20), repeat=3)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import resource
+import shutil
+import tempfile
+import time
+
+from hearthbreaker.selfplay import generate
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        games = 0
+        for total in [25, 100, 400]:
+            start = time.perf_counter()
+            manifest = generate(directory, "example.hsdeck", "zoo.hsdeck", total, workers=1, chunk_size=25,
+                                shard_rows=5000)
+            elapsed = time.perf_counter() - start
+            rows = sum(shard["rows"] for chunk in manifest["chunks"] for shard in chunk["shards"])
+            # The peak resident memory of this process should stay the same as more games are played
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            print("{0} games: {1:.1f} games/sec, {2} rows in total, peak memory {3} kB".format(
+                total, (total - games) / elapsed, rows, peak))
+            games = total
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import json
+import marshal
+
+from benchmarks import mid_game_boards, rate
+from hearthbreaker.game_objects import Game
+from hearthbreaker.serialization import binary
+from hearthbreaker.serialization.serialization import serialize
+
+
+def _save_object(o):
+    return o.__to_json__()
+
+
+def main():
+    games = mid_game_boards(count=50)
+    agents = [None, None]
+    formats = [
+        ("JSON (serialize)", serialize, json.loads),
+        ("compact JSON", lambda game: json.dumps(game, default=_save_object, separators=(",", ":")), json.loads),
+        ("binary", binary.encode, binary.decode),
+        ("binary, compressed", lambda game: binary.encode(game, True), binary.decode),
+        ("binary, fast", lambda game: binary.encode(game, fast=True), binary.decode),
+        ("binary, fast and compressed", lambda game: binary.encode(game, True, True), binary.decode),
+    ]
+    print("{0} mid-game boards".format(len(games)))
+    print("(the fast binary formats can only be decoded by Pythons with marshal version {0})".format(marshal.version))
+    for name, encode, decode in formats:
+        encoded = [encode(game) for game in games]
+        size = sum(len(data) for data in encoded) / len(encoded)
+        print("{0}: {1:.0f} bytes, {2:.0f} encodes/sec, {3:.0f} decodes/sec, {4:.0f} games rebuilt/sec".format(
+            name, size, rate(encode, games), rate(decode, encoded),
+            rate(lambda data: Game.__from_json__(decode(data), agents), encoded)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import time
+
+from hearthbreaker.game_objects import card_table
+
+_IMPORT = "import hearthbreaker.game_objects"
+_NAMES = "from hearthbreaker.game_objects import card_table; [card_table.info(name).mana for name in card_table]"
+_WORKER = "from hearthbreaker.simulation import GameRunner; GameRunner(['example.hsdeck', 'zoo.hsdeck'], " \
+          "['Random', 'Random'])"
+
+
+def _cold_start(code, with_index, runs=5):
+    """
+    The fastest time out of several new processes, each running the given code
+    """
+    best = None
+    for run in range(0, runs):
+        if not with_index and os.path.exists(card_table.index_file):
+            os.remove(card_table.index_file)
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, "-W", "ignore", "-c", code])
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    baseline = _cold_start("pass", True)
+    print("starting python: {0:.0f} ms".format(baseline * 1000))
+    for name, code in [("import the game", _IMPORT), ("read every card's mana cost", _NAMES),
+                       ("start a worker with two decks", _WORKER)]:
+        print("{0}: {1:.0f} ms without the card index, {2:.0f} ms with it".format(
+            name, (_cold_start(code, False) - baseline) * 1000, (_cold_start(code, True) - baseline) * 1000))
+
+
+if __name__ == "__main__":
+    main()
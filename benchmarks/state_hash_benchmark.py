@@ -0,0 +1,19 @@
+from benchmarks import mid_game_boards, rate
+from hearthbreaker.serialization.serialization import serialize
+
+
+def _fresh_hash(game):
+    game._state_hash = None
+    return game.state_hash()
+
+
+def main():
+    games = mid_game_boards(count=50)
+    print("{0} mid-game boards".format(len(games)))
+    print("serialize() as a fingerprint: {0:.0f} games/sec".format(rate(serialize, games)))
+    print("Game.state_hash() after a change: {0:.0f} games/sec".format(rate(_fresh_hash, games)))
+    print("Game.state_hash() again: {0:.0f} games/sec".format(rate(lambda game: game.state_hash(), games)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 from hearthbreaker.agents.agent_registry import AgentRegistry as __ar__
 from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents.ismcts_agent import ISMCTSAgent
+from hearthbreaker.agents.mcts_agent import MCTSAgent
 from hearthbreaker.agents.trade_agent import TradeAgent
 
 registry = __ar__()
 
 registry.register("Random", RandomAgent)
-registry.register("Trade", TradeAgent)
\ No newline at end of file
+registry.register("Trade", TradeAgent)
+registry.register("MCTS", MCTSAgent)
+registry.register("ISMCTS", ISMCTSAgent)
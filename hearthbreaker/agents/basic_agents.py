@@ -90,6 +90,7 @@ class RandomAgent(DoNothingAgent):
         return [True, True, True, True]
 
     def do_turn(self, player):
+        self.game = player.game
         while True:
             attack_minions = [minion for minion in filter(lambda minion: minion.can_attack(), player.minions)]
             if player.hero.can_attack():
@@ -100,7 +101,7 @@ class RandomAgent(DoNothingAgent):
             else:
                 possible_actions = len(attack_minions) + len(playable_cards)
             if possible_actions > 0:
-                action = random.randint(0, possible_actions - 1)
+                action = player.game.rng.randint(0, possible_actions - 1)
                 if player.hero.power.can_use() and action == possible_actions - 1:
                     player.hero.power.use()
                 elif action < len(attack_minions):
@@ -111,10 +112,16 @@ class RandomAgent(DoNothingAgent):
                 return
 
     def choose_target(self, targets):
-        return targets[random.randint(0, len(targets) - 1)]
+        return targets[self._rng().randint(0, len(targets) - 1)]
 
     def choose_index(self, card, player):
-        return random.randint(0, len(player.minions))
+        return player.game.rng.randint(0, len(player.minions))
 
     def choose_option(self, *options):
-        return options[random.randint(0, len(options) - 1)]
+        return options[self._rng().randint(0, len(options) - 1)]
+
+    def _rng(self):
+        # The game whose turn this agent is playing, so that its choices are reproducible from that game's seed
+        if self.game is None:
+            return random
+        return self.game.rng
@@ -0,0 +1,235 @@
+import collections
+import json
+import math
+import multiprocessing
+import random
+import time
+
+from hearthbreaker.agents.mcts_agent import MCTSAgent, PlayoutAgent, _playout, _score
+from hearthbreaker.game_objects import Game, card_table
+from hearthbreaker.serialization.move import TurnEndMove
+
+__doc__ = """
+An agent which decides what to do using Information Set Monte Carlo Tree Search.
+
+The :class:`MCTSAgent <hearthbreaker.agents.mcts_agent.MCTSAgent>` searches the real game, so it can see what is in
+its opponent's hand, deck and secrets.  This agent instead only uses what a player could know: before searching, the
+opponent's hand, secrets and the cards left in their deck are replaced with cards sampled from those the agent
+hasn't seen yet (a determinization).  A single tree is searched across many determinizations, so that the agent
+favours moves which are good whatever its opponent is holding (single observer ISMCTS).
+
+The cards which haven't been seen are the opponent's deck list, less the cards on their side of the board, their
+weapon and graveyard, and the cards they have played other than secrets which are still hidden.  The opponent's
+secrets are sampled from the unseen secrets in their deck list.  Cards in the opponent's hand which weren't in their
+deck, such as The Coin, are left as they are.  The order of the deck doesn't need to be sampled, since cards are
+drawn from it at random.
+"""
+
+
+class _Node:
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.score = 0.0
+        # The number of times this node's move could have been played when its parent was visited
+        self.available = 0
+
+
+def unseen_cards(game):
+    """
+    Find the cards which the current player of a game hasn't seen their opponent use, and so may be in their
+    opponent's hand, deck or secrets.
+
+    A card is seen once it is on the opponent's side of the board, is their weapon, is in their graveyard or has been
+    played by them during this game.  Secrets aren't seen until they are revealed.  Cards played before the game was
+    copied or loaded aren't known, so only the board, weapon and graveyard are left to go by for those.
+
+    :param hearthbreaker.game_objects.Game game: The game to look at
+    :return: The names of the cards, sorted, with one entry for each copy
+    :rtype: list[str]
+    """
+    opponent = game.current_player.opponent
+    deck_list = collections.Counter(opponent.deck.card_names())
+    visible = collections.Counter(minion.card.name for minion in opponent.minions if minion.card is not None)
+    weapon = opponent.hero.weapon
+    if weapon is not None and weapon.card is not None:
+        visible[weapon.card.name] += 1
+    # The graveyard only records which minions have died, not how many of them
+    for name in opponent.graveyard:
+        visible[name] += 1
+
+    # Cards drawn from a deck are the same objects when they are played, which tells the opponent's apart
+    drawn = {id(card) for card in opponent.deck.drawn_cards()}
+    secrets = {id(secret) for secret in opponent.secrets}
+    played = collections.Counter(card.name for card in game._all_cards_played
+                                 if id(card) in drawn and id(card) not in secrets)
+    return sorted((deck_list - (visible | played)).elements())
+
+
+def determinize(game_json, opponent_index, unseen, rng):
+    """
+    Replace the hidden cards in a game's opponent's hand, deck and secrets with cards sampled from those which haven't
+    been seen.  If there aren't enough unseen cards to go round, the rest are left as they were.
+
+    :param dict game_json: The game to change, as produced by its ``__to_json__`` method.  It is changed in place.
+    :param int opponent_index: The index of the player whose cards are hidden
+    :param list[str] unseen: The names of the cards which the hidden cards are sampled from, as found by
+                             :func:`unseen_cards`
+    :param random.Random rng: The random number generator to sample with
+    :return: The changed game
+    :rtype: dict
+    """
+    player_json = game_json["players"][opponent_index]
+    deck_list = {entry["name"] for entry in player_json["deck"]}
+    cards = list(unseen)
+    rng.shuffle(cards)
+
+    # A player can't have two of the same secret at once, so each is sampled from the secrets not already chosen
+    secrets = player_json["secrets"]
+    hidden = [index for index, name in enumerate(secrets) if name in deck_list]
+    chosen = [name for name in secrets if name not in deck_list]
+    for index in hidden:
+        for position in range(len(cards) - 1, -1, -1):
+            if cards[position] not in chosen and card_table[cards[position]].is_secret():
+                secrets[index] = cards.pop(position)
+                break
+        chosen.append(secrets[index])
+
+    hand = player_json["hand"]
+    for index, name in enumerate(hand):
+        if name in deck_list and cards:
+            hand[index] = cards.pop()
+    for entry in player_json["deck"]:
+        if not entry["used"] and cards:
+            entry["name"] = cards.pop()
+    return game_json
+
+
+def search(game_json, unseen, determinizations=20, rollouts=None, time_limit=None, exploration=1.4, seed=None):
+    """
+    Search for the best move for the current player of a game, without using what is hidden in their opponent's
+    hand, deck and secrets.  The search stops once it has played out ``rollouts`` games, or after ``time_limit``
+    seconds, whichever comes first.  At least one of them must be given.
+
+    :param dict game_json: The game to search, as produced by its ``__to_json__`` method
+    :param list[str] unseen: The cards the opponent's hidden cards are sampled from, as found by
+                             :func:`unseen_cards`
+    :param int determinizations: The number of different samples of the opponent's cards to search.  The playouts
+                                 take turns between them.
+    :param int rollouts: The number of games to play out
+    :param float time_limit: The number of seconds to search for
+    :param float exploration: The exploration constant used when selecting which line to play out next
+    :param int seed: The seed for the sampling and random playouts
+    :return: A dict mapping each move tried from the current position to a pair of the number of times it was
+             played out and the total score for those games, where a win is 1, a draw 0.5 and a loss 0
+    :rtype: dict
+    """
+    rng = random.Random(seed)
+    current_player = game_json["active_player"] - 1
+    games = []
+    root = _Node()
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    else:
+        deadline = None
+
+    iterations = 0
+    while (rollouts is None or iterations < rollouts) and (deadline is None or time.perf_counter() < deadline):
+        # Each determinization is only made once it is needed, so that a short search doesn't make them all
+        if len(games) < determinizations:
+            agents = [PlayoutAgent(), PlayoutAgent()]
+            sample = determinize(json.loads(json.dumps(game_json)), 1 - current_player, unseen, rng)
+            game = Game.__from_json__(sample, agents)
+            for agent in agents:
+                agent.game = game
+            games.append((game, game.checkpoint()))
+        game, checkpoint = games[iterations % determinizations]
+        iterations += 1
+        game.rollback(checkpoint)
+        game.rng = rng
+
+        node = root
+        path = [root]
+        while True:
+            moves = game.legal_moves()
+            # Moves can be available in some determinizations but not others, so each move is judged against the
+            # number of times it could have been chosen, rather than the number of visits to its parent
+            for move in moves:
+                if move in node.children:
+                    node.children[move].available += 1
+            untried = [move for move in moves if move not in node.children]
+            if untried:
+                move = rng.choice(untried)
+                node.children[move] = _Node()
+                node.children[move].available = 1
+            else:
+                children = node.children
+
+                def upper_bound(m):
+                    child = children[m]
+                    log_available = math.log(child.available)
+                    return child.score / child.visits + exploration * math.sqrt(log_available / child.visits)
+                move = max(moves, key=upper_bound)
+            node = node.children[move]
+            path.append(node)
+            if isinstance(move, TurnEndMove):
+                break
+            move.play(game)
+            if untried or game.game_ended:
+                break
+
+        _playout(game, not isinstance(move, TurnEndMove))
+
+        score = _score(game, current_player)
+        for visited in path:
+            visited.visits += 1
+            visited.score += score
+
+    return {move: (child.visits, child.score) for move, child in root.children.items()}
+
+
+def _search_json(game_json, unseen, determinizations, rollouts, time_limit, exploration, seed):
+    return search(json.loads(game_json), unseen, determinizations, rollouts, time_limit, exploration, seed)
+
+
+class ISMCTSAgent(MCTSAgent):
+    """
+    An agent which chooses each of its moves with an Information Set Monte Carlo Tree Search over the rest of its
+    turn, sampling what its opponent may be holding rather than looking at it.  Otherwise it behaves like
+    :class:`MCTSAgent <hearthbreaker.agents.mcts_agent.MCTSAgent>`.
+    """
+
+    def __init__(self, rollouts=100, time_limit=None, workers=1, exploration=1.4, determinizations=20):
+        """
+        Create a new agent.  At least one of ``rollouts`` and ``time_limit`` must be given.
+
+        :param int rollouts: The number of games to play out for each decision, split between the workers
+        :param float time_limit: The longest time in seconds to spend on each decision, or None for no limit
+        :param int workers: The number of processes to search with.  If more than one, the determinizations are
+                            split between them, each one searches its own tree and the results are combined.
+                            Agents playing in worker processes (such as in
+                            :func:`hearthbreaker.simulation.run_batch`) can't start processes of their own, so must
+                            use 1.
+        :param float exploration: How much the search favours trying out less explored actions
+        :param int determinizations: The number of samples of the opponent's hidden cards to search for each
+                                     decision, split between the workers
+        """
+        super().__init__(rollouts, time_limit, workers, exploration)
+        self.determinizations = determinizations
+
+    def _search(self, game, seed):
+        game_json = json.dumps(game, default=lambda o: o.__to_json__())
+        unseen = unseen_cards(game)
+        if self.workers <= 1:
+            return [_search_json(game_json, unseen, self.determinizations, self.rollouts, self.time_limit,
+                                 self.exploration, seed)]
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers)
+        determinizations = int(math.ceil(self.determinizations / self.workers))
+        if self.rollouts is not None:
+            rollouts = int(math.ceil(self.rollouts / self.workers))
+        else:
+            rollouts = None
+        return self._pool.starmap(_search_json, [(game_json, unseen, determinizations, rollouts, self.time_limit,
+                                                  self.exploration, seed + worker)
+                                                 for worker in range(0, self.workers)])
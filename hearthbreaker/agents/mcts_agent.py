@@ -0,0 +1,235 @@
+import json
+import math
+import multiprocessing
+import random
+import time
+
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.game_objects import Game
+from hearthbreaker.serialization.move import TurnEndMove
+
+__doc__ = """
+An agent which decides what to do using Monte Carlo Tree Search.
+
+Before each move it makes, the agent builds a search tree of the moves available to it for the rest of its turn, as
+found by :meth:`Game.legal_moves <hearthbreaker.game_objects.Game.legal_moves>`.  Each iteration of the search plays
+one line of moves from the tree on a copy of the game, then plays the rest of that turn and of the game out with
+random agents, and counts how often each line led to a win.  The game is rolled back to a checkpoint between
+iterations, rather than copied, and the search can be split across several worker processes, each searching its own
+tree from the same position (root parallelism).
+"""
+
+
+class PlayoutAgent(RandomAgent):
+    """
+    An agent which plays randomly, except that the target, board index and option for its next move can be fixed
+    ahead of time by setting :attr:`next_target`, :attr:`next_index` and :attr:`next_option`, so that it can carry out
+    the moves found by :meth:`Game.legal_moves <hearthbreaker.game_objects.Game.legal_moves>`.  Choices which aren't
+    available are ignored.
+    """
+
+    def __init__(self):
+        super().__init__()
+        #: The character to choose the next time a target is asked for, or None to choose randomly
+        self.next_target = None
+        #: Where to place the next minion played, or -1 to choose randomly
+        self.next_index = -1
+        #: The index of the option to choose the next time one is asked for, or None to choose randomly
+        self.next_option = None
+
+    def choose_target(self, targets):
+        if self.next_target is not None and self.next_target in targets:
+            return self.next_target
+        return super().choose_target(targets)
+
+    def choose_index(self, card, player):
+        if 0 <= self.next_index <= len(player.minions):
+            return self.next_index
+        return super().choose_index(card, player)
+
+    def choose_option(self, *options):
+        if self.next_option is not None and self.next_option < len(options):
+            return options[self.next_option]
+        return super().choose_option(*options)
+
+
+class _Node:
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.score = 0.0
+
+
+def _score(game, player_index):
+    dead = game.players[player_index].hero.dead
+    opponent_dead = game.players[1 - player_index].hero.dead
+    if dead == opponent_dead:
+        return 0.5
+    if opponent_dead:
+        return 1.0
+    return 0.0
+
+
+def _playout(game, finish_turn=True):
+    # Plays a game out with its players' agents, starting with what is left of the current player's turn
+    if finish_turn and not game.game_ended:
+        game.current_player.agent.do_turn(game.current_player)
+    if not game.game_ended:
+        game._end_turn()
+    while not game.game_ended:
+        game.play_single_turn()
+
+
+def search(game_json, rollouts=None, time_limit=None, exploration=1.4, seed=None):
+    """
+    Search for the best move for the current player of a game.  The search stops once it has played out
+    ``rollouts`` games, or after ``time_limit`` seconds, whichever comes first.  At least one of them must be given.
+
+    :param dict game_json: The game to search, as produced by its ``__to_json__`` method
+    :param int rollouts: The number of games to play out
+    :param float time_limit: The number of seconds to search for
+    :param float exploration: The exploration constant used when selecting which line to play out next
+    :param int seed: The seed for the random playouts
+    :return: A dict mapping each move tried from the current position to a pair of the number of times it was
+             played out and the total score for those games, where a win is 1, a draw 0.5 and a loss 0
+    :rtype: dict
+    """
+    rng = random.Random(seed)
+    agents = [PlayoutAgent(), PlayoutAgent()]
+    game = Game.__from_json__(game_json, agents)
+    for agent in agents:
+        agent.game = game
+    player_index = game.players.index(game.current_player)
+    checkpoint = game.checkpoint()
+    root = _Node()
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    else:
+        deadline = None
+
+    iterations = 0
+    while (rollouts is None or iterations < rollouts) and (deadline is None or time.perf_counter() < deadline):
+        iterations += 1
+        game.rollback(checkpoint)
+        game.rng = rng
+
+        node = root
+        path = [root]
+        while True:
+            moves = game.legal_moves()
+            untried = [move for move in moves if move not in node.children]
+            if untried:
+                move = rng.choice(untried)
+                node.children[move] = _Node()
+            else:
+                log_visits = math.log(node.visits)
+                children = node.children
+
+                def upper_bound(m):
+                    child = children[m]
+                    return child.score / child.visits + exploration * math.sqrt(log_visits / child.visits)
+                move = max(moves, key=upper_bound)
+            node = node.children[move]
+            path.append(node)
+            if isinstance(move, TurnEndMove):
+                break
+            move.play(game)
+            if untried or game.game_ended:
+                break
+
+        _playout(game, not isinstance(move, TurnEndMove))
+
+        score = _score(game, player_index)
+        for visited in path:
+            visited.visits += 1
+            visited.score += score
+
+    return {move: (child.visits, child.score) for move, child in root.children.items()}
+
+
+def _search_json(game_json, rollouts, time_limit, exploration, seed):
+    return search(json.loads(game_json), rollouts, time_limit, exploration, seed)
+
+
+class MCTSAgent(PlayoutAgent):
+    """
+    An agent which chooses each of its moves with a Monte Carlo Tree Search over the rest of its turn.  Targets, board
+    positions and Choose One options are all part of the moves searched.  Mulligans are still chosen randomly.
+    """
+
+    def __init__(self, rollouts=100, time_limit=None, workers=1, exploration=1.4):
+        """
+        Create a new agent.  At least one of ``rollouts`` and ``time_limit`` must be given.
+
+        :param int rollouts: The number of games to play out for each decision, split between the workers
+        :param float time_limit: The longest time in seconds to spend on each decision, or None for no limit
+        :param int workers: The number of processes to search with.  If more than one, each one searches its own tree
+                            and the results are combined.  Agents playing in worker processes (such as in
+                            :func:`hearthbreaker.simulation.run_batch`) can't start processes of their own, so must
+                            use 1.
+        :param float exploration: How much the search favours trying out less explored actions
+        """
+        super().__init__()
+        if rollouts is None and time_limit is None:
+            raise ValueError("Either a rollout or time budget is needed")
+        self.rollouts = rollouts
+        self.time_limit = time_limit
+        self.workers = workers
+        self.exploration = exploration
+        self._pool = None
+
+    def do_turn(self, player):
+        self.game = player.game
+        while not player.game.game_ended:
+            move = self.choose_move(player.game)
+            if isinstance(move, TurnEndMove):
+                return
+            move.play(player.game)
+
+    def choose_move(self, game):
+        """
+        Search for the best move for the current player of a game
+
+        :param hearthbreaker.game_objects.Game game: The game to choose a move in
+        :return: One of the moves from :meth:`Game.legal_moves <hearthbreaker.game_objects.Game.legal_moves>`
+        :rtype: hearthbreaker.serialization.move.Move
+        """
+        moves = game.legal_moves()
+        if len(moves) == 1:
+            return moves[0]
+
+        # Seeding from the game means that a seeded game played by this agent can be reproduced
+        seed = game.rng.randint(0, 2 ** 31)
+        results = self._search(game, seed)
+
+        totals = {}
+        for result in results:
+            for move, (visits, score) in result.items():
+                total_visits, total_score = totals.get(move, (0, 0.0))
+                totals[move] = (total_visits + visits, total_score + score)
+        if not totals:
+            return moves[-1]
+        return max(totals, key=lambda m: totals[m])
+
+    def _search(self, game, seed):
+        # Searches the game in each worker, returning the results of each search
+        game_json = json.dumps(game, default=lambda o: o.__to_json__())
+        if self.workers <= 1:
+            return [_search_json(game_json, self.rollouts, self.time_limit, self.exploration, seed)]
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers)
+        if self.rollouts is not None:
+            rollouts = int(math.ceil(self.rollouts / self.workers))
+        else:
+            rollouts = None
+        return self._pool.starmap(_search_json, [(game_json, rollouts, self.time_limit, self.exploration,
+                                                  seed + worker) for worker in range(0, self.workers)])
+
+    def close(self):
+        """
+        Stop the worker processes used by this agent, if any.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
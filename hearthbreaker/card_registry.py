@@ -0,0 +1,247 @@
+import collections
+import importlib
+import json
+import os
+import tempfile
+import zlib
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 3.2
+    from collections import Mapping
+from hearthbreaker.constants import CARD_RARITY
+
+__doc__ = """
+Finds cards by name without having to load them all first.
+
+The names of all the cards, along with which module defines each one and some basic facts about it (its mana cost,
+class, rarity and type), are kept in an index file next to the card modules, or in the user's cache directory if the
+card modules can't be written to.  The index is built the first time it is needed, by loading every card, and is
+rebuilt whenever the card modules change.  After that, starting a new process
+only needs to read the index, and the cards themselves are loaded the first time one is looked up.  For example: ::
+
+    registry = CardRegistry()
+    registry.info("Stonetusk Boar").mana    # 1, without loading any cards
+    registry["Stonetusk Boar"]()            # loads the cards, then creates a Stonetusk Boar
+
+:data:`hearthbreaker.game_objects.card_table` is the registry used by the game.
+"""
+
+#: Facts about a card which can be found without loading it.  ``name`` is the name the card is looked up by,
+#: ``card_type`` is one of ``"minion"``, ``"spell"``, ``"secret"`` or ``"weapon"``, and ``minion_type`` is None for
+#: anything other than a minion.
+CardInfo = collections.namedtuple("CardInfo", ["name", "module", "class_name", "mana", "character_class", "rarity",
+                                               "card_type", "minion_type"])
+
+_CARDS_PACKAGE = "hearthbreaker.cards"
+_INDEX_VERSION = 1
+
+try:
+    _replace = os.replace
+except AttributeError:  # Python 3.2, where rename replaces an existing file everywhere but Windows
+    _replace = os.rename
+
+
+def _cards_directory():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "cards")
+
+
+def _cache_directory():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "hearthbreaker")
+
+
+def _default_index_file():
+    """
+    The index is kept in the cards package, unless it is installed somewhere which can't be written to
+    """
+    directory = _cards_directory()
+    if not os.access(directory, os.W_OK):
+        directory = _cache_directory()
+    return os.path.join(directory, "card_index.json")
+
+
+def _source_checksum(directory):
+    """
+    A checksum of the source of every card module, so that the index can be rebuilt when any card changes
+    """
+    checksum = 0
+    for path, directories, files in sorted(os.walk(directory)):
+        directories.sort()
+        for file_name in sorted(files):
+            if file_name.endswith(".py"):
+                checksum = zlib.crc32(file_name.encode("utf-8"), checksum)
+                with open(os.path.join(path, file_name), "rb") as source:
+                    checksum = zlib.crc32(source.read(), checksum)
+    return checksum
+
+
+def _card_type(card_type):
+    # Card is an ABC, which makes isinstance and issubclass slow enough to matter here
+    from hearthbreaker.game_objects import MinionCard, SecretCard, WeaponCard
+    if MinionCard in card_type.__mro__:
+        return "minion"
+    if SecretCard in card_type.__mro__:
+        return "secret"
+    if WeaponCard in card_type.__mro__:
+        return "weapon"
+    return "spell"
+
+
+def _build_index():
+    """
+    Load every card, and describe each one.  Only classes in the cards package which have no subclasses there are
+    cards, and if two share a name, the one found last is used.
+    """
+    from hearthbreaker.game_objects import Card
+    importlib.import_module(_CARDS_PACKAGE)
+    cards = {}
+
+    def find_cards(card_type):
+        subclasses = [subclass for subclass in card_type.__subclasses__()
+                      if subclass.__module__.startswith(_CARDS_PACKAGE)]
+        if len(subclasses) == 0 and card_type.__module__.startswith(_CARDS_PACKAGE):
+            card = card_type()
+            kind = _card_type(card_type)
+            if kind == "minion":
+                minion_type = card.minion_type
+            else:
+                minion_type = None
+            cards[card.ref_name] = CardInfo(card.ref_name, card_type.__module__, card_type.__name__, card.mana,
+                                            card.character_class, card.rarity, kind, minion_type)
+        for subclass in subclasses:
+            find_cards(subclass)
+
+    for card_class in Card.__subclasses__()[::-1]:
+        find_cards(card_class)
+    return cards
+
+
+class CardRegistry(Mapping):
+    """
+    A mapping from the name of each card to its class, which loads the cards the first time one is looked up.  Its
+    names, and the :class:`CardInfo` for each, are available without loading any cards.
+    """
+
+    def __init__(self, index_file=None):
+        """
+        Create a new registry.
+
+        :param str index_file: Where to keep the index.  Defaults to ``card_index.json`` in the cards package, or in
+                               a ``hearthbreaker`` directory in the user's cache directory if the cards package can't
+                               be written to.  If it can't be written, the index is rebuilt in each new process
+                               instead.
+        """
+        if index_file is None:
+            index_file = _default_index_file()
+        self.index_file = index_file
+        self._infos = None
+        self._classes = {}
+        self._collection = None
+        self._pools = {}
+
+    def info(self, name):
+        """
+        Describe a card without loading it.
+
+        :param str name: The name of the card
+        :rtype: CardInfo
+        :raises KeyError: If there is no card with that name
+        """
+        return self._index()[name]
+
+    def infos(self):
+        """
+        Describe every card, without loading any of them.
+
+        :rtype: list[CardInfo]
+        """
+        return list(self._index().values())
+
+    def collection(self, attributes=()):
+        """
+        Find the cards in the collection (every card except those which only appear as a result of another card) with
+        the given attributes, without loading any cards.  Each attribute is looked up in an index built the first
+        time it is used.
+
+        :param list attributes: Pairs of the name of a :class:`CardInfo` field and the value it must have
+        :return: The names of the matching cards, in the same order as iterating over this registry gives them
+        :rtype: list[str]
+        """
+        if self._collection is None:
+            self._collection = [info.name for info in self._index().values() if info.rarity != CARD_RARITY.SPECIAL]
+        pools = [self._pool(field, value) for field, value in attributes]
+        if len(pools) == 0:
+            return list(self._collection)
+        smallest = min(pools, key=len)
+        others = [set(pool) for pool in pools if pool is not smallest]
+        return [name for name in smallest if all(name in other for other in others)]
+
+    def _pool(self, field, value):
+        pools = self._pools.get(field)
+        if pools is None:
+            pools = {}
+            for name in self._collection:
+                pools.setdefault(getattr(self._index()[name], field), []).append(name)
+            self._pools[field] = pools
+        return pools.get(value, [])
+
+    def _index(self):
+        if self._infos is None:
+            self._infos = self._load_index()
+        return self._infos
+
+    def _load_index(self):
+        checksum = _source_checksum(_cards_directory())
+        try:
+            with open(self.index_file, "r") as index_file:
+                index = json.load(index_file)
+            if index["version"] == _INDEX_VERSION and index["checksum"] == checksum:
+                return collections.OrderedDict((card[0], CardInfo(*card)) for card in index["cards"])
+        except (OSError, IOError, ValueError, KeyError, TypeError):
+            pass
+
+        infos = _build_index()
+        self._save_index(checksum, infos)
+        return collections.OrderedDict(infos.items())
+
+    def _save_index(self, checksum, infos):
+        # The index is written to a temporary file which then replaces it, so that processes starting at the same
+        # time never read one that is partly written
+        directory = os.path.dirname(os.path.abspath(self.index_file))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(".tmp", ".card_index", directory)
+        except (OSError, IOError):
+            return
+        try:
+            with os.fdopen(handle, "w") as index_file:
+                json.dump({"version": _INDEX_VERSION, "checksum": checksum, "cards": list(infos.values())},
+                          index_file)
+            os.chmod(temporary, 0o644)
+            _replace(temporary, self.index_file)
+        except (OSError, IOError):
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def __getitem__(self, name):
+        card_class = self._classes.get(name)
+        if card_class is None:
+            info = self._index()[name]
+            # Importing any card module loads the whole package, which imports every other one
+            card_class = getattr(importlib.import_module(info.module), info.class_name)
+            self._classes[name] = card_class
+        return card_class
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._index())
+
+    def __contains__(self, name):
+        return name in self._index()
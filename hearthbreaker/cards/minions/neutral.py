@@ -1455,12 +1455,10 @@ class CaptainsParrot(MinionCard):
     def create_minion(self, player):
         def draw_pirate(m):
             if len(m.player.hand) < 10:
-                card = m.game.random_draw(m.player.deck.cards,
-                                          lambda c: not c.drawn and
-                                          isinstance(c, MinionCard) and c.minion_type == MINION_TYPE.PIRATE)
+                card = m.game.random_draw(m.player.deck.undrawn_cards(),
+                                          lambda c: isinstance(c, MinionCard) and c.minion_type == MINION_TYPE.PIRATE)
                 if card:
-                    card.drawn = True
-                    m.player.deck.left -= 1
+                    m.player.deck.take(card)
                     m.player.hand.append(card)
                     m.player.trigger("card_drawn")
 
@@ -80,6 +80,8 @@ class MarkOfTheWild(Card):
 
 
 class PowerOfTheWild(Card):
+    option_count = 2
+
     def __init__(self):
         super().__init__("Power of the Wild", 2, CHARACTER_CLASS.DRUID,
                          CARD_RARITY.COMMON)
@@ -144,6 +146,8 @@ class ExcessMana(Card):
 
 
 class Wrath(Card):
+    option_count = 2
+
     def __init__(self):
         super().__init__("Wrath", 2, CHARACTER_CLASS.DRUID, CARD_RARITY.COMMON,
                          hearthbreaker.targeting.find_minion_spell_target)
@@ -188,6 +192,8 @@ class HealingTouch(Card):
 
 
 class MarkOfNature(Card):
+    option_count = 2
+
     def __init__(self):
         super().__init__("Mark of Nature", 3, CHARACTER_CLASS.DRUID,
                          CARD_RARITY.COMMON,
@@ -288,6 +294,8 @@ class Swipe(Card):
 
 
 class Nourish(Card):
+    option_count = 2
+
     def __init__(self):
         super().__init__("Nourish", 5, CHARACTER_CLASS.DRUID, CARD_RARITY.RARE)
 
@@ -325,6 +333,8 @@ class Nourish(Card):
 
 
 class Starfall(Card):
+    option_count = 2
+
     def __init__(self):
         super().__init__("Starfall", 5, CHARACTER_CLASS.DRUID,
                          CARD_RARITY.RARE)
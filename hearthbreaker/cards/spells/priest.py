@@ -162,8 +162,7 @@ class Mindgames(Card):
                 minion = Minion(0, 1)
                 return minion
 
-        minion_card = game.random_draw(game.other_player.deck.cards,
-                                       lambda c: not c.drawn and isinstance(c, MinionCard))
+        minion_card = game.random_draw(game.other_player.deck.undrawn_cards(), lambda c: isinstance(c, MinionCard))
         if not minion_card:
             minion_card = ShadowOfNothing()
         else:
@@ -270,7 +269,7 @@ class Thoughtsteal(Card):
     def use(self, player, game):
         super().use(player, game)
         for i in range(0, 2):
-            new_card = game.random_draw(game.other_player.deck.cards, lambda c: not c.drawn)
+            new_card = game.random_draw(game.other_player.deck.undrawn_cards(), lambda c: True)
             if new_card:
                 new_card = copy.copy(new_card)
                 new_card.drawn = True
@@ -132,13 +132,10 @@ class SenseDemons(Card):
         super().use(player, game)
 
         for i in range(0, 2):
-            demon_card = game.random_draw(game.current_player.deck.cards,
-                                          lambda c: not c.drawn and
-                                          isinstance(c, MinionCard) and
-                                          c.minion_type == MINION_TYPE.DEMON)
+            demon_card = game.random_draw(game.current_player.deck.undrawn_cards(),
+                                          lambda c: isinstance(c, MinionCard) and c.minion_type == MINION_TYPE.DEMON)
             if demon_card:
-                demon_card.drawn = True
-                player.deck.left -= 1
+                game.current_player.deck.take(demon_card)
                 if len(player.hand) < 10:
                     player.hand.append(demon_card)
                     self.trigger("card_drawn", demon_card)
@@ -0,0 +1,167 @@
+import numpy
+
+from hearthbreaker.game_objects import card_table
+
+__doc__ = """
+Turns games into fixed-shape :mod:`numpy` arrays, for training and running models which evaluate positions.  NumPy is
+only needed by this module, not by the rest of hearthbreaker.
+
+Each game is seen from the side of its current player, so side 0 of every array is the player whose turn it is and side
+1 is their opponent.  Cards are identified by number, starting from 1 in the order of
+:data:`hearthbreaker.game_objects.card_table`, with 0 for an empty slot.  For example: ::
+
+    encoder = GameEncoder(batch_size=64)
+    arrays = encoder.encode(games)
+    arrays["minions"][0, 1, 2, MINION_FEATURES.index("attack")]   # the attack of the opponent's third minion
+
+The arrays returned are views of buffers kept by the encoder, which are overwritten by the next call to
+:meth:`GameEncoder.encode`.
+"""
+
+#: The features of each minion in the ``minions`` array, in order
+MINION_FEATURES = ("attack", "health", "max_health", "taunt", "divine_shield", "stealth", "windfury", "frozen",
+                   "can_attack", "deathrattle", "spell_targetable")
+
+#: The features of each player in the ``players`` array, in order
+PLAYER_FEATURES = ("health", "armor", "attack", "can_attack", "weapon_attack", "weapon_durability", "mana", "max_mana",
+                   "overload", "hand_size", "deck_size", "fatigue", "power_used", "secret_count")
+
+#: The names of the arrays made by :meth:`GameEncoder.encode`
+ARRAYS = ("minions", "minion_cards", "players", "weapons", "hands", "secrets")
+
+#: The most minions, cards in hand and secrets a player can have
+MAX_MINIONS = 7
+MAX_HAND = 10
+MAX_SECRETS = 5
+
+#: The number used for cards which aren't in the card table, such as those made up by hero powers
+UNKNOWN_CARD = -1
+
+_card_ids = None
+
+
+def card_ids():
+    """
+    The number standing for each card, keyed by name.
+
+    :rtype: dict[str, int]
+    """
+    global _card_ids
+    if _card_ids is None:
+        _card_ids = {name: index + 1 for index, name in enumerate(card_table)}
+    return _card_ids
+
+
+class GameEncoder:
+    """
+    Encodes batches of games into arrays, which are allocated once and reused for every batch.  The arrays are:
+
+    ``minions``
+        Float, shaped ``(games, 2, MAX_MINIONS, len(MINION_FEATURES))``.  The stats of each minion, by side and board
+        position.
+    ``minion_cards``
+        Int, shaped ``(games, 2, MAX_MINIONS)``.  The card each minion was played from.
+    ``players``
+        Float, shaped ``(games, 2, len(PLAYER_FEATURES))``.  Each player's hero, weapon, mana and the sizes of their
+        hand and deck.
+    ``weapons``
+        Int, shaped ``(games, 2)``.  The card of each hero's weapon.
+    ``hands``
+        Int, shaped ``(games, 2, MAX_HAND)``.  The cards in each player's hand, in order.  This includes the opponent's
+        hand, which a player couldn't see, so a model for choosing plays should mask it out.
+    ``secrets``
+        Int, shaped ``(games, 2, MAX_SECRETS)``.  The secrets each player has in play.
+    """
+
+    def __init__(self, batch_size=64, dtype=numpy.float32):
+        """
+        Allocate the buffers for encoding.
+
+        :param int batch_size: The most games which can be encoded at once
+        :param dtype: The type of the float arrays
+        """
+        self.batch_size = batch_size
+        self.minions = numpy.zeros((batch_size, 2, MAX_MINIONS, len(MINION_FEATURES)), dtype)
+        self.minion_cards = numpy.zeros((batch_size, 2, MAX_MINIONS), numpy.int32)
+        self.players = numpy.zeros((batch_size, 2, len(PLAYER_FEATURES)), dtype)
+        self.weapons = numpy.zeros((batch_size, 2), numpy.int32)
+        self.hands = numpy.zeros((batch_size, 2, MAX_HAND), numpy.int32)
+        self.secrets = numpy.zeros((batch_size, 2, MAX_SECRETS), numpy.int32)
+
+    def encode(self, games):
+        """
+        Encode a batch of games.
+
+        :param games: The games to encode, or a single game
+        :type games: list[hearthbreaker.game_objects.Game]
+        :return: Views of this encoder's arrays for the games encoded, keyed by the names above
+        :rtype: dict[str, numpy.ndarray]
+        :raises ValueError: If there are more games than the batch size
+        """
+        if not isinstance(games, (list, tuple)):
+            games = [games]
+        count = len(games)
+        if count > self.batch_size:
+            raise ValueError("Can only encode {0} games at once, not {1}".format(self.batch_size, count))
+        ids = card_ids()
+        # Rows are gathered into plain lists, and then written to the arrays in one go for the whole batch, which is
+        # much faster than writing each value to an array separately
+        minion_index = []
+        minion_rows = []
+        player_rows = []
+        weapon_rows = []
+        card_rows = {"minion_cards": [], "hands": [], "secrets": []}
+        for game_index, game in enumerate(games):
+            for side, player in enumerate((game.current_player, game.current_player.opponent)):
+                for position, minion in enumerate(player.minions[:MAX_MINIONS]):
+                    minion_index.append((game_index, side, position))
+                    minion_rows.append((minion.calculate_attack(), minion.health, minion.calculate_max_health(),
+                                        minion.taunt > 0, minion.divine_shield > 0, minion.stealth > 0,
+                                        minion.windfury > 0, minion.frozen, minion.can_attack(),
+                                        minion.deathrattle is not None and len(minion.deathrattle) > 0,
+                                        minion.can_be_targeted_by_spells))
+                card_rows["minion_cards"].append(_card_row(ids, [minion.card for minion in player.minions],
+                                                           MAX_MINIONS))
+                card_rows["hands"].append(_card_row(ids, player.hand, MAX_HAND))
+                card_rows["secrets"].append(_card_row(ids, player.secrets, MAX_SECRETS))
+                player_rows.append(_player_row(player))
+                weapon = player.hero.weapon
+                if weapon is not None and weapon.card is not None:
+                    weapon_rows.append(ids.get(weapon.card.ref_name, UNKNOWN_CARD))
+                else:
+                    weapon_rows.append(0)
+
+        arrays = {
+            "minions": self.minions[:count],
+            "minion_cards": self.minion_cards[:count],
+            "players": self.players[:count],
+            "weapons": self.weapons[:count],
+            "hands": self.hands[:count],
+            "secrets": self.secrets[:count],
+        }
+        if count == 0:
+            return arrays
+        arrays["minions"].fill(0)
+        if minion_rows:
+            games_at, sides_at, positions_at = zip(*minion_index)
+            arrays["minions"][games_at, sides_at, positions_at] = minion_rows
+        arrays["players"].reshape(count * 2, -1)[:] = player_rows
+        arrays["weapons"].reshape(-1)[:] = weapon_rows
+        for name, rows in card_rows.items():
+            arrays[name].reshape(count * 2, -1)[:] = rows
+        return arrays
+
+
+def _card_row(ids, cards, size):
+    row = [ids.get(card.ref_name, UNKNOWN_CARD) for card in cards[:size]]
+    row.extend([0] * (size - len(row)))
+    return row
+
+
+def _player_row(player):
+    hero = player.hero
+    weapon = hero.weapon
+    return (hero.health, hero.armor, hero.calculate_attack(), hero.can_attack(),
+            weapon.base_attack if weapon is not None else 0, weapon.durability if weapon is not None else 0,
+            player.mana, player.max_mana, player.overload, len(player.hand), player.deck.left,
+            player.fatigue, hero.power.used, len(player.secrets))
@@ -0,0 +1,337 @@
+import numpy
+
+from hearthbreaker.agents.mcts_agent import PlayoutAgent
+from hearthbreaker.encoder import GameEncoder, ARRAYS, MAX_HAND, MAX_MINIONS
+from hearthbreaker.game_objects import Game
+from hearthbreaker.serialization.move import PlayMove, AttackMove, PowerMove, TurnEndMove
+
+__doc__ = """
+Runs many games side by side in one process, one move at a time, so that the moves for all of them can be chosen by a
+single call to a batched policy, such as a model written with :mod:`numpy`.  For example: ::
+
+    environment = VectorEnvironment([deck1, deck2], count=256, seed=0)
+    masks = environment.reset()
+    while not environment.dones.all():
+        scores = policy(environment.observe(), masks)
+        actions = numpy.where(masks, scores, -numpy.inf).argmax(axis=1)
+        masks, rewards, dones = environment.step(actions)
+
+:class:`GameEnvironment` plays a single game in the same way, with a ``reset``/``step`` interface like that of an
+OpenAI Gym environment.
+
+Every move a player could make is given a fixed number, so that the legal moves of each game can be given as a row of
+booleans.  The numbers are laid out as follows, where characters are numbered from the side of the player whose turn
+it is: 0 for their hero, 1 to 7 for their minions, 8 for the opposing hero and 9 to 15 for the opposing minions.
+
+* :data:`END_TURN` ends the turn.
+* Playing a card starts at :data:`PLAY_OFFSET`, and is numbered by the card's place in the hand, its option (for
+  cards with Choose One), the board position a minion is put in, and its target (0 for none, otherwise the character's
+  number plus one).
+* Attacking starts at :data:`ATTACK_OFFSET`, and is numbered by the attacking character and the character attacked.
+* Using the hero power starts at :data:`POWER_OFFSET`, and is numbered by its target as for playing a card.
+
+:func:`action_index` gives the number for a move found by
+:meth:`Game.legal_moves <hearthbreaker.game_objects.Game.legal_moves>`.  NumPy is needed by this module, but not by the
+rest of hearthbreaker.
+"""
+
+#: The number of characters which can be on the board, both heroes and up to seven minions each
+CHARACTER_SLOTS = 2 * (MAX_MINIONS + 1)
+
+#: The most options any card has to choose from
+MAX_OPTIONS = 2
+
+#: The number of targets a card or hero power can be given, counting no target at all
+TARGET_SLOTS = CHARACTER_SLOTS + 1
+
+#: The number of board positions a minion can be placed in
+BOARD_POSITIONS = MAX_MINIONS + 1
+
+#: The action for ending the turn
+END_TURN = 0
+
+#: The first action for playing a card
+PLAY_OFFSET = 1
+
+#: The first action for attacking
+ATTACK_OFFSET = PLAY_OFFSET + MAX_HAND * MAX_OPTIONS * BOARD_POSITIONS * TARGET_SLOTS
+
+#: The first action for using the hero power
+POWER_OFFSET = ATTACK_OFFSET + (MAX_MINIONS + 1) * CHARACTER_SLOTS
+
+#: The total number of actions
+ACTION_COUNT = POWER_OFFSET + TARGET_SLOTS
+
+
+def action_index(game, move):
+    """
+    Find the number of a move in the action space described above.
+
+    :param hearthbreaker.game_objects.Game game: The game the move is to be made in
+    :param hearthbreaker.serialization.move.Move move: A move for the current player of that game
+    :rtype: int
+    """
+    if isinstance(move, TurnEndMove):
+        return END_TURN
+    if isinstance(move, PlayMove):
+        option = move.card.option or 0
+        position = max(move.index, 0)
+        return PLAY_OFFSET + ((move.card.card_ref * MAX_OPTIONS + option) * BOARD_POSITIONS + position) * \
+            TARGET_SLOTS + _target_slot(game, move.target)
+    if isinstance(move, AttackMove):
+        return ATTACK_OFFSET + _character_slot(game, move.character) * CHARACTER_SLOTS + \
+            _character_slot(game, move.target)
+    if isinstance(move, PowerMove):
+        return POWER_OFFSET + _target_slot(game, move.target)
+    raise ValueError("Moves of type {0} have no action".format(type(move).__name__))
+
+
+def _character_slot(game, proxy):
+    side = 0 if game.players[0 if proxy.player_ref == "p1" else 1] is game.current_player else 1
+    if proxy.minion_ref is None:
+        return side * (MAX_MINIONS + 1)
+    return side * (MAX_MINIONS + 1) + proxy.minion_ref + 1
+
+
+def _target_slot(game, proxy):
+    if proxy is None:
+        return 0
+    return _character_slot(game, proxy) + 1
+
+
+class VectorEnvironment:
+    """
+    A batch of games played in lockstep.  Each call to :meth:`step` makes one move in every game which hasn't ended,
+    so whichever player's turn it is in each game moves.  The players' own agents are replaced by
+    :class:`hearthbreaker.agents.mcts_agent.PlayoutAgent`, which carries out the moves chosen and picks randomly for
+    anything else, such as the mulligan and the targets of random effects.
+
+    A game which ends stays ended, with no legal actions, until it is started again by :meth:`reset`.
+    """
+
+    def __init__(self, decks, count, seed=None):
+        """
+        Set up the environment.  No games are played until :meth:`reset` is called.
+
+        :param list[hearthbreaker.game_objects.Deck] decks: The decks the two players use in every game.  They are
+                                                            copied for each game, rather than used directly
+        :param int count: The number of games to play at once
+        :param int seed: If given, the games are seeded in order starting from this value, so that the games played
+                         are the same from one run to the next
+        """
+        self.decks = decks
+        self.count = count
+        self.seed = seed
+        #: The games being played
+        self.games = [None] * count
+        #: Which actions are legal in each game, shaped ``(count, ACTION_COUNT)``
+        self.masks = numpy.zeros((count, ACTION_COUNT), numpy.bool_)
+        #: Which games have ended
+        self.dones = numpy.ones(count, numpy.bool_)
+        self._moves = [{} for index in range(0, count)]
+        self._games_started = 0
+        self._encoder = None
+
+    def reset(self, indices=None):
+        """
+        Start new games.
+
+        :param indices: Which games to start again, or None for all of them
+        :type indices: list[int]
+        :return: The legal actions in each game, as for :attr:`masks`
+        :rtype: numpy.ndarray
+        """
+        if indices is None:
+            indices = range(0, self.count)
+        for index in indices:
+            if self.seed is None:
+                seed = None
+            else:
+                seed = self.seed + self._games_started
+            self._games_started += 1
+            game = _new_game(self.decks, [PlayoutAgent(), PlayoutAgent()], seed)
+            self.games[index] = game
+            self.dones[index] = game.game_ended
+            self._moves[index] = _find_moves(game, self.masks[index])
+        return self.masks
+
+    def step(self, actions):
+        """
+        Make one move in each game which hasn't ended.
+
+        :param actions: The action to take in each game, shaped ``(count,)``.  Actions for games which have ended are
+                        ignored
+        :type actions: numpy.ndarray
+        :return: The legal actions in each game afterwards, as for :attr:`masks`, the reward for each move from the
+                 point of view of the player who made it (1 if it won the game, -1 if it lost the game and 0
+                 otherwise), and which games have ended
+        :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        :raises ValueError: If any of the actions is not legal, in which case no moves are made
+        """
+        if len(actions) != self.count:
+            raise ValueError("Expected {0} actions, not {1}".format(self.count, len(actions)))
+        moves = [None] * self.count
+        for index, action in enumerate(actions):
+            if not self.dones[index]:
+                moves[index] = self._moves[index].get(int(action))
+                if moves[index] is None:
+                    raise ValueError("Action {0} is not legal in game {1}".format(action, index))
+
+        rewards = numpy.zeros(self.count, numpy.float32)
+        for index, move in enumerate(moves):
+            if move is None:
+                continue
+            game = self.games[index]
+            player = game.current_player
+            _make_move(game, move)
+            if game.game_ended:
+                rewards[index] = _reward(player)
+                self.dones[index] = True
+            self._moves[index] = _find_moves(game, self.masks[index])
+        return self.masks, rewards, self.dones
+
+    def observe(self):
+        """
+        Encode every game with a :class:`hearthbreaker.encoder.GameEncoder`, from the side of the player whose turn it
+        is.  The arrays are overwritten by the next call.
+
+        :rtype: dict[str, numpy.ndarray]
+        """
+        if self._encoder is None:
+            self._encoder = GameEncoder(self.count)
+        return self._encoder.encode(self.games)
+
+
+class GameEnvironment:
+    """
+    A single game, played one move at a time through :meth:`reset` and :meth:`step`, in the style of an OpenAI Gym
+    environment.  Every decision the agent interface would ask of a player during their turn, such as where to put a
+    minion, which option of a Choose One card to use and what to target, is part of choosing an action instead.  For
+    example: ::
+
+        environment = GameEnvironment([deck1, deck2], opponent=RandomAgent())
+        observation = environment.reset(seed=0)
+        done = False
+        while not done:
+            action = policy(observation, environment.mask)
+            observation, reward, done, mask = environment.step(action)
+
+    The observation is a dict of arrays from :class:`hearthbreaker.encoder.GameEncoder`, seen from the side of the
+    player to move.  It, and :attr:`mask`, are the same arrays every step, overwritten in place, so that nothing is
+    allocated for them as the game goes on.  Copy them to keep them.
+    """
+
+    def __init__(self, decks, opponent=None):
+        """
+        Set up the environment.  No game is played until :meth:`reset` is called.
+
+        :param list[hearthbreaker.game_objects.Deck] decks: The decks of the two players.  They are copied for each
+                                                            game, rather than used directly
+        :param hearthbreaker.agents.basic_agents.Agent opponent: If given, this agent plays the second deck, and the
+                                                                 environment only stops for the turns of the player
+                                                                 with the first deck.  Otherwise every move of both
+                                                                 players is chosen through :meth:`step`
+        """
+        self.decks = decks
+        self.opponent = opponent
+        #: The game being played
+        self.game = None
+        #: Which actions are legal, shaped ``(ACTION_COUNT,)``
+        self.mask = numpy.zeros(ACTION_COUNT, numpy.bool_)
+        self._moves = {}
+        self._player = None
+        self._encoder = GameEncoder(1)
+        self._observation = {name: getattr(self._encoder, name)[0] for name in ARRAYS}
+
+    def reset(self, seed=None):
+        """
+        Start a new game.
+
+        :param int seed: The seed for the game, or None to use the global random number generator
+        :return: The observation of the first position to move from
+        :rtype: dict[str, numpy.ndarray]
+        """
+        agent = PlayoutAgent()
+        if self.opponent is None:
+            agents = [agent, PlayoutAgent()]
+        else:
+            agents = [agent, self.opponent]
+        self.game = _new_game(self.decks, agents, seed)
+        self._player = self.game.players[0] if self.game.players[0].agent is agent else self.game.players[1]
+        self._play_opponent()
+        self._moves = _find_moves(self.game, self.mask)
+        return self._observe()
+
+    def step(self, action):
+        """
+        Make a move.  If there is an opponent, and the move ends the turn, the opponent's turn is played as well.
+
+        :param int action: The action to take
+        :return: The observation of the next position to move from, the reward for the move (1 if the player who made
+                 it has won the game, -1 if they have lost it, and 0 otherwise), whether the game has ended, and which
+                 actions are legal next, as for :attr:`mask`
+        :rtype: (dict[str, numpy.ndarray], float, bool, numpy.ndarray)
+        :raises ValueError: If the action is not legal, including when the game has ended
+        """
+        move = self._moves.get(int(action))
+        if move is None:
+            raise ValueError("Action {0} is not legal".format(action))
+        player = self.game.current_player
+        _make_move(self.game, move)
+        self._play_opponent()
+        self._moves = _find_moves(self.game, self.mask)
+        if self.game.game_ended:
+            return self._observe(), _reward(player), True, self.mask
+        return self._observe(), 0, False, self.mask
+
+    def _play_opponent(self):
+        if self.opponent is None:
+            return
+        game = self.game
+        while not game.game_ended and game.current_player is not self._player:
+            game.current_player.agent.do_turn(game.current_player)
+            game._end_turn()
+            if not game.game_ended:
+                game._start_turn()
+
+    def _observe(self):
+        self._encoder.encode([self.game])
+        return self._observation
+
+
+def _reward(player):
+    if player.hero.dead == player.opponent.hero.dead:
+        return 0
+    if player.opponent.hero.dead:
+        return 1
+    return -1
+
+
+def _new_game(decks, agents, seed):
+    game = Game([deck.copy() for deck in decks], agents, seed)
+    for agent in agents:
+        agent.game = game
+    game.pre_game()
+    game.current_player = game.players[1]
+    game._start_turn()
+    return game
+
+
+def _make_move(game, move):
+    if isinstance(move, TurnEndMove):
+        game._end_turn()
+        if not game.game_ended:
+            game._start_turn()
+    else:
+        move.play(game)
+
+
+def _find_moves(game, mask):
+    # Marks the legal actions of a game in its row of a mask, and returns the move for each of them
+    mask.fill(False)
+    moves = {}
+    for move in game.legal_moves():
+        action = action_index(game, move)
+        moves[action] = move
+        mask[action] = True
+    return moves
@@ -1,32 +1,53 @@
+import collections
 import copy
-import importlib
+import itertools
 import random
 import abc
+import bisect
+import hashlib
+import heapq
+import operator
+import types
 import hearthbreaker.powers
-from hearthbreaker.tags.base import Aura, AuraUntil, Deathrattle, Effect, Enrage, Buff, BuffUntil
+from hearthbreaker.tags.base import Aura, AuraUntil, Deathrattle, Effect, Enrage, Buff, BuffUntil, JSONObject
 from hearthbreaker.tags.event import TurnEnded
 from hearthbreaker.tags.selector import CurrentPlayer
 from hearthbreaker.tags.status import ChangeAttack, ChangeHealth, Charge, Taunt, Stealth, DivineShield, Windfury, \
     SpellDamage, NoSpellTarget
 import hearthbreaker.targeting
 import hearthbreaker.constants
+from hearthbreaker.card_registry import CardRegistry
 
-card_table = {}
+#: Every card in the game, keyed by name.  See :class:`hearthbreaker.card_registry.CardRegistry`
+card_table = CardRegistry()
 
+#: The prototype of each kind of card, along with the function which writes its slots and their values.  See
+#: :meth:`Card.create`
+_card_prototypes = {}
 
-def __create_card_table():
-    importlib.import_module("hearthbreaker.cards")
+_zobrist_keys = {}
+_HASH_MASK = (1 << 64) - 1
 
-    def __card_lookup_rec(card_type):
-        subclasses = card_type.__subclasses__()
-        if len(subclasses) is 0:
-            c = card_type()
-            card_table[c.ref_name] = card_type
-        for sub_type in subclasses:
-            __card_lookup_rec(sub_type)
 
-    for card_class in Card.__subclasses__()[::-1]:
-        __card_lookup_rec(card_class)
+def _zobrist_key(feature):
+    """
+    The random-looking 64 bit number standing for one feature of a game's state, such as a particular minion at a
+    particular place on the board.  It is derived from the feature itself rather than from Python's own hashing, so it
+    is the same in every process.
+
+    :param tuple feature: A tuple of strings, numbers, booleans and tuples of those describing the feature
+    :rtype: int
+    """
+    key = _zobrist_keys.get(feature)
+    if key is None:
+        key = int.from_bytes(hashlib.sha1(repr(feature).encode("utf-8")).digest()[:8], "little")
+        _zobrist_keys[feature] = key
+    return key
+
+
+def _structures(tags):
+    # The structures of a list of tags such as effects or buffs, for use in a feature passed to _zobrist_key
+    return tuple(tag.structure() for tag in tags)
 
 
 def card_lookup(card_name):
@@ -41,14 +62,12 @@ def card_lookup(card_name):
 
     card = card_table[card_name]
     if card is not None:
-        return card()
+        return card.create()
     return None
 
 
 def get_cards():
-    card_list = filter(lambda c: c.rarity != hearthbreaker.constants.CARD_RARITY.SPECIAL,
-                       [card() for card in card_table.values()])
-    return card_list
+    return [card_table[name]() for name in card_table.collection()]
 
 
 class GameException(Exception):
@@ -60,6 +79,57 @@ class GameException(Exception):
         super().__init__(message)
 
 
+class _EventHandlers:
+    """
+    The handlers bound to a single event of a :class:`Bindable`, in the order they were bound.  Each handler is a
+    ``[function, once]`` pair.
+
+    Functions are indexed so that unbinding them doesn't search the list.  Instead, their handlers are marked as
+    removed by setting their function to None, and are cleared out of the list once they outnumber the live handlers
+    and the event isn't being triggered.
+    """
+
+    __slots__ = ['handlers', 'index', 'live', 'triggering']
+
+    def __init__(self):
+        self.handlers = []
+        self.index = {}
+        self.live = 0
+        self.triggering = 0
+
+    def add(self, function, once):
+        handler = [function, once]
+        self.handlers.append(handler)
+        if function in self.index:
+            self.index[function].append(handler)
+        else:
+            self.index[function] = [handler]
+        self.live += 1
+
+    def remove(self, function):
+        if function in self.index:
+            for handler in self.index.pop(function):
+                handler[0] = None
+                self.live -= 1
+            self.tidy()
+
+    def remove_handler(self, handler):
+        same_function = self.index[handler[0]]
+        for index in range(0, len(same_function)):
+            if same_function[index] is handler:
+                del same_function[index]
+                break
+        if not same_function:
+            del self.index[handler[0]]
+        handler[0] = None
+        self.live -= 1
+        self.tidy()
+
+    def tidy(self):
+        if not self.triggering and len(self.handlers) > 2 * self.live:
+            self.handlers = [handler for handler in self.handlers if handler[0] is not None]
+
+
 class Bindable:
     """
     A class which inherits from Bindable has an event structure added to it.
@@ -113,6 +183,8 @@ class Bindable:
     Any class which subclasses this class must be sure to call :meth:`__init__`
     """
 
+    __slots__ = ['events']
+
     def __init__(self):
         """
         Set up a new :class:`Bindable`.  Must be called by any subclasses.
@@ -130,9 +202,9 @@ class Bindable:
         """
 
         if event not in self.events:
-            self.events[event] = []
+            self.events[event] = _EventHandlers()
 
-        self.events[event].append((function, False))
+        self.events[event].add(function, False)
 
     def bind_once(self, event, function):
         """
@@ -146,9 +218,9 @@ class Bindable:
         """
 
         if event not in self.events:
-            self.events[event] = []
+            self.events[event] = _EventHandlers()
 
-        self.events[event].append((function, True))
+        self.events[event].add(function, True)
 
     def trigger(self, event, *args):
         """
@@ -160,15 +232,38 @@ class Bindable:
         :param list args: The arguments to pass to the bound function
         :see: :class:`Bindable`
         """
+        # Anything worked out from the game's state is kept until its version changes.  See Game.state_version
+        game = self._state_game()
+        if game is not None:
+            game.state_version += 1
         if event in self.events:
-            for handler in copy.copy(self.events[event]):
-                if event in self.events and handler in self.events[event]:
-                    if handler[1]:
-                        self.events[event].remove(handler)
-                        # tidy up the events dict so we don't have entries for events with no handlers
-                        if len(self.events[event]) is 0:
-                            del(self.events[event])
-                    handler[0](*args)
+            event_handlers = self.events[event]
+            handlers = event_handlers.handlers
+            # Handlers bound while the event is being triggered are added past the end, and so aren't called.  Ones
+            # unbound have their function set to None, so they aren't either.
+            event_handlers.triggering += 1
+            try:
+                for index in range(0, len(handlers)):
+                    function, once = handlers[index]
+                    if function is not None:
+                        if once:
+                            event_handlers.remove_handler(handlers[index])
+                            self._tidy_event(event, event_handlers)
+                        function(*args)
+            finally:
+                event_handlers.triggering -= 1
+                event_handlers.tidy()
+                if game is not None:
+                    game.state_version += 1
+
+    def _state_game(self):
+        """
+        The game which this object is part of, whose version changes when this object's events are triggered, or None
+        if it isn't part of one yet.
+
+        :rtype: Game
+        """
+        return None
 
     def unbind(self, event, function):
         """
@@ -180,9 +275,13 @@ class Bindable:
         :param function function: The function to unbind.
         """
         if event in self.events:
-            self.events[event] = [handler for handler in self.events[event] if not handler[0] == function]
-            if len(self.events[event]) is 0:
-                del (self.events[event])
+            self.events[event].remove(function)
+            self._tidy_event(event, self.events[event])
+
+    def _tidy_event(self, event, event_handlers):
+        # tidy up the events dict so we don't have entries for events with no handlers
+        if event_handlers.live == 0 and self.events.get(event) is event_handlers:
+            del self.events[event]
 
 
 class GameObject:
@@ -190,6 +289,9 @@ class GameObject:
     Provides typing for the various game objects in the engine.  Allows for checking the type of an object without
     needing to know about and import the various objects in the game engine
     """
+
+    __slots__ = ()
+
     def __init__(self, effects=None, auras=None, buffs=None):
         # A list of the effects that this player has
         if effects:
@@ -350,6 +452,10 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
      This common superclass handles all of the status tags and calculations involved in attacking or being attacked.
     """
 
+    __slots__ = ['effects', 'auras', 'buffs', 'player', 'health', 'base_health', 'base_attack', 'active', 'dead',
+                 'windfury', 'used_windfury', 'frozen', 'frozen_this_turn', 'immune', 'delayed', 'stealth', 'enraged',
+                 'removed', 'born', 'attack_delta', 'health_delta', 'enrage', 'current_target', '__dict__']
+
     def __init__(self, attack_power, health, enrage=None, effects=None, auras=None, buffs=None):
         """
         Create a new Character with the given attack power and health
@@ -383,7 +489,7 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         self.player = None
         #: Whether or not this character is immune to damage (but not other tags)
         self.immune = 0
-        #: The list of delayed events
+        #: The list of delayed events, as pairs of the event and its arguments
         self.delayed = []
         #: Non zero if this character has stealth
         self.stealth = 0
@@ -402,6 +508,11 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         #: The character that this minion is attacking, while it is carrying out its attack
         self.current_target = None
 
+    def _state_game(self):
+        if self.player is None:
+            return None
+        return self.player.game
+
     def _remove_stealth(self):
         if self.stealth:
             for buff in self.buffs:
@@ -427,20 +538,7 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         if not self.can_attack():
             raise GameException("That minion cannot attack")
 
-        found_taunt = False
-        targets = []
-        for enemy in self.player.game.other_player.minions:
-            if enemy.taunt and enemy.can_be_attacked():
-                found_taunt = True
-            if enemy.can_be_attacked():
-                targets.append(enemy)
-
-        if found_taunt:
-            targets = [target for target in targets if target.taunt]
-        else:
-            targets.append(self.player.game.other_player.hero)
-
-        target = self.choose_target(targets)
+        target = self.choose_target(self.get_attack_targets())
         self._remove_stealth()
         self.current_target = target
         self.player.trigger("character_attack", self, target)
@@ -462,6 +560,27 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         self.stealth = False
         self.current_target = None
 
+    def get_attack_targets(self):
+        """
+        Find the characters that this character could attack.  If any enemy minions have taunt, only they can be
+        attacked.
+
+        :rtype: list[Character]
+        """
+        found_taunt = False
+        targets = []
+        for enemy in self.player.game.other_player.minions:
+            if enemy.taunt and enemy.can_be_attacked():
+                found_taunt = True
+            if enemy.can_be_attacked():
+                targets.append(enemy)
+
+        if found_taunt:
+            targets = [target for target in targets if target.taunt]
+        else:
+            targets.append(self.player.game.other_player.hero)
+        return targets
+
     def choose_target(self, targets):
         """
         Consults the associated player to select a target from a list of targets
@@ -496,8 +615,9 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         :param list args: The arguments to pass to the handler when it is called.
         :see: :class:`Bindable`
         """
-        self.delayed.append({'event': event, 'args': args})
-        self.player.game.delayed_minions.add(self)
+        if not self.delayed:
+            self.player.game.queue_delayed(self)
+        self.delayed.append((event, args))
 
     def activate_delayed(self):
         """
@@ -505,8 +625,8 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
 
         :see: :meth:`delayed_trigger`
         """
-        for delayed in self.delayed:
-            self.trigger(delayed['event'], *delayed['args'])
+        for event, args in self.delayed:
+            self.trigger(event, *args)
 
         self.delayed = []
 
@@ -735,6 +855,16 @@ class Card(Bindable, GameObject):
     cause its effect, but not update the game state.
     """
 
+    __slots__ = ['name', 'ref_name', 'mana', 'character_class', 'rarity', 'cancel', 'targetable', 'targets', 'target',
+                 'get_targets', 'filter_func', 'overload', 'drawn', '_found_targets', '_found_cost', '__dict__']
+
+    #: The number of options the player must choose between when playing this card (Choose One), or 0 if there are none
+    option_count = 0
+
+    #: The attributes which hold tags that are changed by being played, such as a battlecry's buffs, which remember the
+    #: character they were given to.  See :meth:`create`
+    _played_tags = ()
+
     def __init__(self, name, mana, character_class, rarity, target_func=None,
                  filter_func=_is_spell_targetable, overload=0, ref_name=None):
         """
@@ -775,13 +905,54 @@ class Card(Bindable, GameObject):
         self.rarity = rarity
         self.cancel = False
         self.targetable = target_func is not None
-        if self.targetable:
-            self.targets = []
-            self.target = None
-            self.get_targets = target_func
-            self.filter_func = filter_func
+        self.targets = []
+        self.target = None
+        self.get_targets = target_func
+        self.filter_func = filter_func
         self.overload = overload
         self.drawn = True
+        self._found_targets = None
+        self._found_cost = None
+
+    @classmethod
+    def create(cls):
+        """
+        Create a new card of this kind, the same as calling its constructor with no arguments would, but much more
+        cheaply.
+
+        The first card of each kind is made with the constructor, and kept as a prototype.  Each card created after that
+        shares everything about the prototype which doesn't change during a game, such as its name, cost, targeting
+        functions and tags, and has its own events and targets.  Tags which are changed by being played are only copied
+        when the card is played.
+
+        :rtype: Card
+        """
+        if cls not in _card_prototypes:
+            prototype = cls()
+            names, optional, read, write = _slots(cls)
+            _card_prototypes[cls] = prototype, write, read(prototype)
+        prototype, write, values = _card_prototypes[cls]
+        card = cls.__new__(cls)
+        write(card, values)
+        if prototype.__dict__:
+            card.__dict__.update(prototype.__dict__)
+        card.events = {}
+        card.targets = []
+        return card
+
+    def _own_played_tags(self):
+        """
+        Replace any tags this card shares with its prototype which are changed by being played with its own.
+        """
+        if type(self) not in _card_prototypes:
+            return
+        prototype = _card_prototypes[type(self)][0]
+        shared = [name for name in self._played_tags
+                  if getattr(self, name) is not None and getattr(self, name) is getattr(prototype, name)]
+        if shared:
+            own = type(self)()
+            for name in shared:
+                setattr(self, name, getattr(own, name))
 
     def can_use(self, player, game):
         """
@@ -796,12 +967,23 @@ class Card(Bindable, GameObject):
         if game.game_ended:
             return False
         if self.targetable:
-            self.targets = self.get_targets(game, self.filter_func)
+            self.targets = self._find_targets(game)
             if self.targets is not None and len(self.targets) is 0:
                 return False
 
         return player.mana >= self.mana_cost(player)
 
+    def _find_targets(self, game):
+        """
+        Find the possible targets for this card, reusing the ones found last time if the game hasn't changed since.
+        """
+        found = self._found_targets
+        if found is not None and found[0] == game.state_version and found[1] is game:
+            return found[2]
+        targets = self.get_targets(game, self.filter_func)
+        self._found_targets = (game.state_version, game, targets)
+        return targets
+
     def mana_cost(self, player):
         """
         Calculates the mana cost for this card.
@@ -814,6 +996,18 @@ class Card(Bindable, GameObject):
         :return: representing the actual mana cost of this card.
         :rtype: int
         """
+        if not player.mana_filters:
+            return self.mana
+        # Working through the player's mana filters is the slow part, and only needs doing when the game has changed
+        found = self._found_cost
+        version = player.game.state_version
+        if found is not None and found[0] == version and found[1] is player:
+            return found[2]
+        cost = self._filter_mana_cost(player)
+        self._found_cost = (version, player, cost)
+        return cost
+
+    def _filter_mana_cost(self, player):
         calc_mana = self.mana
         for mana_filter in player.mana_filters:
             if mana_filter.filter(self):
@@ -867,6 +1061,11 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
     :see: :class:`Card`
     :see: :meth:`create_minion`
     """
+
+    __slots__ = ['minion_type', 'battlecry', 'choices', 'combo']
+
+    _played_tags = ('battlecry', 'choices', 'combo')
+
     def __init__(self, name, mana, character_class, rarity, minion_type=hearthbreaker.constants.MINION_TYPE.NONE,
                  targeting_func=None, filter_func=_battlecry_targetable, ref_name=None, battlecry=None,
                  choices=None, combo=None, overload=0):
@@ -901,6 +1100,8 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
         self.minion_type = minion_type
         self.battlecry = battlecry
         self.choices = choices
+        if choices:
+            self.option_count = len(choices)
         self.combo = combo
 
     def can_use(self, player, game):
@@ -939,6 +1140,7 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
         if len(player.minions) >= 7:
             raise GameException("Only 7 minions allowed on the field at a time")
         super().use(player, game)
+        self._own_played_tags()
         minion = self.create_minion(player)
         minion.card = self
         minion.player = player
@@ -1025,10 +1227,17 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
 
 
 class SecretCard(Card, metaclass=abc.ABCMeta):
+    __slots__ = ['player']
+
     def __init__(self, name, mana, character_class, rarity):
         super().__init__(name, mana, character_class, rarity, None)
         self.player = None
 
+    def _state_game(self):
+        if self.player is None:
+            return None
+        return self.player.game
+
     def can_use(self, player, game):
         return super().can_use(player, game) and self.name not in [secret.name for secret in player.secrets]
 
@@ -1060,6 +1269,9 @@ class SecretCard(Card, metaclass=abc.ABCMeta):
 
 
 class Minion(Character):
+    __slots__ = ['game', 'card', 'index', 'charge', 'taunt', 'divine_shield', 'can_be_targeted_by_spells', 'battlecry',
+                 'deathrattle', 'aura_attack', 'aura_health', 'exhausted']
+
     def __init__(self, attack, health, battlecry=None,
                  deathrattle=None, taunt=False, charge=False, spell_damage=0, divine_shield=False, stealth=False,
                  windfury=False, spell_targetable=True, effects=None, auras=None, buffs=None,
@@ -1100,13 +1312,7 @@ class Minion(Character):
             self.buffs.append(Buff(SpellDamage(spell_damage)))
 
     def add_to_board(self, index):
-        aura_affects = {}
-        for player in self.game.players:
-            for aura in player.minion_auras:
-                aura_affects[aura] = set()
-                for minion in self.player.minions:
-                    if aura.match(minion):
-                        aura_affects[aura].add(minion)
+        aura_affects = self._aura_affects([aura for player in self.game.players for aura in player.minion_auras])
         self.game.minion_counter += 1
         self.player.minions.insert(index, self)
         self.born = self.game.minion_counter
@@ -1120,15 +1326,41 @@ class Minion(Character):
         self.attach(self, self.player)
         for player in self.game.players:
             for aura in player.minion_auras:
-                for minion in self.player.minions:
-                    if aura in aura_affects:
-                        is_in = minion in aura_affects[aura]
-                        if not is_in and aura.match(minion):
-                            aura.status.act(aura.owner, minion)
-                        elif is_in and not aura.match(minion):
-                            aura.status.unact(aura.owner, minion)
+                if aura in aura_affects:
+                    affected = aura_affects[aura]
+                    if affected is None:
+                        if aura.match(self):
+                            aura.status.act(aura.owner, self)
+                    else:
+                        self._update_aura(aura, affected)
         self.trigger("added_to_board", self, index)
 
+    def _aura_affects(self, auras):
+        """
+        Find which of this minion's player's minions each of the given auras currently affects, before the board is
+        changed.  Auras with a stable selector aren't affected by the change, except for the minion being placed, so
+        are mapped to None rather than checked.
+        """
+        aura_affects = {}
+        for aura in auras:
+            if aura.selector.stable:
+                aura_affects[aura] = None
+            else:
+                aura_affects[aura] = set(minion for minion in self.player.minions if aura.match(minion))
+        return aura_affects
+
+    def _update_aura(self, aura, affected):
+        """
+        Apply or remove an aura from each of this minion's player's minions it has started or stopped affecting,
+        given the minions it affected before the board was changed
+        """
+        for minion in self.player.minions:
+            is_in = minion in affected
+            if not is_in and aura.match(minion):
+                aura.status.act(aura.owner, minion)
+            elif is_in and not aura.match(minion):
+                aura.status.unact(aura.owner, minion)
+
     def calculate_attack(self):
         """
         Calculates the amount of attack this :class:`Minion` has, including the base attack, any temporary attack
@@ -1146,12 +1378,7 @@ class Minion(Character):
 
     def remove_from_board(self):
         if not self.removed:
-            aura_affects = {}
-            for aura in self.player.minion_auras:
-                aura_affects[aura] = set()
-                for minion in self.player.minions:
-                    if aura.match(minion):
-                        aura_affects[aura].add(minion)
+            aura_affects = self._aura_affects(self.player.minion_auras)
             for minion in self.player.minions:
                 if minion.index > self.index:
                     minion.index -= 1
@@ -1159,12 +1386,9 @@ class Minion(Character):
             self.player.trigger("minion_removed", self)
             self.removed = True
             for aura in self.player.minion_auras:
-                for minion in self.player.minions:
-                    is_in = minion in aura_affects[aura]
-                    if not is_in and aura.match(minion):
-                        aura.status.act(aura.owner, minion)
-                    elif is_in and not aura.match(minion):
-                        aura.status.unact(aura.owner, minion)
+                affected = aura_affects[aura]
+                if affected is not None:
+                    self._update_aura(aura, affected)
 
     def replace(self, new_minion):
         """
@@ -1258,7 +1482,7 @@ class Minion(Character):
         new_minion.exhausted = self.exhausted
         new_minion.born = self.born
         card_type = type(self.card)
-        new_minion.card = card_type()
+        new_minion.card = card_type.create()
         new_minion.player = new_owner
         if new_game:
             new_minion.game = new_game
@@ -1325,6 +1549,10 @@ class WeaponCard(Card, metaclass=abc.ABCMeta):
     Represents a :class:`Card` for creating a :class:`Weapon`
     """
 
+    __slots__ = ['battlecry', 'combo']
+
+    _played_tags = ('battlecry', 'combo')
+
     def __init__(self, name, mana, character_class, rarity, target_func=None, filter_func=lambda t: not t.stealth,
                  overload=0, battlecry=None, combo=None):
         """
@@ -1364,6 +1592,7 @@ class WeaponCard(Card, metaclass=abc.ABCMeta):
         :param Game game: The game this weapon will be used in
         """
         super().use(player, game)
+        self._own_played_tags()
         weapon = self.create_weapon(player)
         weapon.card = self
         weapon.player = player
@@ -1399,6 +1628,9 @@ class Weapon(Bindable, GameObject):
     attacks is handled by :class:`Hero`, but it can be modified through the use of events.
     """
 
+    __slots__ = ['effects', 'auras', 'buffs', 'player', 'base_attack', 'durability', 'battlecry', 'deathrattle', 'card',
+                 'game', '__dict__']
+
     def __init__(self, attack_power, durability, battlecry=None, deathrattle=None,
                  effects=None, auras=None, buffs=None):
         """
@@ -1424,10 +1656,16 @@ class Weapon(Bindable, GameObject):
         #: The :class:`WeaponCard` that created this weapon
         self.card = None
 
+    def _state_game(self):
+        if self.player is None:
+            return None
+        return self.player.game
+
     def copy(self, new_owner):
         new_weapon = Weapon(self.base_attack, self.durability, self.battlecry, copy.deepcopy(self.deathrattle),
                             copy.deepcopy(self.effects), copy.deepcopy(self.auras), copy.deepcopy(self.buffs))
         new_weapon.player = new_owner
+        new_weapon.card = self.card
         return new_weapon
 
     def destroy(self):
@@ -1473,24 +1711,66 @@ class Weapon(Bindable, GameObject):
 
 
 class Deck:
+    """
+    The cards a player has yet to draw.  A deck always has 30 cards, each of which is marked as drawn once it has
+    left the deck.
+
+    The cards are only created when they are needed.  The deck keeps the class of each card, along with the positions
+    of those which haven't been drawn, so a random card can be drawn without checking every card, and a copy of the
+    deck only needs to share the cards that have already been drawn.
+    """
+
     def __init__(self, cards, character_class):
         if len(cards) != 30:
             raise GameException("Deck must have exactly 30 cards in it")
-        self.cards = cards
         self.character_class = character_class
         for card in cards:
             card.drawn = False
         self.left = 30
+        self._types = tuple(type(card) for card in cards)
+        self._cards = list(cards)
+        self._undrawn = list(range(0, 30))
+        self._exposed = False
+
+    @property
+    def cards(self):
+        """
+        All 30 cards in this deck, in order, whether drawn or not.
+
+        Marking one of these cards as drawn directly is still supported, but means the deck can no longer keep track
+        of which cards are left, and will check every card each time one is drawn.  Use :meth:`undrawn_cards` and
+        :meth:`take` instead.
+
+        :rtype: list[Card]
+        """
+        for position in range(0, 30):
+            self._card(position)
+        self._exposed = True
+        return self._cards
+
+    def _card(self, position):
+        card = self._cards[position]
+        if card is None:
+            card = self._types[position].create()
+            card.drawn = False
+            self._cards[position] = card
+        return card
+
+    def _undrawn_positions(self):
+        if self._exposed:
+            self._undrawn = [position for position, card in enumerate(self._cards) if not card.drawn]
+        return self._undrawn
 
     def copy(self):
-        def copy_card(card):
-            new_card = type(card)()
-            new_card.drawn = card.drawn
-            return new_card
         new_deck = Deck.__new__(Deck)
-        new_deck.cards = [copy_card(card) for card in self.cards]
         new_deck.character_class = self.character_class
         new_deck.left = self.left
+        new_deck._types = self._types
+        # Cards which have already been drawn are never drawn again, so they can be shared with the copy.  See
+        # put_back, which replaces them instead of un-drawing them.  The others are created again when needed.
+        new_deck._cards = [card if card is not None and card.drawn else None for card in self._cards]
+        new_deck._undrawn = list(self._undrawn_positions())
+        new_deck._exposed = False
         return new_deck
 
     def can_draw(self):
@@ -1499,51 +1779,108 @@ class Deck:
     def draw(self, game):
         if not self.can_draw():
             raise GameException("Cannot draw more than 30 cards")
-        card = game.random_draw(self.cards, lambda c: not c.drawn)
+        undrawn = self._undrawn_positions()
+        if len(undrawn) == 0:
+            raise GameException("There are no cards left to draw")
+        position = undrawn.pop(game.random_amount(0, len(undrawn) - 1))
+        card = self._card(position)
         card.drawn = True
         self.left -= 1
         return card
 
+    def undrawn_cards(self):
+        """
+        The cards which haven't been drawn yet, in the order they appear in the deck.
+
+        :rtype: list[Card]
+        """
+        return [self._card(position) for position in self._undrawn_positions()]
+
+    def drawn_cards(self):
+        """
+        The cards which have been drawn from this deck, in the order they appear in the deck.
+
+        :rtype: list[Card]
+        """
+        return [card for card in self._cards if card is not None and card.drawn]
+
+    def take(self, card):
+        """
+        Draw a particular card from this deck, such as one chosen from :meth:`undrawn_cards`.
+
+        :param Card card: The card to draw
+        """
+        position = self._position(card)
+        if card.drawn:
+            raise GameException("Tried to take a card that has already been drawn")
+        card.drawn = True
+        if not self._exposed:
+            self._undrawn.remove(position)
+        self.left -= 1
+
     def put_back(self, card):
-        for index in range(0, 30):
-            if self.cards[index] == card:
-                if not card.drawn:
-                    raise GameException("Tried to put back a card that hadn't been used yet")
-                self.cards[index].drawn = False
-                self.left += 1
-                return
-        raise GameException("Tried to put back a card that didn't come from this deck")
+        position = self._position(card)
+        if not card.drawn:
+            raise GameException("Tried to put back a card that hadn't been used yet")
+        # The drawn card may be shared with copies of this deck, so it is replaced rather than changed
+        self._cards[position] = None
+        self._card(position)
+        if not self._exposed:
+            bisect.insort(self._undrawn, position)
+        self.left += 1
+
+    def _position(self, card):
+        for position in range(0, 30):
+            if self._cards[position] is card:
+                return position
+        raise GameException("Tried to use a card that didn't come from this deck")
+
+    def card_names(self):
+        """
+        The names of all 30 cards in this deck, in order, whether drawn or not.
+
+        :rtype: list[str]
+        """
+        return [self._card(position).name for position in range(0, 30)]
 
     def __to_json__(self):
         card_list = []
         for index in range(0, 30):
+            card = self._card(index)
             card_list.append({
-                'name': self.cards[index].name,
-                'used': self.cards[index].drawn
+                'name': card.name,
+                'used': card.drawn
             })
         return card_list
 
     @classmethod
     def __from__to_json__(cls, dd, character_class):
+        types = []
         cards = []
-        used = []
-        left = 30
-        for entry in dd:
-            card = card_lookup(entry["name"])
-            card.drawn = entry["used"]
-            cards.append(card)
-            used.append(entry["used"])
+        undrawn = []
+        for position, entry in enumerate(dd):
+            card_type = card_table[entry["name"]]
+            types.append(card_type)
             if entry["used"]:
-                left -= 1
+                card = card_type()
+                card.drawn = True
+                cards.append(card)
+            else:
+                cards.append(None)
+                undrawn.append(position)
         deck = Deck.__new__(Deck)
-        deck.cards = cards
-        deck.used = used
-        deck.left = left
+        deck._types = tuple(types)
+        deck._cards = cards
+        deck._undrawn = undrawn
+        deck._exposed = False
+        deck.left = len(undrawn)
         deck.character_class = character_class
         return deck
 
 
 class Hero(Character):
+    __slots__ = ['armor', 'weapon', 'bonus_attack', 'character_class', 'game', 'power']
+
     def __init__(self, character_class, player):
         super().__init__(0, 30)
 
@@ -1572,6 +1909,7 @@ class Hero(Character):
         new_hero.frozen = False
         new_hero.frozen_this_turn = False
         new_hero.active = self.active
+        new_hero.power.used = self.power.used
         new_hero.effects = copy.deepcopy(self.effects)
         new_hero.auras = copy.deepcopy(self.auras)
         new_hero.buffs = copy.deepcopy(self.buffs)
@@ -1632,6 +1970,7 @@ class Hero(Character):
             'frozen_for': frozen_for,
             'used_windfury': self.used_windfury,
             'already_attacked': not self.active,
+            'used_power': self.power.used,
         })
         return r_val
 
@@ -1649,6 +1988,7 @@ class Hero(Character):
         hero.immune = hd["immune"]
         hero.used_windfury = hd["used_windfury"]
         hero.active = not hd["already_attacked"]
+        hero.power.used = hd.get("used_power", False)
         if hd['weapon']:
             hero.weapon = Weapon.__from_json__(hd["weapon"], player)
         return hero
@@ -1683,6 +2023,9 @@ class Player(Bindable):
         self.cards_played = 0
         self.dead_this_turn = []
 
+    def _state_game(self):
+        return self.game
+
     def __str__(self):  # pragma: no cover
         return "Player: " + self.name
 
@@ -1692,18 +2035,20 @@ class Player(Bindable):
         copied_player.hero = self.hero.copy(copied_player, new_game)
         copied_player.graveyard = copy.copy(self.graveyard)
         copied_player.minions = [minion.copy(copied_player, new_game) for minion in self.minions]
-        copied_player.hand = [type(card)() for card in self.hand]
+        copied_player.hand = [type(card).create() for card in self.hand]
         copied_player.spell_damage = self.spell_damage
         copied_player.mana = self.mana
         copied_player.max_mana = self.max_mana
         copied_player.overload = self.overload
+        copied_player.fatigue = self.fatigue
+        copied_player.cards_played = self.cards_played
         copied_player.dead_this_turn = copy.copy(self.dead_this_turn)
         for effect in self.effects:
             effect = copy.copy(effect)
             copied_player.add_effect(effect)
         copied_player.secrets = []
         for secret in self.secrets:
-            new_secret = type(secret)()
+            new_secret = type(secret).create()
             new_secret.player = copied_player
             copied_player.secrets.append(new_secret)
         for aura in filter(lambda a: isinstance(a, AuraUntil), self.player_auras):
@@ -1734,6 +2079,43 @@ class Player(Bindable):
     def can_draw(self):
         return self.deck.can_draw()
 
+    def _hash_state(self, index):
+        """
+        Combine the keys of everything about this player which :meth:`Game.state_hash` covers.
+
+        :param int index: The index of this player in its game's list of players
+        :rtype: int
+        """
+        hero = self.hero
+        value = _zobrist_key(("mana", index, self.mana, self.max_mana, self.overload))
+        value ^= _zobrist_key(("player", index, self.fatigue, self.spell_damage, self.cards_played,
+                               type(hero.power).__name__, hero.power.used, _structures(self.effects),
+                               _structures(self.player_auras)))
+        value ^= _zobrist_key(("hero", index, hero.character_class, hero.health, hero.armor, hero.calculate_attack(),
+                               hero.immune, hero.frozen, hero.frozen_this_turn, hero.used_windfury, hero.active,
+                               _structures(hero.effects), _structures(hero.auras), _structures(hero.buffs)))
+        if hero.weapon is not None:
+            value ^= _zobrist_key(("weapon", index, hero.weapon.card and hero.weapon.card.name,
+                                   hero.weapon.base_attack, hero.weapon.durability))
+        for position, minion in enumerate(self.minions):
+            value ^= _zobrist_key(("minion", index, position, type(minion.card).__name__, minion.calculate_attack(),
+                                   minion.health, minion.calculate_max_health(), bool(minion.taunt),
+                                   bool(minion.divine_shield), bool(minion.stealth), bool(minion.windfury),
+                                   minion.frozen, minion.frozen_this_turn, minion.exhausted, minion.active,
+                                   minion.immune, len(minion.deathrattle), _structures(minion.deathrattle),
+                                   _structures(minion.enrage or ()), _structures(minion.effects),
+                                   _structures(minion.auras), _structures(minion.buffs)))
+        for position, card in enumerate(self.hand):
+            value ^= _zobrist_key(("hand", index, position, type(card).__name__))
+        for position, secret in enumerate(self.secrets):
+            value ^= _zobrist_key(("secret", index, position, type(secret).__name__))
+        # The order of the cards left in the deck doesn't matter, as they are drawn at random, so their keys are added
+        # rather than each being tied to a position
+        deck = 0
+        for position in self.deck._undrawn_positions():
+            deck += _zobrist_key(("deck", index, self.deck._types[position].__name__))
+        return value ^ (deck & _HASH_MASK)
+
     def effective_spell_damage(self, base_damage):
         return (base_damage + self.spell_damage) * self.spell_multiplier
 
@@ -1776,9 +2158,9 @@ class Player(Bindable):
 
     def remove_aura(self, aura):
         if isinstance(aura.selector, hearthbreaker.tags.selector.MinionSelector):
-            self.minion_auras = [au for au in filter(lambda a: not a.eq(aura), self.minion_auras)]
+            self.minion_auras = [au for au in self.minion_auras if au is not aura]
         else:
-            self.player_auras = [au for au in filter(lambda a: not a.eq(aura), self.player_auras)]
+            self.player_auras = [au for au in self.player_auras if au is not aura]
         aura.unapply()
 
     def choose_target(self, targets):
@@ -1801,6 +2183,9 @@ class Player(Bindable):
             'minions': self.minions,
             'mana': self.mana,
             'max_mana': self.max_mana,
+            'overload': self.overload,
+            'fatigue': self.fatigue,
+            'cards_played': self.cards_played,
             'name': self.name,
         }
 
@@ -1816,6 +2201,9 @@ class Player(Bindable):
             hero.weapon.player = player
         player.mana = pd["mana"]
         player.max_mana = pd["max_mana"]
+        player.overload = pd.get("overload", 0)
+        player.fatigue = pd.get("fatigue", 0)
+        player.cards_played = pd.get("cards_played", 0)
         player.name = pd['name']
         player.hand = [card_lookup(name) for name in pd["hand"]]
         player.graveyard = set()
@@ -1837,10 +2225,245 @@ class Player(Bindable):
         return player
 
 
+class _GlobalRandom:
+    """
+    The random number generator used by games which weren't given a seed.  It draws from the global generator of the
+    :mod:`random` module, so that :func:`random.seed` still controls these games, and it is shared by every copy of
+    such a game rather than duplicated.
+    """
+
+    def __getattr__(self, item):
+        return getattr(random, item)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_global_random = _GlobalRandom()
+
+_SKIP, _OBJECT, _LIST, _DICT, _SET, _TUPLE, _METHOD, _FUNCTION, _RANDOM = range(9)
+_state_kinds = {list: _LIST, dict: _DICT, set: _SET, tuple: _TUPLE, types.MethodType: _METHOD,
+                types.FunctionType: _FUNCTION}
+
+
+_slot_accessors = {}
+_UNSET = object()
+#: Runs an iterator to the end, without keeping any of what it produces
+_consume = collections.deque(maxlen=0).extend
+
+
+def _slots(obj_type):
+    """
+    Find the attributes which instances of a class keep in slots rather than in their ``__dict__``, along with
+    functions to read all of them at once, and to write them all back.
+
+    :return: The names, as a tuple, and the functions, as returned by :func:`_slot_functions`, or None if there are no
+             slots
+    """
+    if obj_type not in _slot_accessors:
+        names = []
+        for cls in obj_type.__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in ('__dict__', '__weakref__') and name not in names:
+                    names.append(name)
+        _slot_accessors[obj_type] = _slot_functions(tuple(names), frozenset()) if names else None
+    return _slot_accessors[obj_type]
+
+
+def _slot_functions(names, optional):
+    """
+    Make functions to read a tuple of the values of the given slots of an object, and to write such a tuple back.
+    Checkpoints read and write every slot of every object in a game, so the slots which are always set are read all
+    at once with :func:`operator.attrgetter`.
+
+    :param tuple names: The names of the slots
+    :param frozenset optional: The slots which might not be set.  These are read as ``_UNSET`` if they aren't, and
+                               written back by deleting them.  Reading any other slot which isn't set raises
+                               AttributeError
+    :return: A tuple of the names, the optional names, the reading function and the writing function
+    """
+    required = tuple(name for name in names if name not in optional)
+    unset = tuple(name for name in names if name in optional)
+    if len(required) == 1:
+        get_one = operator.attrgetter(required[0])
+
+        def read_required(obj):
+            return get_one(obj),
+    elif required:
+        read_required = operator.attrgetter(*required)
+    else:
+        def read_required(obj):
+            return ()
+
+    if unset:
+        def read(obj):
+            return read_required(obj) + tuple(getattr(obj, name, _UNSET) for name in unset)
+    else:
+        read = read_required
+
+    # The values are in the order they are read, with the optional slots last.  Mapping setattr over the others is the
+    # quickest way to set them, as the loop runs in C.
+    count = len(required)
+
+    def write_required(obj, values):
+        _consume(map(setattr, itertools.repeat(obj, count), required, values))
+
+    if unset:
+        def write(obj, values):
+            write_required(obj, values)
+            for name, value in zip(unset, values[count:]):
+                if value is not _UNSET:
+                    setattr(obj, name, value)
+                elif hasattr(obj, name):
+                    delattr(obj, name)
+    else:
+        write = write_required
+    return names, optional, read, write
+
+
+def _state_kind(obj_type):
+    if obj_type not in _state_kinds:
+        if issubclass(obj_type, (Bindable, _EventHandlers, GameObject, Deck, JSONObject, hearthbreaker.powers.Power)):
+            _state_kinds[obj_type] = _OBJECT
+        elif issubclass(obj_type, random.Random):
+            _state_kinds[obj_type] = _RANDOM
+        else:
+            _state_kinds[obj_type] = _SKIP
+    return _state_kinds[obj_type]
+
+
+class Checkpoint:
+    """
+    A saved state of a :class:`Game`, which the game can be rolled back to any number of times with
+    :meth:`Game.rollback`.  Checkpoints are made with :meth:`Game.checkpoint`.
+
+    Rather than copying the game, a checkpoint keeps an undo log of the contents of every object, list, dict, set and
+    closure which makes up the game's state.  Rolling back writes those contents back in place, so that no game objects
+    are created, and anything created since the checkpoint is simply dropped.  This makes it much cheaper to try out
+    many lines of play from one position than copying the game for each of them.
+
+    The agents playing the game are not part of its state, and are not rolled back.  Neither is the global random
+    generator used by games which weren't given a seed.
+    """
+
+    def __init__(self, game):
+        """
+        Record the current state of a game.
+
+        :param Game game: The game to record
+        """
+        self.game = game
+        self._dicts = []
+        self._empty_dicts = []
+        self._slots = []
+        self._lists = []
+        self._sets = []
+        self._cells = []
+        self._generators = []
+        seen = set()
+        stack = [game]
+        while stack:
+            obj = stack.pop()
+            kind = _state_kind(type(obj))
+            if kind is _SKIP or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if kind is _OBJECT:
+                slots = _slots(type(obj))
+                if slots:
+                    names, optional, read, write = slots
+                    try:
+                        values = read(obj)
+                    except AttributeError:
+                        # Some of this class's slots are only set some of the time, such as a card's targets
+                        optional = optional.union(name for name in names if not hasattr(obj, name))
+                        names, optional, read, write = _slot_functions(names, optional)
+                        _slot_accessors[type(obj)] = names, optional, read, write
+                        values = read(obj)
+                    self._slots.append((obj, write, values))
+                    stack.extend(values)
+                if hasattr(obj, '__dict__'):
+                    if obj.__dict__:
+                        self._dicts.append((obj.__dict__, obj.__dict__.copy()))
+                        stack.extend(obj.__dict__.values())
+                    else:
+                        # Most objects with slots have nothing else, but might by the time the game is rolled back
+                        self._empty_dicts.append(obj.__dict__)
+            elif kind is _LIST:
+                self._lists.append((obj, obj[:]))
+                stack.extend(obj)
+            elif kind is _DICT:
+                self._dicts.append((obj, obj.copy()))
+                stack.extend(obj)
+                stack.extend(obj.values())
+            elif kind is _SET:
+                self._sets.append((obj, obj.copy()))
+                stack.extend(obj)
+            elif kind is _TUPLE:
+                stack.extend(obj)
+            elif kind is _METHOD:
+                stack.append(obj.__self__)
+            elif kind is _FUNCTION:
+                # Handlers bound as closures can keep state of their own between turns
+                for cell in obj.__closure__ or ():
+                    self._cells.append((cell, cell.cell_contents))
+                    stack.append(cell.cell_contents)
+            else:
+                self._generators.append((obj, obj.getstate()))
+
+    def restore(self):
+        """
+        Put the game back into the state it was in when this checkpoint was made.
+        """
+        # The version is part of the game's state, but must keep going up, or anything worked out since the
+        # checkpoint was made would be taken as still being current
+        version = self.game.state_version
+        for saved_dict, contents in self._dicts:
+            saved_dict.clear()
+            saved_dict.update(contents)
+        for saved_dict in self._empty_dicts:
+            if saved_dict:
+                saved_dict.clear()
+        for obj, write, values in self._slots:
+            write(obj, values)
+        for saved_list, contents in self._lists:
+            saved_list[:] = contents
+        for saved_set, contents in self._sets:
+            saved_set.clear()
+            saved_set.update(contents)
+        for cell, contents in self._cells:
+            cell.cell_contents = contents
+        for generator, state in self._generators:
+            generator.setstate(state)
+        self.game.state_version = version + 1
+
+
 class Game(Bindable):
-    def __init__(self, decks, agents):
+    def __init__(self, decks, agents, seed=None):
+        """
+        Create a new game between two decks.
+
+        :param list[Deck] decks: The decks for the two players
+        :param list agents: The agents which will make decisions for the two players
+        :param int seed: If given, the game will use its own random number generator seeded with this value, so that
+                         the game (and any copies of it) can be reproduced regardless of what else uses the
+                         :mod:`random` module.  Otherwise the global generator from :mod:`random` is used.
+        """
         super().__init__()
-        self.delayed_minions = set()
+        #: The random number generator all random events in this game are drawn from
+        self.rng = _global_random if seed is None else random.Random(seed)
+        self._delayed_characters = []
+        self._delayed_count = 0
+        #: A number which goes up whenever the state of this game might have changed, so that anything worked out from
+        #: the state can be kept until it does.  Every action in a game triggers events, and it goes up each time one
+        #: is triggered on the game or any of its players, characters or weapons, both before and after the functions
+        #: bound to it are called.  It also goes up when the game is rolled back, and when :meth:`state_changed` is
+        #: called.
+        self.state_version = 0
+        self._state_hash = None
         self.first_player = self._generate_random_between(0, 1)
         if self.first_player is 0:
             play_order = [0, 1]
@@ -1859,6 +2482,9 @@ class Game(Bindable):
         self._has_turn_ended = True
         self._all_cards_played = []
 
+    def _state_game(self):
+        return self
+
     def random_draw(self, cards, requirement):
         filtered_cards = [card for card in filter(requirement, cards)]
         if len(filtered_cards) > 0:
@@ -1872,13 +2498,31 @@ class Game(Bindable):
         return self._generate_random_between(minimum, maximum)
 
     def _generate_random_between(self, lowest, highest):
-        return random.randint(lowest, highest)
+        return self.rng.randint(lowest, highest)
+
+    def queue_delayed(self, character):
+        """
+        Queue a character which has delayed events to be activated by the next call to :meth:`check_delayed`.
+
+        :param Character character: The character with delayed events
+        :see: :meth:`Character.delayed_trigger`
+        """
+        # The count keeps characters born at the same time (the heroes) in the order they were queued
+        self._delayed_count += 1
+        heapq.heappush(self._delayed_characters, (character.born, self._delayed_count, character))
 
     def check_delayed(self):
-        sorted_minions = sorted(self.delayed_minions, key=lambda m: m.born)
-        self.delayed_minions = set()
-        for minion in sorted_minions:
-            minion.activate_delayed()
+        """
+        Activate the delayed events of every queued character, in the order the characters were born.  Any character
+        which has delayed events queued while this happens, after its own events have already been activated, is left
+        for the next call.
+        """
+        if not self._delayed_characters:
+            return
+        queued = self._delayed_characters
+        self._delayed_characters = []
+        while queued:
+            heapq.heappop(queued)[2].activate_delayed()
 
     def pre_game(self):
         if self.__pre_game_run:
@@ -1982,8 +2626,13 @@ class Game(Bindable):
 
     def copy(self):
         copied_game = copy.copy(self)
+        if self.rng is not _global_random:
+            copied_game.rng = copy.copy(self.rng)
         copied_game.events = {}
+        copied_game.state_version = 0
+        copied_game._state_hash = None
         copied_game._all_cards_played = []
+        copied_game._delayed_characters = []
         copied_game.players = [player.copy(copied_game) for player in self.players]
         if self.current_player is self.players[0]:
             copied_game.current_player = copied_game.players[0]
@@ -2009,6 +2658,126 @@ class Game(Bindable):
             secret.activate(copied_game.other_player)
         return copied_game
 
+    def state_changed(self):
+        """
+        Mark the state of this game as changed, so that anything worked out from it, such as :meth:`state_hash` and
+        the targets and costs of cards, is worked out again.  Triggering an event or rolling back already does this,
+        so it is only needed after changing the game's objects directly.
+        """
+        self.state_version += 1
+
+    def state_hash(self):
+        """
+        Get a 64 bit fingerprint of the state of this game, for use as the key of a transposition table or a cache of
+        results.  Games in the same state have the same fingerprint, including copies made with :meth:`copy` and games
+        loaded from JSON, in this or any other process.
+
+        The fingerprint covers whose turn it is, each player's mana, overload, fatigue, spell damage, cards played this
+        turn, hero and hero power, weapon, minions (with their current attack, health and statuses), hand, secrets and
+        the cards left in their deck.  It is made by combining a key for each of these in the style of Zobrist
+        hashing.  Effects and auras are only covered through what they do to these, and
+        the state of the random number generator isn't covered at all.
+
+        The fingerprint is kept until an event is next triggered or the game is rolled back, so reading it again
+        before the game changes costs nothing.  The game's own actions always trigger events, but anything which
+        changes the game directly, without triggering an event, must call :meth:`state_changed` afterwards.
+
+        :rtype: int
+        """
+        if self._state_hash is not None and self._state_hash[0] == self.state_version:
+            return self._state_hash[1]
+        value = _zobrist_key(("turn", self.players.index(self.current_player), self.game_ended))
+        for index, player in enumerate(self.players):
+            value ^= player._hash_state(index)
+        self._state_hash = (self.state_version, value)
+        return value
+
+    def legal_moves(self):
+        """
+        Find every move the current player could make.  Each card which can be played is listed once for every
+        combination of target, board position (for minions) and option (for cards with Choose One), and each character
+        which can attack is listed once for every character it could attack.  Using the hero power and ending the turn
+        are also included, with ending the turn always last.
+
+        The moves can be carried out with their :meth:`play <hearthbreaker.serialization.move.Move.play>` method, as
+        long as the current player's agent chooses targets, positions and options as it is told to through its
+        ``next_target``, ``next_index`` and ``next_option`` attributes, as
+        :class:`hearthbreaker.agents.mcts_agent.PlayoutAgent` does.  Moves compare equal if they describe the same
+        action, so they can be used as dictionary keys.
+
+        :return: The legal moves, or an empty list if the game has ended
+        :rtype: list[hearthbreaker.serialization.move.Move]
+        """
+        from hearthbreaker.proxies import ProxyCard
+        from hearthbreaker.serialization.move import PlayMove, AttackMove, PowerMove, TurnEndMove
+
+        if self.game_ended:
+            return []
+        player = self.current_player
+        moves = []
+        for card_index, card in enumerate(player.hand):
+            if not card.can_use(player, self):
+                continue
+            if card.targetable and card.targets:
+                targets = card.targets
+            else:
+                targets = [None]
+            if card.is_minion():
+                board_indices = range(0, len(player.minions) + 1)
+            else:
+                board_indices = [-1]
+            for option in range(0, card.option_count) if card.option_count else [None]:
+                card_proxy = ProxyCard(card_index)
+                card_proxy.set_option(option)
+                for target in targets:
+                    for board_index in board_indices:
+                        moves.append(PlayMove(card_proxy, board_index, target))
+
+        attackers = [minion for minion in player.minions if minion.can_attack()]
+        if player.hero.can_attack():
+            attackers.append(player.hero)
+        for attacker in attackers:
+            for target in attacker.get_attack_targets():
+                moves.append(AttackMove(attacker, target))
+
+        if player.hero.power.can_use():
+            if player.hero.power.targeted:
+                for target in hearthbreaker.targeting.find_spell_target(self, lambda t: t.spell_targetable()):
+                    moves.append(PowerMove(target))
+            else:
+                moves.append(PowerMove())
+
+        moves.append(TurnEndMove())
+        return moves
+
+    def checkpoint(self):
+        """
+        Save the current state of this game so that it can later be restored with :meth:`rollback`.  This is intended
+        for agents which search through possible plays: make a checkpoint once, then play out and roll back as many
+        times as necessary.  For example: ::
+
+            checkpoint = game.checkpoint()
+            for card in playable_cards:
+                game.play_card(card)
+                scores.append(evaluate(game))
+                game.rollback(checkpoint)
+
+        :rtype: Checkpoint
+        """
+        return Checkpoint(self)
+
+    def rollback(self, checkpoint):
+        """
+        Restore this game to the state it was in when a checkpoint was made.  The checkpoint remains valid, and can be
+        rolled back to again.  Any objects created since the checkpoint was made, such as newly summoned minions,
+        must not be used after the game is rolled back.
+
+        :param Checkpoint checkpoint: A checkpoint made by calling :meth:`checkpoint` on this game
+        """
+        if checkpoint.game is not self:
+            raise GameException("Cannot roll back to a checkpoint from another game")
+        checkpoint.restore()
+
     def play_card(self, card):
         if self.game_ended:
             raise GameException("The game has ended")
@@ -2041,20 +2810,32 @@ class Game(Bindable):
             active_player = 1
         else:
             active_player = 2
-        return {
+        game_json = {
             'players': self.players,
             'active_player': active_player,
             'current_sequence_id': self.minion_counter,
         }
+        if self.rng is not _global_random:
+            version, internal_state, gauss_next = self.rng.getstate()
+            game_json['random_state'] = [version, internal_state, gauss_next]
+        return game_json
 
     @staticmethod
     def __from_json__(d, agents):
         new_game = Game.__new__(Game)
         new_game._all_cards_played = []
         new_game.minion_counter = d["current_sequence_id"]
-        new_game.delayed_minions = set()
+        new_game._delayed_characters = []
+        new_game._delayed_count = 0
+        new_game.state_version = 0
+        new_game._state_hash = None
         new_game.game_ended = False
-        new_game.random_func = random.randint
+        if 'random_state' in d:
+            version, internal_state, gauss_next = d['random_state']
+            new_game.rng = random.Random()
+            new_game.rng.setstate((version, tuple(internal_state), gauss_next))
+        else:
+            new_game.rng = _global_random
         new_game.events = {}
         new_game.players = [Player.__from_json__(pd, new_game, None) for pd in d["players"]]
         new_game._has_turn_ended = False
@@ -2088,5 +2869,3 @@ class Game(Bindable):
                     minion._do_enrage()
             index += 1
         return new_game
-
-__create_card_table()
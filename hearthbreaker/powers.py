@@ -24,6 +24,9 @@ def powers(character_class):
 
 
 class Power:
+    #: True if this power asks for a target when it is used
+    targeted = False
+
     def __init__(self, hero):
         self.hero = hero
         self.used = False
@@ -58,6 +61,8 @@ class HunterPower(Power):
 
 
 class MagePower(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -69,6 +74,8 @@ class MagePower(Power):
 
 
 class PriestPower(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -86,6 +93,8 @@ class PriestPower(Power):
 
 # Special power the priest can obtain via the card Shadowform
 class MindSpike(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -100,6 +109,8 @@ class MindSpike(Power):
 
 # Special power the priest can obtain via the card Shadowform
 class MindShatter(Power):
+    targeted = True
+
     def __init__(self, hero):
         super().__init__(hero)
 
@@ -0,0 +1,224 @@
+import json
+import time
+
+from hearthbreaker.game_objects import Bindable, Game, Player, Hero, Minion, Weapon, Deck, GameException
+
+__doc__ = """
+Opt-in instrumentation for finding out where simulated games spend their time.
+
+A :class:`Profiler` counts how often each event is triggered and how often each handler is called, and times event
+dispatch, copying, checkpointing and serializing games.  Agent decisions are timed for any game passed to
+:meth:`Profiler.watch`.  The instrumentation is only installed while a profiler is enabled, so it costs nothing
+otherwise.  For example: ::
+
+    profiler = Profiler()
+    with profiler:
+        profiler.watch(game)
+        game.start()
+    profiler.dump("profile.json")
+
+Only one profiler can be enabled at a time.  It counts everything that happens in this process while it is enabled,
+not just in the games it is watching.  Times are inclusive, so the time for an event includes any events triggered by
+its handlers.
+"""
+
+_enabled = None
+
+
+def _handler_name(function):
+    name = getattr(function, "__qualname__", None)
+    if name is None:
+        return type(function).__name__
+    return name
+
+
+def _add(table, name, count, seconds):
+    if name in table:
+        table[name][0] += count
+        table[name][1] += seconds
+    else:
+        table[name] = [count, seconds]
+
+
+class _TimedAgent:
+    """
+    Stands in for an agent, timing each of its decisions.  Anything else is passed straight through to the agent.
+    """
+
+    __slots__ = ['agent', 'profiler']
+
+    def __init__(self, agent, profiler):
+        object.__setattr__(self, "agent", agent)
+        object.__setattr__(self, "profiler", profiler)
+
+    def do_card_check(self, cards):
+        return self.profiler.time("do_card_check", self.agent.do_card_check, cards)
+
+    def do_turn(self, player):
+        return self.profiler.time("do_turn", self.agent.do_turn, player)
+
+    def choose_target(self, targets):
+        return self.profiler.time("choose_target", self.agent.choose_target, targets)
+
+    def choose_index(self, card, player):
+        return self.profiler.time("choose_index", self.agent.choose_index, card, player)
+
+    def choose_option(self, *options):
+        return self.profiler.time("choose_option", self.agent.choose_option, *options)
+
+    def __getattr__(self, item):
+        return self.agent.__getattribute__(item)
+
+    def __setattr__(self, key, value):
+        setattr(self.__getattribute__("agent"), key, value)
+
+
+class Profiler:
+    """
+    Collects counts and timings from games while it is enabled, either with :meth:`enable` and :meth:`disable`, or by
+    using it as a context manager.
+    """
+
+    def __init__(self):
+        #: The number of times each event was triggered and the seconds spent dispatching it, keyed by event name
+        self.events = {}
+        #: The number of times each handler was called, keyed by its qualified name
+        self.handlers = {}
+        #: The number of calls and total seconds for each timed operation, such as ``do_turn`` or ``copy``
+        self.timings = {}
+        self._patches = []
+
+    def enable(self):
+        """
+        Install the instrumentation.
+
+        :raises GameException: If another profiler is already enabled
+        """
+        global _enabled
+        if _enabled is not None:
+            raise GameException("A profiler is already enabled")
+        _enabled = self
+
+        profiler = self
+        trigger = Bindable.trigger
+
+        def profiled_trigger(bindable, event, *args):
+            if event in bindable.events:
+                handlers = profiler.handlers
+                for function, once in bindable.events[event].handlers:
+                    if function is not None:
+                        name = _handler_name(function)
+                        handlers[name] = handlers.get(name, 0) + 1
+            start = time.perf_counter()
+            try:
+                trigger(bindable, event, *args)
+            finally:
+                _add(profiler.events, event, 1, time.perf_counter() - start)
+
+        self._patch(Bindable, "trigger", profiled_trigger)
+        for name in ["copy", "checkpoint", "rollback"]:
+            self._patch(Game, name, self._timed(name, getattr(Game, name)))
+        for cls in [Game, Player, Hero, Minion, Weapon, Deck]:
+            self._patch(cls, "__to_json__", self._timed("serialize", cls.__dict__["__to_json__"]))
+        self._patch(Game, "__from_json__", staticmethod(self._timed("deserialize", Game.__from_json__)))
+
+    def disable(self):
+        """
+        Remove the instrumentation, putting everything back as it was.
+        """
+        global _enabled
+        for cls, name, original in reversed(self._patches):
+            setattr(cls, name, original)
+        self._patches = []
+        if _enabled is self:
+            _enabled = None
+
+    def watch(self, game):
+        """
+        Time the decisions made by the agents playing a game, by standing in for them.  Copies of the game made
+        afterwards will be watched as well.
+
+        :param Game game: The game to watch
+        """
+        for player in game.players:
+            if not isinstance(player.agent, _TimedAgent):
+                player.agent = _TimedAgent(player.agent, self)
+
+    def time(self, name, func, *args):
+        """
+        Call a function, adding the time it takes to the timings under ``name``.
+
+        :return: Whatever the function returns
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            _add(self.timings, name, 1, time.perf_counter() - start)
+
+    def report(self):
+        """
+        Summarize everything collected so far.
+
+        :return: A dict with ``events``, ``handlers`` and ``timings`` entries, which can be saved as JSON and
+                 passed to :meth:`merge`
+        :rtype: dict
+        """
+        return {
+            'events': {name: {'count': count, 'seconds': seconds} for name, (count, seconds) in self.events.items()},
+            'handlers': dict(self.handlers),
+            'timings': {name: {'count': count, 'seconds': seconds}
+                        for name, (count, seconds) in self.timings.items()},
+        }
+
+    def merge(self, report):
+        """
+        Add a report from another profiler, such as one running in a worker process, to this one.
+
+        :param dict report: The report, as returned by :meth:`report`
+        """
+        for name, entry in report['events'].items():
+            _add(self.events, name, entry['count'], entry['seconds'])
+        for name, count in report['handlers'].items():
+            self.handlers[name] = self.handlers.get(name, 0) + count
+        for name, entry in report['timings'].items():
+            _add(self.timings, name, entry['count'], entry['seconds'])
+
+    def reset(self):
+        """
+        Forget everything collected so far.
+        """
+        self.events = {}
+        self.handlers = {}
+        self.timings = {}
+
+    def dump(self, file):
+        """
+        Write the report out as JSON.
+
+        :param file: Either the name of the file to write to, or a file-like object
+        :type file: :class:`str` or :class:`io.TextIOBase`
+        """
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                json.dump(self.report(), f, indent=2, sort_keys=True)
+        else:
+            json.dump(self.report(), file, indent=2, sort_keys=True)
+
+    def _patch(self, cls, name, replacement):
+        self._patches.append((cls, name, cls.__dict__[name]))
+        setattr(cls, name, replacement)
+
+    def _timed(self, name, func):
+        profiler = self
+
+        def timed(*args):
+            return profiler.time(name, func, *args)
+        return timed
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
@@ -25,7 +25,21 @@ the replay.  For example: ::
     game.start()                            # Play the game
     replay.write_json("my_replay.hsreplay") # Save the replay to a file
 
+Recording many games
+~~~~~~~~~~~~~~~~~~~~
 
+To record a large number of games without keeping them in memory, a :class:`ReplayWriter` can write each game to a
+file as it is played, and :func:`read_replays` will read them back one at a time.  For example: ::
+
+    with ReplayWriter("games.hsreplays") as writer:
+        for game in create_some_games():
+            replay = writer.record(game)      # Moves are written to the file as they are made
+            game.start()
+            writer.finish(replay)             # Write the rest of the game
+
+    for replay in read_replays("games.hsreplays"):
+        game = playback(replay)
+        game.start()
 
 Playing back a game
 ~~~~~~~~~~~~~~~~~~~
@@ -138,19 +152,49 @@ class Replay:
         """
         Mostly for testing, this function will check if the deck is made up of a repeating pattern  and if so, shorten
         the output, since the parser will generate the pattern from a shorter sample
-        :param cards: The deck of cards to replace
-        :return: an array of cards that represents the deck if repeated until 30 cards are found
+        :param cards: The names of the cards in the deck
+        :return: an array of card names that represents the deck if repeated until 30 cards are found
         """
         for pattern_length in range(1, 15):
             matched = True
             for index in range(pattern_length, 30):
-                if not isinstance(cards[index % pattern_length], type(cards[index])):
+                if cards[index % pattern_length] != cards[index]:
                     matched = False
                     break
             if matched:
                 return cards[0:pattern_length]
         return cards
 
+    def _header(self):
+        """
+        The header of this replay in the complete json format, with the decks, kept cards and random numbers from
+        before the first move
+        """
+        header_cards = [{"cards": self.__shorten_deck(deck.card_names()),
+                         "class": CHARACTER_CLASS.to_str(deck.character_class)} for deck in self.decks]
+
+        return {
+            'decks': header_cards,
+            'keep': self.keeps,
+            'random': self.random,
+        }
+
+    def _load_header(self, header):
+        """
+        Load the decks, kept cards and random numbers from the header of a replay in the complete json format
+        """
+        self.decks = []
+        for deck in header['decks']:
+            deck_size = len(deck['cards'])
+            cards = [hearthbreaker.game_objects.card_lookup(deck['cards'][index % deck_size]) for index in range(0, 30)]
+            self.decks.append(
+                hearthbreaker.game_objects.Deck(cards, CHARACTER_CLASS.from_str(deck['class'])))
+
+        self.random = header['random']
+        self.keeps = header['keep']
+        if len(self.keeps) == 0:
+            self.keeps = [[0, 1, 2], [0, 1, 2, 3]]
+
     def write(self, file):
         """
         Write a replay in the compact format.  This format is a series of directives, and isn't as flexible
@@ -173,7 +217,7 @@ class Replay:
             writer.write("deck(")
             writer.write(hearthbreaker.constants.CHARACTER_CLASS.to_str(deck.character_class))
             writer.write(",")
-            writer.write(",".join([card.name for card in self.__shorten_deck(deck.cards)]))
+            writer.write(",".join(self.__shorten_deck(deck.card_names())))
             writer.write(")\n")
         found_random = False
         if self.random.count(0) == len(self.random):
@@ -222,16 +266,8 @@ class Replay:
         else:
             writer = file
 
-        header_cards = [{"cards": [card.name for card in self.__shorten_deck(deck.cards)],
-                         "class": CHARACTER_CLASS.to_str(deck.character_class)} for deck in self.decks]
-
-        header = {
-            'decks': header_cards,
-            'keep': self.keeps,
-            'random': self.random,
-        }
-        json.dump({'header': header, 'moves': self._moves}, writer, default=lambda o: o.__to_json__(), indent=2,
-                  sort_keys=True)
+        json.dump({'header': self._header(), 'moves': self._moves}, writer, default=lambda o: o.__to_json__(),
+                  indent=2, sort_keys=True)
         if was_filename:
             writer.close()
 
@@ -252,17 +288,7 @@ class Replay:
             file = open(file, 'r')
 
         jd = json.load(file)
-        self.decks = []
-        for deck in jd['header']['decks']:
-            deck_size = len(deck['cards'])
-            cards = [hearthbreaker.game_objects.card_lookup(deck['cards'][index % deck_size]) for index in range(0, 30)]
-            self.decks.append(
-                hearthbreaker.game_objects.Deck(cards, CHARACTER_CLASS.from_str(deck['class'])))
-
-        self.random = jd['header']['random']
-        self.keeps = jd['header']['keep']
-        if len(self.keeps) == 0:
-            self.keeps = [[0, 1, 2], [0, 1, 2, 3]]
+        self._load_header(jd['header'])
         self._moves = [Move.from_json(**js) for js in jd['moves']]
         if was_filename:
             file.close()
@@ -540,3 +566,169 @@ def playback(replay):
 
     game.__init__(replay.decks, [ReplayAgent(), ReplayAgent()])
     return game
+
+
+class _MoveStream:
+    """
+    Stands in for the list of moves in a replay which is being streamed to a :class:`ReplayWriter`.  Moves are
+    changed after they are added, as targets, indices and random numbers are recorded, so only the most recent move
+    is kept, and each one is written out once the move after it is added.
+    """
+
+    def __init__(self, writer, replay):
+        self.writer = writer
+        self.replay = replay
+        self.last_move = None
+        self.count = 0
+
+    def append(self, move):
+        if self.count == 0:
+            self.writer._write_record({'header': self.replay._header()})
+        else:
+            self.writer._write_record(self.last_move)
+        self.last_move = move
+        self.count += 1
+
+    def finish(self):
+        if self.count == 0:
+            self.writer._write_record({'header': self.replay._header()})
+        else:
+            self.writer._write_record(self.last_move)
+        self.writer._write_record({'end': {'moves': self.count}})
+        self.last_move = None
+
+    def __getitem__(self, index):
+        if index != -1 or self.last_move is None:
+            raise IndexError("Only the most recent move of a streamed replay is available")
+        return self.last_move
+
+    def __len__(self):
+        return self.count
+
+
+class ReplayWriter:
+    """
+    Writes replays in the streaming format as their games are played, so that they never need to be held in memory.
+    Each line of the file is a single json record.  A game starts with a header record, in the same format as the
+    header of the complete json format, then has one record for each move, and finishes with an end record::
+
+        {"header": {"decks": [...], "keep": [...], "random": [...]}}
+        {"name": "start_turn", "random": []}
+        ...
+        {"end": {"moves": 53}}
+
+    Files are only ever appended to, so any number of games can be written to one file.  Each record is flushed as
+    soon as it is written, so if a game is cut short (by the simulation crashing, for example), every move but the
+    one being played has already been written out.  If the file was left ending part way through a record, the next
+    writer starts on a new line, and :func:`read_replays` skips the broken record.  Files in this format are read
+    back by :func:`read_replays`.
+    """
+
+    def __init__(self, file):
+        """
+        Create a new writer.
+
+        :param file: Either a string or an IO object.  If a string, then it is assumed to be a filename describing
+                     where replays are to be written, and they are appended to the end of that file.  If an IO
+                     object, then the IO object should be opened for writing.
+        :type file: :class:`str` or :class:`io.TextIOBase`
+        """
+        if 'write' not in dir(file):
+            self._was_filename = True
+            self._writer = open(file, 'a')
+            # A writer which was killed part way through a record leaves the file without a final newline
+            with open(file, 'rb') as existing:
+                existing.seek(0, 2)
+                if existing.tell() > 0:
+                    existing.seek(-1, 2)
+                    if existing.read(1) != b"\n":
+                        self._writer.write("\n")
+        else:
+            self._was_filename = False
+            self._writer = file
+
+    def record(self, game):
+        """
+        Ready a game for recording, in the same way as :func:`record`.  Its moves are written out as they are made,
+        so :meth:`finish` must be called once the game is over.
+
+        :param game: A game which has not been started
+        :type game: :class:`Game <hearthbreaker.game_objects.Game>`
+        :return: The replay which is tracking the game's moves
+        :rtype: :class:`Replay`
+        """
+        replay = record(game)
+        replay._moves = _MoveStream(self, replay)
+        return replay
+
+    def finish(self, replay):
+        """
+        Write out the rest of a game which has finished being played, and mark it as complete.
+
+        :param Replay replay: The replay returned by :meth:`record` for the game
+        """
+        replay._moves.finish()
+        self._writer.flush()
+
+    def close(self):
+        """
+        Flush everything written so far, and close the file if this writer opened it
+        """
+        if self._was_filename:
+            self._writer.close()
+        else:
+            self._writer.flush()
+
+    def _write_record(self, record):
+        self._writer.write(json.dumps(record, default=lambda o: o.__to_json__(), sort_keys=True) + "\n")
+        self._writer.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_replays(file):
+    """
+    Read replays written in the streaming format by a :class:`ReplayWriter`.  The file is read lazily, so only one
+    replay is held in memory at a time.  A replay which was cut short is still returned, with every move that was
+    written for it, and a record which was only partly written is skipped.
+
+    :param file: Either a string or an IO object.  If a string, then it is assumed to be a filename describing
+                 where the replays are found.  If an IO object, then the IO object should be opened for reading.
+    :type file: :class:`str` or :class:`io.TextIOBase`
+    :return: A generator of the replays in the file, in the order they were written
+    :rtype: generator of :class:`Replay`
+    """
+    was_filename = False
+    if 'read' not in dir(file):
+        was_filename = True
+        file = open(file, 'r')
+
+    try:
+        replay = None
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'header' in record:
+                if replay is not None:
+                    yield replay
+                replay = Replay()
+                replay._load_header(record['header'])
+            elif 'end' in record:
+                if replay is not None:
+                    yield replay
+                replay = None
+            elif replay is not None:
+                replay._moves.append(Move.from_json(**record))
+        if replay is not None:
+            yield replay
+    finally:
+        if was_filename:
+            file.close()
@@ -0,0 +1,464 @@
+import io
+import json
+import lzma
+import multiprocessing
+import os
+
+import numpy
+
+from hearthbreaker.agents import registry
+from hearthbreaker.encoder import GameEncoder, ARRAYS
+from hearthbreaker.environment import action_index, END_TURN, ACTION_COUNT
+from hearthbreaker.game_objects import Game, GameException
+from hearthbreaker.proxies import ProxyCard, ProxyCharacter
+from hearthbreaker.serialization.move import PlayMove, AttackMove, PowerMove
+from hearthbreaker.simulation import load_deck
+
+__doc__ = """
+Generates training data by playing games between agents from :data:`hearthbreaker.agents.registry`, and recording
+every move they make.  For example: ::
+
+    generate("data", "deck1.hsdeck", "deck2.hsdeck", games=100000, agents=("MCTS", "Random"), workers=32)
+    for shard in read_shards("data"):
+        train(shard["players"], shard["minions"], shard["actions"], shard["outcomes"])
+
+Each move is recorded as one row, made up of the position it was made from, encoded by
+:class:`hearthbreaker.encoder.GameEncoder` from the side of the player making it, and the following columns:
+
+``actions``
+    The move made, numbered as in :mod:`hearthbreaker.environment`.
+``outcomes``
+    1 if the player making the move went on to win the game, -1 if they lost and 0 for a draw.
+``seeds``
+    The seed the game was created with.  Playing the same agents with the same seed plays the same game again, as
+    long as the agents only use the game's random number generator.
+``masks``
+    Only if asked for.  The legal actions at the time, as bits packed with :func:`numpy.packbits`.
+
+Rows are written to compressed shard files of a bounded size in a directory, alongside a ``manifest.json`` which
+lists the shards written for each chunk of games.  Games are played in chunks of consecutive seeds, and a chunk is
+only added to the manifest once all of its shards have been written, so an interrupted run can be picked up again by
+calling :func:`generate` with the same arguments: the chunks in the manifest are skipped, and the rest are played
+again from the start.
+
+Only moves made during a turn are recorded.  The mulligan, and choices made while a card is being played other than
+its target, board position and option (such as the target of a Choose One battlecry), are not.
+"""
+
+#: The file listing the shards in a directory
+MANIFEST = "manifest.json"
+
+#: The columns recorded for each move, besides the position
+COLUMNS = ("actions", "outcomes", "seeds", "masks")
+
+_COLUMN_TYPES = {"actions": numpy.int32, "outcomes": numpy.int8, "seeds": numpy.int64, "masks": numpy.uint8}
+
+_EXTENSIONS = {"npz": ".npz", "lzma": ".npz.xz"}
+
+
+class _RecordingAgent:
+    # Passes every decision on to the agent it wraps, noting the choices made while a card is played
+    __slots__ = ['agent', 'recorder']
+
+    def __init__(self, agent, recorder):
+        object.__setattr__(self, "agent", agent)
+        object.__setattr__(self, "recorder", recorder)
+
+    def choose_index(self, card, player):
+        index = self.agent.choose_index(card, player)
+        if self.recorder.index is None:
+            self.recorder.index = index
+        return index
+
+    def choose_target(self, targets):
+        target = self.agent.choose_target(targets)
+        if self.recorder.target is None:
+            self.recorder.target = ProxyCharacter(target)
+        return target
+
+    def choose_option(self, *options):
+        option = self.agent.choose_option(*options)
+        if self.recorder.option is None:
+            self.recorder.option = options.index(option)
+        return option
+
+    def __getattr__(self, item):
+        return getattr(self.agent, item)
+
+    def __setattr__(self, key, value):
+        setattr(self.agent, key, value)
+
+
+class _GameRecorder:
+    """
+    Records the moves of a single game into a set of rows, as they are made.  The position before each move is
+    encoded at the first point the move can be seen, which is when a card is played, when a target is chosen for an
+    attack or the hero power, when an untargeted hero power is used and when the turn ends.
+    """
+
+    def __init__(self, game, seed, rows, encoder, masks):
+        self.game = game
+        self.seed = seed
+        self.rows = rows
+        self.encoder = encoder
+        self.masks = masks
+        #: The choices made while playing the current card
+        self.index = None
+        self.target = None
+        self.option = None
+        self._playing = False
+        self._pending = None
+        self._sides = []
+
+        for player in game.players:
+            player.agent = _RecordingAgent(player.agent, self)
+            player.choose_target = self._choose_target_for(player)
+            player.bind("character_attack", self._attacked)
+            player.bind("used_power", self._used_power)
+        self._play_card = game.play_card
+        self._end_turn = game._end_turn
+        game.play_card = self.play_card
+        game._end_turn = self.end_turn
+
+    def play_card(self, card):
+        if self.game.game_ended or self._playing:
+            return self._play_card(card)
+        player = self.game.current_player
+        side = self._record()
+        hand_index = player.hand.index(card)
+        targeted = card.can_use(player, self.game) and card.targetable and len(card.targets) > 0
+        self.index = self.target = self.option = None
+        self._playing = True
+        try:
+            self._play_card(card)
+        finally:
+            self._playing = False
+        proxy = ProxyCard(hand_index)
+        proxy.set_option(self.option)
+        move = PlayMove(proxy, self.index if card.is_minion() and self.index is not None else -1)
+        move.target = self.target if targeted else None
+        self._finish(side, move)
+
+    def end_turn(self):
+        if not self.game.game_ended:
+            self._finish(self._record(), None)
+        self._end_turn()
+
+    def outcomes(self):
+        """
+        Fill in the outcome of every move recorded, once the game is over.
+        """
+        players = self.game.players
+        for row, side in enumerate(self._sides):
+            dead = players[side].hero.dead
+            opponent_dead = players[1 - side].hero.dead
+            if dead == opponent_dead:
+                outcome = 0
+            elif opponent_dead:
+                outcome = 1
+            else:
+                outcome = -1
+            self.rows.columns["outcomes"][row] = outcome
+
+    def _choose_target_for(self, player):
+        choose_target = player.choose_target
+
+        def recording_choose_target(targets):
+            if self._playing or self.game.game_ended:
+                return choose_target(targets)
+            side = self._record()
+            target = choose_target(targets)
+            self._pending = side, target
+            return target
+        return recording_choose_target
+
+    def _attacked(self, attacker, target):
+        if self._pending is None:
+            return
+        side = self._pending[0]
+        self._pending = None
+        self._finish(side, AttackMove(attacker, target))
+
+    def _used_power(self):
+        if self._pending is not None:
+            side, target = self._pending
+            self._pending = None
+            self._finish(side, PowerMove(target))
+        elif not self._playing and not self.game.game_ended:
+            self._finish(self._record(), PowerMove())
+
+    def _record(self):
+        # Encodes the current position into the next row, which is only kept once the move is finished, and returns
+        # the side of the player to move.  A move which is abandoned part way through (such as a hero power which
+        # turns out not to be usable after its target is chosen) is overwritten by the next one.
+        self._pending = None
+        row = self.rows.next_row(self.encoder.encode([self.game]))
+        self.rows.columns["seeds"][row] = self.seed
+        if self.masks:
+            mask = numpy.zeros(ACTION_COUNT, numpy.bool_)
+            for move in self.game.legal_moves():
+                mask[action_index(self.game, move)] = True
+            self.rows.columns["masks"][row] = numpy.packbits(mask)
+        return self.game.players.index(self.game.current_player)
+
+    def _finish(self, side, move):
+        self.rows.columns["actions"][self.rows.count] = END_TURN if move is None else action_index(self.game, move)
+        self.rows.count += 1
+        self._sides.append(side)
+
+
+class _Rows:
+    """
+    Preallocated arrays holding rows of recorded moves, which grow as needed but are otherwise reused.
+    """
+
+    def __init__(self, capacity, masks):
+        self.count = 0
+        self.columns = {}
+        encoder = GameEncoder(capacity)
+        for name in ARRAYS:
+            self.columns[name] = getattr(encoder, name)
+        for name in COLUMNS:
+            if name == "masks":
+                if masks:
+                    self.columns[name] = numpy.zeros((capacity, (ACTION_COUNT + 7) // 8), numpy.uint8)
+            else:
+                self.columns[name] = numpy.zeros(capacity, _COLUMN_TYPES[name])
+
+    @property
+    def capacity(self):
+        return len(self.columns["actions"])
+
+    def next_row(self, encoded):
+        # Writes an encoded position to the row after the last one, without counting it yet, and returns its index
+        if self.count == self.capacity:
+            for name, array in self.columns.items():
+                grown = numpy.zeros((2 * len(array),) + array.shape[1:], array.dtype)
+                grown[:len(array)] = array
+                self.columns[name] = grown
+        for name, array in encoded.items():
+            self.columns[name][self.count] = array[0]
+        return self.count
+
+    def copy_from(self, other, start, stop):
+        for name, array in self.columns.items():
+            array[self.count:self.count + stop - start] = other.columns[name][start:stop]
+        self.count += stop - start
+
+
+class _ShardWriter:
+    """
+    Collects the rows of finished games into ``rows``, writing them out to a new shard each time it is full.
+    """
+
+    def __init__(self, directory, name, rows, compression):
+        self.directory = directory
+        self.name = name
+        self.compression = compression
+        self.rows = rows
+        self.rows.count = 0
+        #: The shards written so far, as dicts of their file name and number of rows
+        self.shards = []
+
+    def add(self, rows):
+        start = 0
+        while start < rows.count:
+            stop = min(rows.count, start + self.rows.capacity - self.rows.count)
+            self.rows.copy_from(rows, start, stop)
+            start = stop
+            if self.rows.count == self.rows.capacity:
+                self.flush()
+
+    def flush(self):
+        if self.rows.count == 0:
+            return
+        file_name = "{0}-{1:03d}{2}".format(self.name, len(self.shards), _EXTENSIONS[self.compression])
+        path = os.path.join(self.directory, file_name)
+        arrays = {name: array[:self.rows.count] for name, array in self.rows.columns.items()}
+        # Written under a temporary name first, so that a shard which exists is always complete
+        with open(path + ".tmp", "wb") as shard_file:
+            if self.compression == "lzma":
+                with lzma.open(shard_file, "wb") as compressed:
+                    numpy.savez(compressed, **arrays)
+            else:
+                numpy.savez_compressed(shard_file, **arrays)
+        os.replace(path + ".tmp", path)
+        self.shards.append({"file": file_name, "rows": self.rows.count})
+        self.rows.count = 0
+
+
+class SelfPlayWorker:
+    """
+    Plays and records chunks of seeded games.  One of these lives in each worker process.
+    """
+
+    def __init__(self, directory, deck_files, agent_names, shard_rows=100000, compression="npz", masks=False):
+        """
+        :param str directory: The directory to write shards to
+        :param list[str] deck_files: The files the two decks will be loaded from
+        :param list[str] agent_names: The names of the agents to use for each deck, as found in
+                                      :data:`hearthbreaker.agents.registry`
+        :param int shard_rows: The most rows to write to a single shard
+        :param str compression: Either ``"npz"`` for compressed NumPy archives, or ``"lzma"`` for uncompressed ones
+                                compressed as a whole with :mod:`lzma`, which is smaller but slower
+        :param bool masks: Whether to record the legal actions for each move as well
+        """
+        self.directory = directory
+        self.decks = [load_deck(deck_file) for deck_file in deck_files]
+        self.agent_names = agent_names
+        self.shard_rows = shard_rows
+        self.compression = compression
+        self.masks = masks
+        self._encoder = GameEncoder(1)
+        # Both sets of rows are kept for the life of the worker, so that its memory use doesn't grow with the
+        # number of games played
+        self._rows = _Rows(1024, masks)
+        self._shard_rows = _Rows(shard_rows, masks)
+
+    def play_chunk(self, seeds):
+        """
+        Play one game for each seed, and write out their moves.
+
+        :param list[int] seeds: The seeds of the games to play
+        :return: A manifest entry for the chunk, giving its first seed, the number of games and the shards written
+        :rtype: dict
+        """
+        writer = _ShardWriter(self.directory, "shard-{0:010d}".format(seeds[0]), self._shard_rows, self.compression)
+        for seed in seeds:
+            self._rows.count = 0
+            game = Game([deck.copy() for deck in self.decks],
+                        [registry.create_agent(name) for name in self.agent_names], seed)
+            recorder = _GameRecorder(game, seed, self._rows, self._encoder, self.masks)
+            try:
+                game.start()
+            except Exception as e:
+                raise GameException("Game with seed {0} failed: {1!r}".format(seed, e)) from e
+            recorder.outcomes()
+            writer.add(self._rows)
+        writer.flush()
+        return {"seed": seeds[0], "games": len(seeds), "shards": writer.shards}
+
+
+_worker = None
+
+
+def _init_worker(*args):
+    global _worker
+    _worker = SelfPlayWorker(*args)
+
+
+def _play_chunk(seeds):
+    return _worker.play_chunk(seeds)
+
+
+def read_manifest(directory):
+    """
+    Read the manifest of a directory of shards.
+
+    :param str directory: The directory the shards were written to
+    :return: The manifest, or None if there isn't one
+    :rtype: dict
+    """
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as manifest_file:
+        return json.load(manifest_file)
+
+
+def _write_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def generate(directory, deck1, deck2, games, agents=("Random", "Random"), workers=None, chunk_size=50,
+             shard_rows=100000, seed=0, compression="npz", masks=False):
+    """
+    Play and record games, spread across a pool of worker processes, resuming from where an earlier call with the
+    same arguments left off.  Game ``i`` is played with the seed ``seed + i``.
+
+    :param str directory: The directory to write the shards and manifest to.  It is created if necessary
+    :param str deck1: The file name of the first deck
+    :param str deck2: The file name of the second deck
+    :param int games: The total number of games to play, including any already played
+    :param agents: The registry names of the agents to use for the first and second deck
+    :param int workers: The number of worker processes to use.  Defaults to the number of CPUs.  If 1, the games are
+                        played in this process.
+    :param int chunk_size: How many games make up a chunk, which is the unit of work given to a worker, and which is
+                           played again from the start if it was interrupted
+    :param int shard_rows: The most rows to write to a single shard
+    :param str compression: ``"npz"`` or ``"lzma"``, as for :class:`SelfPlayWorker`
+    :param bool masks: Whether to record the legal actions for each move as well
+    :return: The manifest, once every game has been recorded
+    :rtype: dict
+    :raises ValueError: If the directory already has a manifest from a call with different arguments
+    """
+    if compression not in _EXTENSIONS:
+        raise ValueError("Unknown compression {0!r}".format(compression))
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    settings = {"decks": [deck1, deck2], "agents": list(agents), "chunk_size": chunk_size, "seed": seed,
+                "shard_rows": shard_rows, "compression": compression, "masks": masks}
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    manifest = read_manifest(directory)
+    if manifest is None:
+        manifest = {"settings": settings, "chunks": []}
+    elif manifest["settings"] != settings:
+        raise ValueError("{0} holds games recorded with different settings: {1}".format(
+            directory, manifest["settings"]))
+    done = {chunk["seed"] for chunk in manifest["chunks"]}
+    chunks = [list(range(start, min(start + chunk_size, seed + games)))
+              for start in range(seed, seed + games, chunk_size) if start not in done]
+
+    worker_args = (directory, [deck1, deck2], list(agents), shard_rows, compression, masks)
+    if workers <= 1:
+        worker = SelfPlayWorker(*worker_args)
+        results = (worker.play_chunk(chunk) for chunk in chunks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, _init_worker, worker_args)
+        results = pool.imap_unordered(_play_chunk, chunks)
+    try:
+        for entry in results:
+            manifest["chunks"].append(entry)
+            manifest["chunks"].sort(key=lambda chunk: chunk["seed"])
+            _write_manifest(directory, manifest)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return manifest
+
+
+def load_shard(path):
+    """
+    Load the arrays in a single shard.
+
+    :param str path: The path of the shard file
+    :rtype: dict[str, numpy.ndarray]
+    """
+    if path.endswith(".xz"):
+        with lzma.open(path, "rb") as shard_file:
+            data = io.BytesIO(shard_file.read())
+    else:
+        data = path
+    with numpy.load(data) as arrays:
+        return {name: arrays[name] for name in arrays.files}
+
+
+def read_shards(directory):
+    """
+    Load each of the shards listed in a directory's manifest in turn, in seed order.
+
+    :param str directory: The directory the shards were written to
+    :return: A generator of the arrays in each shard, as for :func:`load_shard`
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return
+    for chunk in manifest["chunks"]:
+        for shard in chunk["shards"]:
+            yield load_shard(os.path.join(directory, shard["file"]))
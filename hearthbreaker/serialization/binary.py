@@ -0,0 +1,314 @@
+import marshal
+import struct
+import zlib
+
+from hearthbreaker.game_objects import Game, card_table
+
+__doc__ = """
+A compact binary encoding for games, which round-trips exactly like the JSON produced by
+:func:`hearthbreaker.serialization.serialization.serialize`, but is much smaller.
+
+The encoding is of the same tree of dicts, lists and values as the JSON.  Each value is written as a one byte tag
+followed by its contents, with whole numbers and lengths as variable length integers, floats as 8 byte IEEE doubles
+and long lists of 32 bit whole numbers (such as the state of the game's random number generator) packed into 4 bytes
+each, all little-endian.  Card names are written as their numbers in the card table (see :func:`card_names`), and
+any other string is written in full the first time it appears in a game, and after that as a reference back to it.
+The encoded game can optionally be compressed with :mod:`zlib` as well.  For example: ::
+
+    data = serialize(game, compress=True)
+    copy = deserialize(data, [player.agent for player in game.players])
+
+The encoding doesn't depend on the version of Python, so it can be used to keep games, such as training data, for as
+long as the card table stays the same.  The header records a checksum of the card table, and decoding fails if the
+cards have changed since, unless the card names from when the data was written are given.  Keep a copy of
+:func:`card_names` alongside any data which needs to outlive changes to the cards.
+
+For passing games between processes, ``fast=True`` writes the tree with :mod:`marshal` instead, which is quicker to
+encode and decode, but can only be decoded by the same version of Python.  Neither encoding may be used to load data
+from untrusted sources.
+"""
+
+_MAGIC = b"HBG"
+_VERSION = 2
+_COMPRESSED = 1
+_MARSHAL = 2
+
+_HEADER = struct.Struct("<3sBB")
+_CHECKSUM = struct.Struct("<I")
+_DOUBLE = struct.Struct("<d")
+
+# The tags of each kind of value.  Tags from _SMALL_INT onwards are whole numbers from 0 up, written in the tag itself.
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_NEGATIVE_INT = 4
+_FLOAT = 5
+_STRING = 6
+_STRING_REFERENCE = 7
+_CARD = 8
+_LIST = 9
+_DICT = 10
+_UINT32_LIST = 11
+_SMALL_INT = 16
+_SMALL_INT_LIMIT = 256 - _SMALL_INT
+# Lists of at least this many whole numbers which fit in 32 bits, such as the state of a random number generator, are
+# packed into 4 bytes each
+_PACKED_LENGTH = 16
+
+_card_names = None
+_card_ids = None
+_card_checksum = None
+
+
+def card_names():
+    """
+    The names of the cards, in the order of their numbers in the encoding.  Cards are numbered from 1 in the order of
+    :data:`hearthbreaker.game_objects.card_table`, as in :func:`hearthbreaker.encoder.card_ids`, and the first entry
+    is None.
+
+    :rtype: list[str]
+    """
+    global _card_names, _card_ids, _card_checksum
+    if _card_names is None:
+        _card_names = [None] + list(card_table)
+        _card_ids = {name: index for index, name in enumerate(_card_names) if index > 0}
+        _card_checksum = _checksum(_card_names)
+    return list(_card_names)
+
+
+def _checksum(names):
+    return zlib.crc32("\n".join(names[1:]).encode("utf-8"))
+
+
+def _write_varint(out, value):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write(value, out, strings, ids):
+    value_type = type(value)
+    if value_type is str:
+        card_id = ids.get(value)
+        if card_id is not None:
+            out.append(_CARD)
+            _write_varint(out, card_id)
+        elif value in strings:
+            out.append(_STRING_REFERENCE)
+            _write_varint(out, strings[value])
+        else:
+            strings[value] = len(strings)
+            encoded = value.encode("utf-8")
+            out.append(_STRING)
+            _write_varint(out, len(encoded))
+            out += encoded
+    elif value_type is int:
+        if 0 <= value < _SMALL_INT_LIMIT:
+            out.append(_SMALL_INT + value)
+        elif value >= 0:
+            out.append(_INT)
+            _write_varint(out, value)
+        else:
+            out.append(_NEGATIVE_INT)
+            _write_varint(out, -value)
+    elif value_type is dict:
+        out.append(_DICT)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _write(key, out, strings, ids)
+            _write(item, out, strings, ids)
+    elif value_type is list or value_type is tuple:
+        if len(value) >= _PACKED_LENGTH and all(type(item) is int and 0 <= item <= 0xffffffff for item in value):
+            out.append(_UINT32_LIST)
+            _write_varint(out, len(value))
+            out += struct.pack("<{0}I".format(len(value)), *value)
+            return
+        out.append(_LIST)
+        _write_varint(out, len(value))
+        for item in value:
+            _write(item, out, strings, ids)
+    elif value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif value_type is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    else:
+        _write(value.__to_json__(), out, strings, ids)
+
+
+def _read_varint(data, position):
+    value = data[position]
+    position += 1
+    if value < 0x80:
+        return value, position
+    value &= 0x7f
+    shift = 7
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _read(data, position, strings, names):
+    tag = data[position]
+    position += 1
+    if tag >= _SMALL_INT:
+        return tag - _SMALL_INT, position
+    if tag == _STRING_REFERENCE:
+        index, position = _read_varint(data, position)
+        return strings[index], position
+    if tag == _CARD:
+        card_id, position = _read_varint(data, position)
+        return names[card_id], position
+    if tag == _DICT:
+        length, position = _read_varint(data, position)
+        value = {}
+        for index in range(0, length):
+            key, position = _read(data, position, strings, names)
+            value[key], position = _read(data, position, strings, names)
+        return value, position
+    if tag == _LIST:
+        length, position = _read_varint(data, position)
+        value = []
+        for index in range(0, length):
+            item, position = _read(data, position, strings, names)
+            value.append(item)
+        return value, position
+    if tag == _STRING:
+        length, position = _read_varint(data, position)
+        value = bytes(data[position:position + length]).decode("utf-8")
+        strings.append(value)
+        return value, position + length
+    if tag == _NONE:
+        return None, position
+    if tag == _TRUE:
+        return True, position
+    if tag == _FALSE:
+        return False, position
+    if tag == _INT:
+        return _read_varint(data, position)
+    if tag == _NEGATIVE_INT:
+        value, position = _read_varint(data, position)
+        return -value, position
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, position)[0], position + _DOUBLE.size
+    if tag == _UINT32_LIST:
+        length, position = _read_varint(data, position)
+        return list(struct.unpack_from("<{0}I".format(length), data, position)), position + 4 * length
+    raise ValueError("Unknown tag {0} at {1}".format(tag, position - 1))
+
+
+def encode(obj, compress=False, fast=False):
+    """
+    Encode a tree of JSON compatible values as bytes.  Any object in the tree which is not a dict, list, tuple, str,
+    int, float, bool or None must have a ``__to_json__`` method, which is called to find what to encode in its place.
+
+    :param obj: The tree to encode
+    :param bool compress: Whether to compress the encoded tree
+    :param bool fast: Whether to write the tree with :mod:`marshal`, which is faster, but can only be decoded by the
+                      same version of Python
+    :rtype: bytes
+    """
+    flags = 0
+    if fast:
+        flags |= _MARSHAL
+        body = marshal.dumps(_to_tree(obj))
+        header = _HEADER.pack(_MAGIC, _VERSION, flags) + bytes([marshal.version])
+    else:
+        card_names()
+        out = bytearray()
+        _write(obj, out, {}, _card_ids)
+        body = bytes(out)
+        header = _HEADER.pack(_MAGIC, _VERSION, flags) + _CHECKSUM.pack(_card_checksum)
+    if compress:
+        body = zlib.compress(body)
+        header = header[:4] + bytes([header[4] | _COMPRESSED]) + header[5:]
+    return header + body
+
+
+def decode(data, names=None):
+    """
+    Decode a tree of values from bytes produced by :func:`encode`.
+
+    :param bytes data: The encoded tree
+    :param list[str] names: The :func:`card_names` from when the data was encoded, or None to use the current ones
+    :return: The tree, with the same dicts, lists and values as ``json.loads`` would give for the equivalent JSON
+    :raises ValueError: If the data isn't in this format, was written by a different version of it, was written with
+                        a different card table, or was written by :mod:`marshal` from a different version of Python
+    """
+    if len(data) < _HEADER.size + 1:
+        raise ValueError("Not an encoded game")
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Not an encoded game")
+    if version != _VERSION:
+        raise ValueError("Unsupported version {0}".format(version))
+    if flags & _MARSHAL:
+        if data[_HEADER.size] != marshal.version:
+            raise ValueError("Written with marshal version {0}, but this is version {1}".format(
+                data[_HEADER.size], marshal.version))
+        body = data[_HEADER.size + 1:]
+    else:
+        if names is None:
+            names = card_names()
+        checksum = _CHECKSUM.unpack_from(data, _HEADER.size)[0]
+        if checksum != _checksum(names):
+            raise ValueError("Written with a different card table")
+        body = data[_HEADER.size + _CHECKSUM.size:]
+    if flags & _COMPRESSED:
+        body = zlib.decompress(body)
+    if flags & _MARSHAL:
+        return marshal.loads(body)
+    try:
+        value, position = _read(body, 0, [], names)
+    except (IndexError, struct.error):
+        raise ValueError("The encoded game is cut short or corrupt")
+    if position != len(body):
+        raise ValueError("Unexpected data after the encoded game")
+    return value
+
+
+def _to_tree(value):
+    value_type = type(value)
+    if value_type is dict:
+        return {_to_tree(key): _to_tree(item) for key, item in value.items()}
+    if value_type is list or value_type is tuple:
+        return [_to_tree(item) for item in value]
+    if value_type is int or value_type is bool or value is None or value_type is float or value_type is str:
+        return value
+    return _to_tree(value.__to_json__())
+
+
+def serialize(game, compress=False, fast=False):
+    """
+    Encode a game as bytes, from which it can be reconstructed exactly as it is now.
+
+    :param hearthbreaker.game_objects.Game game: The game to serialize
+    :param bool compress: Whether to compress the encoded game, which makes it smaller, but slower to encode and
+                          decode
+    :param bool fast: Whether to use :mod:`marshal`, for passing the game to another process running the same version
+                      of Python
+    :rtype: bytes
+    """
+    return encode(game, compress, fast)
+
+
+def deserialize(data, agents, names=None):
+    """
+    Reconstruct a game from bytes produced by :func:`serialize`.
+
+    :param bytes data: The encoded game
+    :param list agents: The agents for the two players
+    :param list[str] names: The :func:`card_names` from when the game was encoded, or None to use the current ones
+    :rtype: :class:`hearthbreaker.game_objects.Game`
+    """
+    return Game.__from_json__(decode(data, names), agents)
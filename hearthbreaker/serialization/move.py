@@ -1,4 +1,5 @@
 import hearthbreaker.game_objects
+import hearthbreaker.proxies
 
 __author__ = 'dyule'
 
@@ -11,6 +12,15 @@ class Move:
     def play(self, game):
         pass
 
+    def to_output_string(self):
+        pass
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_output_string() == other.to_output_string()
+
+    def __hash__(self):
+        return hash(self.to_output_string())
+
     @staticmethod
     def from_json(name, random=[], **json):
         cls = None
@@ -64,7 +74,9 @@ class PlayMove(Move):
 
         game.current_player.agent.next_index = self.index
         game.play_card(self.card.resolve(game))
-        game.current_player.agent.nextIndex = -1
+        game.current_player.agent.next_index = -1
+        game.current_player.agent.next_target = None
+        game.current_player.agent.next_option = None
 
     def to_output_string(self):
         if self.index > -1:
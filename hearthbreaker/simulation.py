@@ -0,0 +1,194 @@
+import multiprocessing
+import random
+
+from hearthbreaker.agents import registry
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.game_objects import Game, card_lookup, Deck, GameException
+from hearthbreaker.profiling import Profiler
+
+__doc__ = """
+Runs large batches of simulated games, optionally fanning them out across a pool of worker processes.
+
+Each worker builds its game from the deck files once, then plays every game it is handed on a copy of that game.
+Every game is given its own seed, so any single game out of a batch can be reproduced by re-running its seed.  For
+example: ::
+
+    for chunk in run_batch("deck1.hsdeck", "deck2.hsdeck", games=100000, workers=32):
+        for result in chunk:
+            print(result["seed"], result["winner"], result["turns"])
+"""
+
+
+def load_deck(filename):
+    """
+    Load a deck from a file in cockatrice format, with a card name in English on each line, preceded by a number to
+    specify how many.  The character class is inferred from the cards present, or defaults to mage.
+
+    :param str filename: The name of the file to load the deck from
+    :rtype: hearthbreaker.game_objects.Deck
+    """
+    cards = []
+    character_class = CHARACTER_CLASS.MAGE
+
+    with open(filename, "r") as deck_file:
+        contents = deck_file.read()
+        items = contents.splitlines()
+        for line in items[0:]:
+            parts = line.split(" ", 1)
+            count = int(parts[0])
+            for i in range(0, count):
+                card = card_lookup(parts[1])
+                if card.character_class != CHARACTER_CLASS.ALL:
+                    character_class = card.character_class
+                cards.append(card)
+
+    return Deck(cards, character_class)
+
+
+class GameRunner:
+    """
+    Plays seeded games from a template game built once from a pair of deck files.  One of these lives in each
+    worker process.
+    """
+
+    def __init__(self, deck_files, agent_names, seed=0):
+        """
+        Build the template game that all games played by this runner will be copied from.
+
+        :param list[str] deck_files: The files the two decks will be loaded from
+        :param list[str] agent_names: The names of the agents to use for each deck, as found in
+                                      :data:`hearthbreaker.agents.registry`
+        :param int seed: The seed used when building the template game, which decides who goes first.  Every
+                         worker in a batch uses the same one, so that a game's result depends only on its own seed
+        """
+        decks = [load_deck(deck_file) for deck_file in deck_files]
+        agents = [registry.create_agent(name) for name in agent_names]
+        self.game = Game(decks, agents, seed)
+        #: If set, a :class:`hearthbreaker.profiling.Profiler` which times the agents' decisions in each game played
+        self.profiler = None
+
+    def play(self, seed):
+        """
+        Play a single game with the given seed.
+
+        :param int seed: The seed for this game
+        :return: A dict describing the result of the game.  ``winner`` is the index of the deck which won, or None
+                 if the game was a draw.  ``turns`` is the number of turns played, and ``cards_played`` is a list of
+                 the names of the cards played by both players, in order.
+        :rtype: dict
+        """
+        turns = 0
+
+        def turn_started(player):
+            nonlocal turns
+            turns += 1
+
+        game = self.game.copy()
+        game.rng = random.Random(seed)
+        if self.profiler is not None:
+            self.profiler.watch(game)
+        for player in game.players:
+            player.bind("turn_started", turn_started)
+        try:
+            game.start()
+        except Exception as e:
+            raise GameException("Game with seed {0} failed: {1!r}".format(seed, e)) from e
+
+        return {
+            'seed': seed,
+            'winner': self._winner(game),
+            'turns': turns,
+            'cards_played': [card.name for card in game._all_cards_played],
+        }
+
+    def _winner(self, game):
+        first_dead = game.players[0].hero.dead
+        second_dead = game.players[1].hero.dead
+        if first_dead == second_dead:
+            return None
+        # players[0] is playing the deck at index first_player
+        if first_dead:
+            return 1 - game.first_player
+        return game.first_player
+
+
+_runner = None
+
+
+def _init_worker(deck_files, agent_names, seed, profile):
+    global _runner
+    _runner = GameRunner(deck_files, agent_names, seed)
+    if profile:
+        _runner.profiler = Profiler()
+        _runner.profiler.enable()
+
+
+def _play_chunk(seeds):
+    results = [_runner.play(seed) for seed in seeds]
+    if _runner.profiler is None:
+        return results, None
+    report = _runner.profiler.report()
+    _runner.profiler.reset()
+    return results, report
+
+
+def _chunks(seeds, chunk_size):
+    chunk = []
+    for seed in seeds:
+        chunk.append(seed)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(deck1, deck2, games, agents=("Random", "Random"), workers=None, chunk_size=100, seed=0,
+              profiler=None):
+    """
+    Play a batch of games between two decks, spread across a pool of worker processes.
+
+    Game ``i`` of the batch is played with the seed ``seed + i``, which is reported back with its result so that it
+    can be replayed on its own with :meth:`GameRunner.play`.
+
+    :param str deck1: The file name of the first deck
+    :param str deck2: The file name of the second deck
+    :param int games: The number of games to play
+    :param agents: The registry names of the agents to use for the first and second deck
+    :param int workers: The number of worker processes to use.  Defaults to the number of CPUs.  If 1, the games are
+                        played in this process.
+    :param int chunk_size: How many games each worker plays before sending its results back
+    :param int seed: The seed for the first game in the batch
+    :param hearthbreaker.profiling.Profiler profiler: If given, the games are profiled, and the results collected
+                                                      from every worker are added to this profiler.  It must not
+                                                      already be enabled.
+    :return: A generator of lists of results, as returned by :meth:`GameRunner.play`.  Chunks are yielded as soon as
+             they are completed, so they are not necessarily in seed order.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    deck_files = [deck1, deck2]
+    seeds = range(seed, seed + games)
+
+    if workers <= 1:
+        runner = GameRunner(deck_files, agents, seed)
+        if profiler is None:
+            for chunk in _chunks(seeds, chunk_size):
+                yield [runner.play(game_seed) for game_seed in chunk]
+            return
+        runner.profiler = profiler
+        for chunk in _chunks(seeds, chunk_size):
+            with profiler:
+                results = [runner.play(game_seed) for game_seed in chunk]
+            yield results
+        return
+
+    pool = multiprocessing.Pool(workers, _init_worker, (deck_files, agents, seed, profiler is not None))
+    try:
+        for chunk, report in pool.imap_unordered(_play_chunk, _chunks(seeds, chunk_size)):
+            if report is not None:
+                profiler.merge(report)
+            yield chunk
+    finally:
+        pool.terminate()
+        pool.join()
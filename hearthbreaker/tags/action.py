@@ -422,6 +422,7 @@ class Equip(Action):
     def act(self, actor, target):
         card = self.weapon.get_card(target)
         weapon = card.create_weapon(target)
+        weapon.card = card
         weapon.equip(target)
 
     def __to_json__(self):
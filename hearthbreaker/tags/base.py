@@ -4,32 +4,114 @@ import json
 import string
 
 
+def _copy_value(value, memo):
+    # Lists of tags are only duplicated if one of their members had to be
+    if isinstance(value, list):
+        new_list = [copy.deepcopy(item, memo) for item in value]
+        for index in range(len(value)):
+            if new_list[index] is not value[index]:
+                return new_list
+        return value
+    return copy.deepcopy(value, memo)
+
+
+def _structure(value):
+    # Returns a hashable equivalent of a value's JSON, and whether it can be cached
+    if isinstance(value, JSONObject):
+        return value._structure_of()
+    if isinstance(value, dict):
+        items = []
+        cacheable = True
+        for key, item in value.items():
+            item, item_cacheable = _structure(item)
+            items.append((key, item))
+            cacheable = cacheable and item_cacheable
+        items.sort()
+        return ('dict', tuple(items)), cacheable
+    if isinstance(value, (list, tuple)):
+        items = []
+        cacheable = True
+        for item in value:
+            item, item_cacheable = _structure(item)
+            items.append(item)
+            cacheable = cacheable and item_cacheable
+        return tuple(items), cacheable
+    if value is None or isinstance(value, (str, int, float)):
+        return (type(value).__name__, value), True
+    return _structure(value.__to_json__())
+
+
 class JSONObject(metaclass=abc.ABCMeta):
+    #: True if instances of this class keep state which changes as the game is played, and so can never be shared
+    #: between copies of a game
+    stateful = False
 
     @abc.abstractmethod
     def __to_json__(self):
         pass
 
+    def __deepcopy__(self, memo):
+        """
+        Copies are structural: an object which holds no game state, and whose children hold none either, is shared
+        between the original and the copy instead of being duplicated.  Classes whose instances change as the game is
+        played must set :attr:`stateful`, or override this method.
+        """
+        changed = self.stateful
+        values = {}
+        for attribute, value in self.__dict__.items():
+            new_value = _copy_value(value, memo)
+            values[attribute] = new_value
+            if new_value is not value:
+                changed = True
+        if not changed:
+            return self
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(values)
+        memo[id(self)] = new
+        return new
+
     @staticmethod
     @abc.abstractclassmethod
     def from_json(action, selector):
         pass
 
+    def structure(self):
+        """
+        A hashable value describing this object, such that two objects have the same structure exactly when they would
+        be serialized to the same json.  It is cached if neither this object nor any of its children are
+        :attr:`stateful`.
+
+        :rtype: tuple
+        """
+        return self._structure_of()[0]
+
+    def _structure_of(self):
+        cached = self.__dict__.get('_structure')
+        if cached is not None:
+            return cached, True
+        structure, cacheable = _structure(self.__to_json__())
+        cacheable = cacheable and not self.stateful
+        if cacheable:
+            self._structure = structure
+        return structure, cacheable
+
     def eq(self, other):
-        return str(self) == str(other)
+        return self.structure() == other.structure()
 
     def __str__(self):
         return json.dumps(self.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
 
 
 class Tag(JSONObject):
+    stateful = True
+
     def __deepcopy__(self, memo):
         cls = self.__class__
         new = cls.__new__(cls)
         memo[id(self)] = new
         for attribute, value in self.__dict__.items():
             if attribute != "owner":
-                setattr(new, attribute, copy.deepcopy(value, memo))
+                setattr(new, attribute, _copy_value(value, memo))
             else:
                 setattr(new, attribute, None)
         return new
@@ -156,10 +238,17 @@ class AuraUntil(Aura):
 
 
 class Player(metaclass=abc.ABCMeta):
+    #: True if whether this matches a character depends only on which player the character belongs to, which never
+    #: changes while it is on the board
+    stable = False
+
     @abc.abstractmethod
     def get_players(self, target):
         pass
 
+    def __deepcopy__(self, memo):
+        return self
+
     @abc.abstractmethod
     def match(self, source, obj):
         pass
@@ -204,6 +293,10 @@ class Picker(JSONObject, metaclass=abc.ABCMeta):
 
 
 class Selector(JSONObject, metaclass=abc.ABCMeta):
+    #: True if whether this matches a minion can't be changed by other minions being added to, moved on or removed
+    #: from the board.  Auras with a stable selector only need to check the minion being placed when the board changes.
+    stable = False
+
     @abc.abstractmethod
     def get_targets(self, source, target=None):
         pass
@@ -247,6 +340,8 @@ class Action(JSONObject, metaclass=abc.ABCMeta):
 
 
 class Status(JSONObject, metaclass=abc.ABCMeta):
+    stateful = True
+
     @abc.abstractmethod
     def act(self, actor, target):
         pass
@@ -476,10 +571,25 @@ class Effect(Tag):
 
 
 class Condition(JSONObject, metaclass=abc.ABCMeta):
+    #: True if whether this holds for a minion depends only on that minion and the condition's target, and not on its
+    #: position, stats or anything else on the board
+    stable = False
+
     @abc.abstractmethod
     def evaluate(self, target, *args):
         pass
 
+    def card_attributes(self):
+        """
+        Describe this condition as attributes which a card in the collection must have to meet it, so that cards
+        can be looked up in :data:`hearthbreaker.game_objects.card_table` instead of each being checked.
+
+        :return: The attributes, as a dict of the names of fields of :class:`hearthbreaker.card_registry.CardInfo` to
+                 the values they must have, or None if this condition can't be described that way
+        :rtype: dict
+        """
+        return None
+
     @staticmethod
     def from_json(name, **kwargs):
         import hearthbreaker.tags.condition as action_mod
@@ -572,18 +682,19 @@ class CardQuery(JSONObject):
         self.make_copy = make_copy
 
     def get_card(self, player):
-        from hearthbreaker.game_objects import card_lookup, get_cards
+        from hearthbreaker.game_objects import card_lookup
         if self.name:
             return card_lookup(self.name)
 
+        conditions = self.conditions
         if self.source == CARD_SOURCE.COLLECTION:
-            card_list = get_cards()
+            card_list, conditions = self.__collection(conditions)
         elif self.source == CARD_SOURCE.MY_DECK:
-            card_list = filter(lambda c: not c.drawn, player.deck.cards)
+            card_list = player.deck.undrawn_cards()
         elif self.source == CARD_SOURCE.MY_HAND:
             card_list = player.hand
         elif self.source == CARD_SOURCE.OPPONENT_DECK:
-            card_list = filter(lambda c: not c.drawn, player.opponent.deck.cards)
+            card_list = player.opponent.deck.undrawn_cards()
         elif self.source == CARD_SOURCE.OPPONENT_HAND:
             card_list = player.opponent.hand
         elif self.source == CARD_SOURCE.LIST:
@@ -597,7 +708,7 @@ class CardQuery(JSONObject):
         def check_condition(condition):
             return lambda c: condition.evaluate(player, c)
 
-        for condition in self.conditions:
+        for condition in conditions:
             card_list = filter(check_condition(condition), card_list)
 
         card_list = [card for card in card_list]
@@ -609,15 +720,17 @@ class CardQuery(JSONObject):
         else:
             chosen_card = player.game.random_choice(card_list)
 
-        if self.source == CARD_SOURCE.COLLECTION or self.source == CARD_SOURCE.LIST or self.make_copy:
+        if self.source == CARD_SOURCE.COLLECTION:
+            if isinstance(chosen_card, str):
+                return card_lookup(chosen_card)
+            return chosen_card
+        elif self.source == CARD_SOURCE.LIST or self.make_copy:
             return chosen_card
         elif self.source == CARD_SOURCE.MY_DECK:
-            chosen_card.drawn = True
-            player.deck.left -= 1
+            player.deck.take(chosen_card)
             return chosen_card
         elif self.source == CARD_SOURCE.OPPONENT_DECK:
-            chosen_card.drawn = True
-            player.opponent.deck.left -= 1
+            player.opponent.deck.take(chosen_card)
             return chosen_card
         elif self.source == CARD_SOURCE.MY_HAND:
             player.hand.remove(chosen_card)
@@ -626,6 +739,27 @@ class CardQuery(JSONObject):
             player.opponent.hand.remove(chosen_card)
             return chosen_card
 
+    @staticmethod
+    def __collection(conditions):
+        """
+        Find the cards in the collection which could be chosen, using the card table's index for as many of the
+        conditions as it can answer.  The rest of the conditions are left to be checked against each card, in order,
+        exactly as if none had been looked up, as some (such as :class:`hearthbreaker.tags.condition.OneIn`) use up
+        random numbers.
+
+        :return: A pair of the cards which could be chosen and the conditions left to check.  If there are no
+                 conditions left, the cards are given as names, and only the one chosen needs to be created.
+        """
+        from hearthbreaker.game_objects import card_table
+        attributes = []
+        for index, condition in enumerate(conditions):
+            condition_attributes = condition.card_attributes()
+            if condition_attributes is None:
+                names = card_table.collection(attributes)
+                return [card_table[name]() for name in names], conditions[index:]
+            attributes.extend(condition_attributes.items())
+        return card_table.collection(attributes), []
+
     def __to_json__(self):
         json_obj = {}
         if self.name:
@@ -17,6 +17,9 @@ class IsSecret(Condition):
     def evaluate(self, target, obj, *args):
         return obj.is_secret()
 
+    def card_attributes(self):
+        return {"card_type": "secret"}
+
     def __to_json__(self):
         return {
             'name': 'is_secret'
@@ -71,6 +74,9 @@ class ManaCost(Condition):
     def evaluate(self, target, obj, *args):
         return obj.mana == self.cost
 
+    def card_attributes(self):
+        return {"mana": self.cost}
+
     def __to_json__(self):
         return {
             'name': 'mana_cost',
@@ -85,6 +91,9 @@ class CardRarity(Condition):
     def evaluate(self, target, obj, *args):
         return obj.is_card() and obj.rarity == self.rarity
 
+    def card_attributes(self):
+        return {"rarity": self.rarity}
+
     def __to_json__(self):
         return {
             'name': 'card_rarity',
@@ -93,9 +102,14 @@ class CardRarity(Condition):
 
 
 class IsMinion(Condition):
+    stable = True
+
     def evaluate(self, target, minion, *args):
         return minion.is_minion()
 
+    def card_attributes(self):
+        return {"card_type": "minion"}
+
     def __to_json__(self):
         return {
             "name": 'is_minion'
@@ -106,6 +120,9 @@ class IsWeapon(Condition):
     def evaluate(self, target, weapon, *args):
         return weapon.is_weapon()
 
+    def card_attributes(self):
+        return {"card_type": "weapon"}
+
     def __to_json__(self):
         return {
             "name": 'is_weapon'
@@ -123,6 +140,8 @@ class NotCurrentTarget(Condition):
 
 
 class MinionIsTarget(Condition):
+    stable = True
+
     def evaluate(self, target, minion, *args):
         return minion is target
 
@@ -133,6 +152,8 @@ class MinionIsTarget(Condition):
 
 
 class MinionIsNotTarget(Condition):
+    stable = True
+
     def evaluate(self, target, minion, *args):
         return minion is not target
 
@@ -157,6 +178,10 @@ class Not(Condition):
         super().__init__()
         self.condition = condition
 
+    @property
+    def stable(self):
+        return self.condition.stable
+
     def evaluate(self, target, *args):
         return not self.condition.evaluate(target, *args)
 
@@ -172,6 +197,8 @@ class Not(Condition):
 
 
 class IsType(Condition):
+    stable = True
+
     def __init__(self, minion_type, include_self=False):
         super().__init__()
         self.minion_type = minion_type
@@ -187,6 +214,9 @@ class IsType(Condition):
                 return minion.minion_type == self.minion_type
         return False
 
+    def card_attributes(self):
+        return {"minion_type": self.minion_type}
+
     def __to_json__(self):
         return {
             'name': 'is_type',
@@ -4,6 +4,8 @@ import hearthbreaker.tags.condition
 
 
 class FriendlyPlayer(Player):
+    stable = True
+
     def match(self, source, obj):
         return source.player is obj.player
 
@@ -15,6 +17,8 @@ class FriendlyPlayer(Player):
 
 
 class EnemyPlayer(Player):
+    stable = True
+
     def get_players(self, target):
         return [target.opponent]
 
@@ -26,6 +30,8 @@ class EnemyPlayer(Player):
 
 
 class BothPlayer(Player):
+    stable = True
+
     def match(self, source, obj):
         return True
 
@@ -37,6 +43,8 @@ class BothPlayer(Player):
 
 
 class PlayerOne(Player):
+    stable = True
+
     def match(self, source, obj):
         return source.player is obj.player.game.players[0]
 
@@ -48,6 +56,8 @@ class PlayerOne(Player):
 
 
 class PlayerTwo(Player):
+    stable = True
+
     def match(self, source, obj):
         return source.player is obj.player.game.players[1]
 
@@ -156,6 +166,8 @@ class CardSelector(Selector, metaclass=abc.ABCMeta):
 
 
 class SpecificCardSelector(CardSelector):
+    stateful = True
+
     def __init__(self, card, players=FriendlyPlayer()):
         super().__init__(players)
         self.card_index = -1
@@ -307,6 +319,10 @@ class MinionSelector(Selector):
         self.players = players
         self.picker = picker
 
+    @property
+    def stable(self):
+        return self.players.stable and (self.condition is None or self.condition.stable)
+
     def get_targets(self, source, obj=None):
         players = self.players.get_players(source.player)
         targets = []
@@ -65,7 +65,7 @@ class MinimumHealth(Status):
     def unact(self, actor, target):
         target.unbind("health_changed", self.__keep_funcs[target])
 
-    def __deep_copy__(self, memo):
+    def __deepcopy__(self, memo):
         return MinimumHealth(self.min_health)
 
     def __copy__(self):
@@ -119,7 +119,7 @@ class ManaChange(Status):
         target.mana_filters.remove(self.filters[target])
         self.card_selector.untrack_cards(target)
 
-    def __deep_copy__(self, memo):
+    def __deepcopy__(self, memo):
         return ManaChange(self.amount, self.minimum, copy.deepcopy(self.card_selector, memo))
 
     def __copy__(self):
@@ -232,6 +232,9 @@ class CantAttack(Status):
     def unact(self, actor, target):
         target.can_attack = self._old_attack
 
+    def __deepcopy__(self, memo):
+        return CantAttack()
+
     def __to_json__(self):
         return {
             "name": "cant_attack"
@@ -314,7 +317,7 @@ class AttackEqualsHealth(Status):
     def unact(self, actor, target):
         target.calculate_attack = self._calculate_attack[target]
 
-    def __deep_copy__(self, memo):
+    def __deepcopy__(self, memo):
         return AttackEqualsHealth()
 
     def __copy__(self):
@@ -1,57 +1,57 @@
-import json
-from hearthbreaker.agents.basic_agents import RandomAgent
-from hearthbreaker.constants import CHARACTER_CLASS
-from hearthbreaker.game_objects import Game, card_lookup, Deck
-from hearthbreaker.cards import *
-import timeit
-
-
-def load_deck(filename):
-    cards = []
-    character_class = CHARACTER_CLASS.MAGE
-
-    with open(filename, "r") as deck_file:
-        contents = deck_file.read()
-        items = contents.splitlines()
-        for line in items[0:]:
-            parts = line.split(" ", 1)
-            count = int(parts[0])
-            for i in range(0, count):
-                card = card_lookup(parts[1])
-                if card.character_class != CHARACTER_CLASS.ALL:
-                    character_class = card.character_class
-                cards.append(card)
-
-    if len(cards) > 30:
-        pass
-
-    return Deck(cards, character_class)
+import argparse
+import time
+from hearthbreaker.agents import registry
+from hearthbreaker.profiling import Profiler
+from hearthbreaker.simulation import run_batch
 
 
 def do_stuff():
-    _count = 0
-
-    def play_game():
-        nonlocal _count
-        _count += 1
-        new_game = game.copy()
-        try:
-            new_game.start()
-        except Exception as e:
-            print(json.dumps(new_game.__to_json__(), default=lambda o: o.__to_json__()))
-            print(new_game._all_cards_played)
-            raise e
-
-        del new_game
-
-        if _count % 1000 == 0:
-            print("---- game #{} ----".format(_count))
-
-    deck1 = load_deck("example.hsdeck")
-    deck2 = load_deck("example.hsdeck")
-    game = Game([deck1, deck2], [RandomAgent(), RandomAgent()])
+    parser = argparse.ArgumentParser(description="Simulate a batch of games between two decks")
+    parser.add_argument("deck1", nargs="?", default="example.hsdeck", help="the deck file for the first player")
+    parser.add_argument("deck2", nargs="?", default="example.hsdeck", help="the deck file for the second player")
+    parser.add_argument("-n", "--games", type=int, default=100000, help="the number of games to play")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="the number of worker processes (defaults to the number of CPUs)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=100,
+                        help="the number of games each worker plays before reporting back")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="the seed for the first game")
+    parser.add_argument("-a", "--agents", nargs=2, default=["Random", "Random"], choices=registry.get_names(),
+                        help="the agents playing the first and second deck")
+    parser.add_argument("-p", "--profile", metavar="FILE", default=None,
+                        help="profile the games, and write the results to this file as JSON")
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        profiler = Profiler()
+    else:
+        profiler = None
+
+    wins = [0, 0]
+    draws = 0
+    turns = 0
+    count = 0
+    start = time.time()
+    for chunk in run_batch(args.deck1, args.deck2, args.games, args.agents, args.workers, args.chunk_size,
+                           args.seed, profiler):
+        for result in chunk:
+            if result['winner'] is None:
+                draws += 1
+            else:
+                wins[result['winner']] += 1
+            turns += result['turns']
+        old_count = count
+        count += len(chunk)
+        if count // 1000 != old_count // 1000:
+            print("---- game #{} ----".format(count))
+
+    elapsed = time.time() - start
+    print("deck 1 wins: {0}, deck 2 wins: {1}, draws: {2}".format(wins[0], wins[1], draws))
+    print("average turns: {0:.2f}".format(turns / max(count, 1)))
+    print("{0} games in {1:.2f} seconds ({2:.1f} games/sec)".format(count, elapsed, count / elapsed))
+    if profiler is not None:
+        profiler.dump(args.profile)
+        print("profile written to {0}".format(args.profile))
 
-    print(timeit.timeit(play_game, 'gc.enable()', number=100000))
 
 if __name__ == "__main__":
     do_stuff()
@@ -0,0 +1,142 @@
+import collections
+import json
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.agents.ismcts_agent import ISMCTSAgent, determinize, search, unseen_cards
+from hearthbreaker.agents.mcts_agent import PlayoutAgent
+from hearthbreaker.cards import Counterspell, IceBarrier, MirrorEntity, StonetuskBoar, Vaporize
+from hearthbreaker.game_objects import Game, card_table
+from hearthbreaker.serialization.move import PlayMove
+from hearthbreaker.simulation import load_deck
+from tests.testing_utils import generate_game_for
+
+
+class TestISMCTSAgent(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _make_game(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, PlayoutAgent, DoNothingAgent)
+        game.players[0].agent = DoNothingAgent()
+        game.play_single_turn()
+        game.play_single_turn()
+        game.players[0].agent = PlayoutAgent()
+        game._start_turn()
+        return game
+
+    def test_determinize(self):
+        decks = [load_deck("example.hsdeck"), load_deck("zoo.hsdeck")]
+        game = Game(decks, [RandomAgent(), RandomAgent()], 5)
+        played = [collections.Counter(), collections.Counter()]
+        for index, player in enumerate(game.players):
+            player.bind("card_played", lambda card, position, index=index: played[index].update([card.name]))
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, 8):
+            game.play_single_turn()
+        player = game.current_player
+        opponent = player.opponent
+        opponent_index = game.players.index(opponent)
+
+        unseen = unseen_cards(game)
+        deck_list = collections.Counter(opponent.deck.card_names())
+        self.assertLessEqual(collections.Counter(unseen), deck_list)
+        for minion in opponent.minions:
+            self.assertLess(unseen.count(minion.card.name), deck_list[minion.card.name])
+        # Spells leave nothing behind on the board, but were still seen when they were played
+        spells = [name for name in played[opponent_index] if card_table[name]().is_spell() and name in deck_list]
+        self.assertNotEqual([], spells)
+        for name in spells:
+            self.assertLessEqual(unseen.count(name), deck_list[name] - played[opponent_index][name])
+
+        game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+        samples = []
+        rng = random.Random(0)
+        for sample in range(0, 10):
+            sample_json = determinize(json.loads(json.dumps(game_json)), opponent_index, unseen, rng)
+            self.assertEqual(game_json["players"][1 - opponent_index], sample_json["players"][1 - opponent_index])
+            hand = sample_json["players"][opponent_index]["hand"]
+            deck = sample_json["players"][opponent_index]["deck"]
+            self.assertEqual(len(opponent.hand), len(hand))
+            self.assertEqual([entry["used"] for entry in game_json["players"][opponent_index]["deck"]],
+                             [entry["used"] for entry in deck])
+            hidden = [name for name in hand if name != "The Coin"]
+            hidden += [entry["name"] for entry in deck if not entry["used"]]
+            self.assertLessEqual(collections.Counter(hidden), collections.Counter(unseen))
+            samples.append(hand)
+            Game.__from_json__(sample_json, [RandomAgent(), RandomAgent()])
+        self.assertGreater(len({tuple(sorted(hand)) for hand in samples}), 1)
+
+    def test_secrets(self):
+        secret_types = [Counterspell, IceBarrier, MirrorEntity, Vaporize]
+        game = generate_game_for(StonetuskBoar, secret_types, DoNothingAgent, DoNothingAgent)
+        mage = [player for player in game.players if "Counterspell" in player.deck.card_names()][0]
+        game._start_turn()
+        if game.current_player is not mage:
+            game._start_turn()
+        mage.mana = 10
+        secret = [card for card in mage.hand if card.is_secret()][0]
+        game.play_card(secret)
+        game._start_turn()
+        deck_list = collections.Counter(mage.deck.card_names())
+
+        # The secret has been played, but the other player doesn't know which it was
+        unseen = unseen_cards(game)
+        self.assertEqual(deck_list[secret.name], unseen.count(secret.name))
+        game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+        rng = random.Random(0)
+        names = set()
+        for sample in range(0, 20):
+            sample_json = determinize(json.loads(json.dumps(game_json)), game.players.index(mage), unseen, rng)
+            secrets = sample_json["players"][game.players.index(mage)]["secrets"]
+            self.assertEqual(1, len(secrets))
+            names.update(secrets)
+        self.assertEqual({card_type().name for card_type in secret_types}, names)
+
+        secret.reveal()
+        self.assertEqual(deck_list[secret.name] - 1, unseen_cards(game).count(secret.name))
+
+    def test_finds_lethal(self):
+        game = self._make_game()
+        game.other_player.hero.health = 1
+        agent = ISMCTSAgent(rollouts=20, determinizations=4)
+        game.current_player.agent = agent
+
+        agent.do_turn(game.current_player)
+        self.assertTrue(game.other_player.hero.dead)
+        self.assertFalse(game.current_player.hero.dead)
+
+    def test_finishes_turn_in_playouts(self):
+        # Lethal needs a Boar to be played and then to attack, and passing the turn instead loses
+        game = self._make_game()
+        game.current_player.hero.power.used = True
+        game.current_player.hero.health = 1
+        game.other_player.hero.health = 1
+
+        game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+        results = search(game_json, unseen_cards(game), determinizations=4, rollouts=12, seed=0)
+        plays = [move for move in results if isinstance(move, PlayMove)]
+        self.assertNotEqual([], plays)
+        for move in plays:
+            visits, score = results[move]
+            self.assertEqual(visits, score)
+
+    def test_seeded_games_repeat(self):
+        def play(seed):
+            decks = [load_deck("example.hsdeck"), load_deck("zoo.hsdeck")]
+            game = Game(decks, [ISMCTSAgent(rollouts=3, determinizations=2), RandomAgent()], seed)
+            game.start()
+            return [(player.hero.health, len(player.minions), len(player.hand)) for player in game.players]
+
+        self.assertEqual(play(15), play(15))
+
+    def test_parallel_search(self):
+        game = self._make_game()
+        agent = ISMCTSAgent(rollouts=8, workers=2, determinizations=4)
+        try:
+            move = agent.choose_move(game)
+        finally:
+            agent.close()
+        self.assertIn(move, game.legal_moves())
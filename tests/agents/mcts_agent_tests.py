@@ -0,0 +1,73 @@
+import json
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.agents.mcts_agent import MCTSAgent, PlayoutAgent, search
+from hearthbreaker.cards import StonetuskBoar
+from hearthbreaker.game_objects import Game
+from hearthbreaker.serialization.move import PlayMove
+from hearthbreaker.simulation import load_deck
+from tests.testing_utils import generate_game_for
+
+
+class TestMCTSAgent(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _make_game(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, PlayoutAgent, DoNothingAgent)
+        game.players[0].agent = DoNothingAgent()
+        game.play_single_turn()
+        game.play_single_turn()
+        game.players[0].agent = PlayoutAgent()
+        game._start_turn()
+        return game
+
+    def test_finds_lethal(self):
+        game = self._make_game()
+        game.other_player.hero.health = 1
+        agent = MCTSAgent(rollouts=20)
+        game.current_player.agent = agent
+
+        agent.do_turn(game.current_player)
+        self.assertTrue(game.other_player.hero.dead)
+        self.assertFalse(game.current_player.hero.dead)
+
+    def test_finishes_turn_in_playouts(self):
+        # Lethal needs a Boar to be played and then to attack, and passing the turn instead loses
+        game = self._make_game()
+        game.current_player.hero.power.used = True
+        game.current_player.hero.health = 1
+        game.other_player.hero.health = 1
+
+        results = search(json.loads(json.dumps(game, default=lambda o: o.__to_json__())), rollouts=12, seed=0)
+        plays = [move for move in results if isinstance(move, PlayMove)]
+        self.assertNotEqual([], plays)
+        for move in plays:
+            visits, score = results[move]
+            self.assertEqual(visits, score)
+
+        agent = MCTSAgent(rollouts=4)
+        game.current_player.agent = agent
+        agent.do_turn(game.current_player)
+        self.assertTrue(game.other_player.hero.dead)
+        self.assertFalse(game.current_player.hero.dead)
+
+    def test_seeded_games_repeat(self):
+        def play(seed):
+            decks = [load_deck("example.hsdeck"), load_deck("zoo.hsdeck")]
+            game = Game(decks, [MCTSAgent(rollouts=3), RandomAgent()], seed)
+            game.start()
+            return [(player.hero.health, len(player.minions), len(player.hand)) for player in game.players]
+
+        self.assertEqual(play(15), play(15))
+
+    def test_root_parallel_search(self):
+        game = self._make_game()
+        agent = MCTSAgent(rollouts=8, workers=2)
+        try:
+            move = agent.choose_move(game)
+        finally:
+            agent.close()
+        self.assertIn(move, game.legal_moves())
@@ -54,7 +54,8 @@ class FakePlayer(Player):
 class FakeGame(Game):
     def __init__(self, decks, agents, random_func=random.randint):
         super(Game, self).__init__()
-        self.delayed_minions = set()
+        self._delayed_characters = []
+        self._delayed_count = 0
         self.random_func = random_func
         self.first_player = random_func(0, 1)
         if self.first_player is 0:
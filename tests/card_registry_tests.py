@@ -0,0 +1,144 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.card_registry import CardRegistry, CardInfo
+from hearthbreaker.cards import StonetuskBoar, Fireball, IceBarrier, FieryWarAxe, MurlocRaider
+from hearthbreaker.constants import CHARACTER_CLASS, CARD_RARITY, MINION_TYPE
+from hearthbreaker.game_objects import card_table, card_lookup, get_cards, Game, Deck
+from hearthbreaker.tags.base import CardQuery
+from hearthbreaker.tags.condition import IsMinion, ManaCost, CardRarity, IsWeapon, IsType, IsSpell, OneIn
+from tests.testing_utils import mock
+
+
+class TestCardRegistry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.directory, "card_index.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_finds_cards(self):
+        registry = CardRegistry(self.index_file)
+        self.assertEqual(StonetuskBoar, registry["Stonetusk Boar"])
+        self.assertEqual(Fireball, registry["Fireball"])
+        self.assertNotIn("Not a Card", registry)
+        self.assertRaises(KeyError, lambda: registry["Not a Card"])
+        self.assertEqual(len(card_table), len(registry))
+        for name in registry:
+            self.assertEqual(name, registry[name]().ref_name)
+            self.assertEqual(card_table[name], registry[name])
+        self.assertEqual("Murloc Raider", card_lookup("Murloc Raider").name)
+
+    def test_card_info(self):
+        registry = CardRegistry(self.index_file)
+        self.assertEqual(CardInfo("Stonetusk Boar", "hearthbreaker.cards.minions.neutral", "StonetuskBoar", 1,
+                                  CHARACTER_CLASS.ALL, CARD_RARITY.FREE, "minion", MINION_TYPE.BEAST),
+                         registry.info("Stonetusk Boar"))
+        self.assertEqual("spell", registry.info("Fireball").card_type)
+        self.assertEqual(CHARACTER_CLASS.MAGE, registry.info("Fireball").character_class)
+        self.assertIsNone(registry.info("Fireball").minion_type)
+        self.assertEqual("secret", registry.info("Ice Barrier").card_type)
+        self.assertEqual("weapon", registry.info("Fiery War Axe").card_type)
+        self.assertEqual(MINION_TYPE.MURLOC, registry.info("Murloc Raider").minion_type)
+        for card_type in [StonetuskBoar, Fireball, IceBarrier, FieryWarAxe, MurlocRaider]:
+            card = card_type()
+            info = registry.info(card.ref_name)
+            self.assertEqual(card.mana, info.mana)
+            self.assertEqual(card.rarity, info.rarity)
+        self.assertEqual(len(registry), len(registry.infos()))
+
+    def test_index_is_saved_and_reused(self):
+        CardRegistry(self.index_file).info("Wisp")
+        with open(self.index_file, "r") as index_file:
+            index = json.load(index_file)
+        wisp = [card for card in index["cards"] if card[0] == "Wisp"][0]
+        wisp[3] = 7
+        with open(self.index_file, "w") as index_file:
+            json.dump(index, index_file)
+
+        self.assertEqual(7, CardRegistry(self.index_file).info("Wisp").mana)
+
+    def test_stale_index_is_rebuilt(self):
+        CardRegistry(self.index_file).info("Wisp")
+        with open(self.index_file, "r") as index_file:
+            index = json.load(index_file)
+        index["checksum"] += 1
+        index["cards"] = index["cards"][:1]
+        with open(self.index_file, "w") as index_file:
+            json.dump(index, index_file)
+
+        registry = CardRegistry(self.index_file)
+        self.assertEqual(len(card_table), len(registry))
+        self.assertEqual(0, registry.info("Wisp").mana)
+        with open(self.index_file, "r") as index_file:
+            self.assertEqual(len(card_table), len(json.load(index_file)["cards"]))
+
+    def test_index_is_replaced(self):
+        with open(self.index_file, "w") as index_file:
+            index_file.write("{not json")
+        # Anything reading the old index while the new one is written still sees all of the old one
+        with open(self.index_file, "r") as old_index:
+            registry = CardRegistry(self.index_file)
+            self.assertEqual(len(card_table), len(registry))
+            self.assertEqual("{not json", old_index.read())
+        with open(self.index_file, "r") as index_file:
+            self.assertEqual(len(card_table), len(json.load(index_file)["cards"]))
+        self.assertEqual(["card_index.json"], os.listdir(self.directory))
+
+    def test_index_in_cache_directory(self):
+        with mock.patch("os.access", return_value=False), \
+                mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.directory, "LOCALAPPDATA": self.directory}):
+            registry = CardRegistry()
+        self.assertEqual(os.path.join(self.directory, "hearthbreaker", "card_index.json"), registry.index_file)
+        self.assertEqual(StonetuskBoar, registry["Stonetusk Boar"])
+        self.assertTrue(os.path.exists(registry.index_file))
+
+    def test_unreadable_index(self):
+        with open(self.index_file, "w") as index_file:
+            index_file.write("{not json")
+        self.assertEqual(len(card_table), len(CardRegistry(self.index_file)))
+        registry = CardRegistry(os.path.join(self.directory, "missing", "card_index.json"))
+        self.assertEqual(StonetuskBoar, registry["Stonetusk Boar"])
+
+    def test_collection(self):
+        registry = CardRegistry(self.index_file)
+        self.assertEqual([card.ref_name for card in get_cards()], registry.collection())
+        self.assertNotIn("Silver Hand Recruit", registry.collection())
+        self.assertEqual([card.ref_name for card in get_cards() if card.is_weapon()],
+                         registry.collection([("card_type", "weapon")]))
+        self.assertEqual([card.ref_name for card in get_cards() if card.mana == 2 and card.is_minion()],
+                         registry.collection([("mana", 2), ("card_type", "minion")]))
+        self.assertEqual([], registry.collection([("card_type", "minion"), ("card_type", "weapon")]))
+        self.assertEqual([], registry.collection([("mana", 99)]))
+
+
+class TestCollectionQueries(unittest.TestCase):
+    def test_same_cards_as_checking_every_card(self):
+        conditions = [[IsMinion()], [ManaCost(2), IsMinion()], [CardRarity(CARD_RARITY.LEGENDARY), IsMinion()],
+                      [IsWeapon()], [IsType(MINION_TYPE.BEAST)], [IsSpell(), ManaCost(1)], [ManaCost(3), OneIn(3)],
+                      [OneIn(3), ManaCost(3)], [ManaCost(2), IsWeapon()]]
+        for query_conditions in conditions:
+            query = CardQuery(conditions=query_conditions)
+            game, expected_game = [Game([Deck([StonetuskBoar() for i in range(0, 30)], CHARACTER_CLASS.MAGE)
+                                         for player in range(0, 2)], [DoNothingAgent(), DoNothingAgent()], 1857)
+                                   for copy in range(0, 2)]
+            player = game.players[0]
+            expected_player = expected_game.players[0]
+            for choice in range(0, 20):
+                cards = get_cards()
+                for condition in query_conditions:
+                    cards = [card for card in cards if condition.evaluate(expected_player, card)]
+                if len(cards) == 0:
+                    expected = None
+                elif len(cards) == 1:
+                    expected = cards[0].ref_name
+                else:
+                    expected = expected_game.random_choice(cards).ref_name
+                card = query.get_card(player)
+                self.assertEqual(expected, card.ref_name if card else None)
+            self.assertEqual(expected_game.rng.getstate(), game.rng.getstate())
@@ -0,0 +1,61 @@
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.cards import StonetuskBoar, RiverCrocolisk, ArcaniteReaper, IceBarrier, Fireball
+from tests.testing_utils import generate_game_for
+
+try:
+    import numpy
+    from hearthbreaker.encoder import GameEncoder, card_ids, MINION_FEATURES, PLAYER_FEATURES
+except ImportError:  # NumPy is optional
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestGameEncoder(unittest.TestCase):
+    def setUp(self):
+        self.game = generate_game_for(StonetuskBoar, RiverCrocolisk, DoNothingAgent, DoNothingAgent)
+        self.game.play_single_turn()
+        self.player = self.game.current_player
+        self.opponent = self.player.opponent
+        StonetuskBoar().summon(self.player, self.game, 0)
+        RiverCrocolisk().summon(self.opponent, self.game, 0)
+        RiverCrocolisk().summon(self.opponent, self.game, 1)
+        self.opponent.minions[1].damage(1, None)
+        self.player.hand = [Fireball(), StonetuskBoar()]
+        reaper = ArcaniteReaper()
+        weapon = reaper.create_weapon(self.player)
+        weapon.card = reaper
+        weapon.equip(self.player)
+        self.opponent.secrets.append(IceBarrier())
+
+    def test_encode(self):
+        arrays = GameEncoder(4).encode(self.game)
+        ids = card_ids()
+        attack = MINION_FEATURES.index("attack")
+        health = MINION_FEATURES.index("health")
+
+        self.assertEqual((1, 2, 7, len(MINION_FEATURES)), arrays["minions"].shape)
+        self.assertEqual([1, 0], list(arrays["minions"][0, :, 0, MINION_FEATURES.index("can_attack")]))
+        self.assertEqual([2, 2], list(arrays["minions"][0, 1, :2, attack]))
+        self.assertEqual([3, 2], list(arrays["minions"][0, 1, :2, health]))
+        self.assertEqual(0, arrays["minions"][0, 1, 2:].sum())
+        self.assertEqual([ids["Stonetusk Boar"], 0], list(arrays["minion_cards"][0, 0, :2]))
+        self.assertEqual([ids["Fireball"], ids["Stonetusk Boar"], 0], list(arrays["hands"][0, 0, :3]))
+        self.assertEqual([0, ids["Ice Barrier"]], list(arrays["secrets"][0, :, 0]))
+        self.assertEqual([ids["Arcanite Reaper"], 0], list(arrays["weapons"][0]))
+        self.assertEqual([5, 0], list(arrays["players"][0, :, PLAYER_FEATURES.index("weapon_attack")]))
+        hand_size = PLAYER_FEATURES.index("hand_size")
+        self.assertEqual([2, len(self.opponent.hand)], list(arrays["players"][0, :, hand_size]))
+
+    def test_batches_reuse_buffers(self):
+        encoder = GameEncoder(4)
+        empty = generate_game_for(StonetuskBoar, RiverCrocolisk, DoNothingAgent, DoNothingAgent)
+        arrays = encoder.encode([self.game, self.game, self.game])
+        self.assertEqual(3, len(arrays["minions"]))
+        self.assertTrue(numpy.shares_memory(arrays["minions"], encoder.minions))
+        arrays = encoder.encode([empty, self.game])
+        self.assertEqual(0, arrays["minions"][0].sum())
+        self.assertEqual(len(empty.current_player.hand), numpy.count_nonzero(arrays["hands"][0, 0]))
+        self.assertEqual(3, int(arrays["minions"][1, :, :, 0].astype(bool).sum()))
+        self.assertRaises(ValueError, encoder.encode, [self.game] * 5)
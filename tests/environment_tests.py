@@ -0,0 +1,162 @@
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.agents.mcts_agent import PlayoutAgent
+from hearthbreaker.cards import DruidOfTheClaw, StonetuskBoar
+from hearthbreaker.simulation import load_deck
+from tests.testing_utils import generate_game_for
+
+try:
+    import numpy
+    from hearthbreaker.encoder import PLAYER_FEATURES
+    from hearthbreaker.environment import VectorEnvironment, GameEnvironment, action_index, ACTION_COUNT, END_TURN, \
+        PLAY_OFFSET, ATTACK_OFFSET, MAX_OPTIONS, BOARD_POSITIONS, TARGET_SLOTS
+except ImportError:  # NumPy is optional
+    numpy = None
+
+
+def _random_actions(rng, masks):
+    return numpy.where(masks, rng.random_sample(masks.shape), -1).argmax(axis=1)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestVectorEnvironment(unittest.TestCase):
+    def setUp(self):
+        self.decks = [load_deck("example.hsdeck"), load_deck("zoo.hsdeck")]
+
+    def test_plays_games_to_the_end(self):
+        environment = VectorEnvironment(self.decks, 4, seed=3)
+        masks = environment.reset()
+        self.assertEqual((4, ACTION_COUNT), masks.shape)
+        self.assertTrue(masks[:, END_TURN].all())
+        self.assertFalse(environment.dones.any())
+
+        rng = numpy.random.RandomState(0)
+        total_rewards = numpy.zeros(4)
+        kinds = set()
+        steps = 0
+        while not environment.dones.all():
+            actions = _random_actions(rng, masks)
+            kinds.update(numpy.searchsorted([PLAY_OFFSET, ATTACK_OFFSET], actions[~environment.dones], "right"))
+            masks, rewards, dones = environment.step(actions)
+            total_rewards += numpy.abs(rewards)
+            steps += 1
+            self.assertLess(steps, 5000)
+
+        self.assertEqual({0, 1, 2}, kinds)
+        self.assertFalse(masks.any())
+        for game, reward in zip(environment.games, total_rewards):
+            self.assertTrue(game.game_ended)
+            self.assertEqual(0 if game.players[0].hero.dead and game.players[1].hero.dead else 1, reward)
+
+        environment.reset([1])
+        self.assertEqual([True, False, True, True], list(environment.dones))
+        self.assertTrue(masks[1].any())
+
+    def test_seeded_games_repeat(self):
+        hashes = []
+        for run in range(0, 2):
+            environment = VectorEnvironment(self.decks, 3, seed=11)
+            masks = environment.reset()
+            rng = numpy.random.RandomState(5)
+            for step in range(0, 60):
+                masks = environment.step(_random_actions(rng, masks))[0]
+            hashes.append([game.state_hash() for game in environment.games])
+        self.assertEqual(hashes[0], hashes[1])
+
+    def test_illegal_actions(self):
+        environment = VectorEnvironment(self.decks, 2, seed=0)
+        masks = environment.reset()
+        illegal = numpy.flatnonzero(~masks[1])[0]
+        before = [game.state_hash() for game in environment.games]
+        self.assertRaises(ValueError, environment.step, numpy.array([END_TURN, illegal]))
+        self.assertRaises(ValueError, environment.step, numpy.array([END_TURN]))
+        self.assertEqual(before, [game.state_hash() for game in environment.games])
+
+    def test_actions_are_distinct(self):
+        environment = VectorEnvironment(self.decks, 8, seed=20)
+        masks = environment.reset()
+        rng = numpy.random.RandomState(1)
+        for step in range(0, 40):
+            for game, mask in zip(environment.games, masks):
+                moves = game.legal_moves()
+                actions = [action_index(game, move) for move in moves]
+                self.assertEqual(len(moves), len(set(actions)))
+                self.assertEqual(sorted(actions), list(numpy.flatnonzero(mask)))
+            masks = environment.step(_random_actions(rng, masks))[0]
+
+    def test_observe(self):
+        environment = VectorEnvironment(self.decks, 3, seed=0)
+        environment.reset()
+        arrays = environment.observe()
+        self.assertEqual(3, len(arrays["players"]))
+        for game, hand in zip(environment.games, arrays["hands"]):
+            self.assertEqual(len(game.current_player.hand), numpy.count_nonzero(hand[0]))
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestGameEnvironment(unittest.TestCase):
+    def setUp(self):
+        self.decks = [load_deck("example.hsdeck"), load_deck("zoo.hsdeck")]
+
+    def _play(self, environment, seed):
+        rng = numpy.random.RandomState(seed)
+        observation = environment.reset(seed)
+        players = observation["players"]
+        done = False
+        moves = 0
+        while not done:
+            self.assertIs(players, observation["players"])
+            action = _random_actions(rng, environment.mask[numpy.newaxis])[0]
+            observation, reward, done, mask = environment.step(action)
+            self.assertIs(environment.mask, mask)
+            if not done:
+                self.assertEqual(0, reward)
+            moves += 1
+        return moves, reward
+
+    def test_self_play(self):
+        environment = GameEnvironment(self.decks)
+        moves, reward = self._play(environment, 2)
+        game = environment.game
+        self.assertTrue(game.game_ended)
+        self.assertFalse(environment.mask.any())
+        self.assertEqual(-1 if game.current_player.hero.dead else 1, reward)
+        self.assertRaises(ValueError, environment.step, END_TURN)
+        self.assertEqual((moves, reward), self._play(environment, 2))
+
+    def test_opponent(self):
+        opponent = RandomAgent()
+        environment = GameEnvironment(self.decks, opponent)
+        for seed in range(0, 4):
+            observation = environment.reset(seed)
+            player = environment.game.current_player
+            self.assertIsNot(opponent, player.agent)
+            self.assertEqual(player.hero.health, observation["players"][0, PLAYER_FEATURES.index("health")])
+
+            moves, reward = self._play(environment, seed)
+            player = [player for player in environment.game.players if player.agent is not opponent][0]
+            self.assertEqual(1 if player.opponent.hero.dead else -1, reward)
+
+    def test_choices_are_actions(self):
+        game = generate_game_for(DruidOfTheClaw, StonetuskBoar, PlayoutAgent, DoNothingAgent)
+        game._start_turn()
+        if not isinstance(game.current_player.agent, PlayoutAgent):
+            game._start_turn()
+        player = game.current_player
+        player.mana = 5
+        StonetuskBoar().summon(player, game, 0)
+        moves = {action_index(game, move): move for move in game.legal_moves()}
+        first_card = [action for action in moves
+                      if PLAY_OFFSET <= action < PLAY_OFFSET + MAX_OPTIONS * BOARD_POSITIONS * TARGET_SLOTS]
+        # Cat or bear form, on either side of the Boar
+        self.assertEqual(2 * 2, len(first_card))
+
+        moves[PLAY_OFFSET + (1 * BOARD_POSITIONS + 0) * TARGET_SLOTS].play(game)
+        self.assertEqual(["Druid of the Claw (bear)", "Stonetusk Boar"],
+                         [minion.card.ref_name for minion in player.minions])
+        player.mana = 5
+        moves = {action_index(game, move): move for move in game.legal_moves()}
+        moves[PLAY_OFFSET + (0 * BOARD_POSITIONS + 2) * TARGET_SLOTS].play(game)
+        self.assertEqual(["Druid of the Claw (bear)", "Stonetusk Boar", "Druid of the Claw (cat)"],
+                         [minion.card.ref_name for minion in player.minions])
@@ -1,13 +1,23 @@
+import json
 import random
 import unittest
 
-from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
+from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent, RandomAgent
+from hearthbreaker.agents.mcts_agent import PlayoutAgent
 from hearthbreaker.cards.minions.rogue import AnubarAmbusher
 from tests.agents.testing_agents import CardTestingAgent, OneCardPlayingAgent, PlayAndAttackAgent
 from hearthbreaker.constants import CHARACTER_CLASS
 from tests.testing_utils import generate_game_for, mock
-from hearthbreaker.cards import StonetuskBoar, ArcaneIntellect, Naturalize, Abomination, NerubianEgg, SylvanasWindrunner
-from hearthbreaker.game_objects import Game, Deck, Bindable, card_lookup, SecretCard
+from hearthbreaker.cards import StonetuskBoar, ArcaneIntellect, Naturalize, Abomination, NerubianEgg, \
+    SylvanasWindrunner, Nourish, RiverCrocolisk, RaidLeader, StormwindChampion, DireWolfAlpha, AbusiveSergeant, \
+    AncientOfLore, MirrorEntity, ArcaniteReaper, Fireball, MountainGiant, VentureCoMercenary, SoulOfTheForest
+from hearthbreaker.constants import MINION_TYPE
+from hearthbreaker.game_objects import Game, Deck, Bindable, card_lookup, SecretCard, GameException
+from hearthbreaker.simulation import load_deck
+from hearthbreaker.tags.base import Aura
+from hearthbreaker.tags.condition import Adjacent, IsType, Not
+from hearthbreaker.tags.selector import MinionSelector, EnemyPlayer, CurrentPlayer
+from hearthbreaker.tags.status import ChangeAttack
 
 
 class TestGame(unittest.TestCase):
@@ -146,6 +156,26 @@ class TestGame(unittest.TestCase):
         self.assertEqual(2, len(game.current_player.minions))
         self.assertEqual(26, game.other_player.hero.health)
 
+    def test_copy_shares_drawn_cards(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        deck = game.players[0].deck
+        card = game.players[0].hand[0]
+
+        copied_deck = deck.copy()
+        self.assertEqual(deck.left, copied_deck.left)
+        self.assertIn(card, copied_deck.cards)
+        for original, copied in zip(deck.cards, copied_deck.cards):
+            self.assertEqual(original.drawn, copied.drawn)
+            if not original.drawn:
+                self.assertIsNot(original, copied)
+
+        # Putting a shared card back must not change the copy
+        game.players[0].put_back(card)
+        self.assertEqual(deck.left, copied_deck.left + 1)
+        self.assertTrue(card.drawn)
+        self.assertNotIn(card, deck.cards)
+        self.assertIn(card, copied_deck.cards)
+
     def test_deathrattle_ordering(self):
         game = generate_game_for(SylvanasWindrunner, [Abomination, NerubianEgg],
                                  OneCardPlayingAgent, OneCardPlayingAgent)
@@ -166,6 +196,460 @@ class TestGame(unittest.TestCase):
         self.assertEqual(1, len(game.current_player.minions))
 
 
+class TestDeck(unittest.TestCase):
+    def setUp(self):
+        self.game = Game([load_deck("example.hsdeck"), load_deck("zoo.hsdeck")], [DoNothingAgent(), DoNothingAgent()],
+                         1857)
+        self.deck = self.game.players[0].deck
+
+    def check_draws(self, deck, expected):
+        """
+        Check that drawing from the deck gives the same cards as choosing from the undrawn cards would
+        """
+        for draw in range(0, 10):
+            state = self.game.rng.getstate()
+            undrawn = [card for card in expected.cards if not card.drawn]
+            index = self.game.random_amount(0, len(undrawn) - 1)
+            self.game.rng.setstate(state)
+            self.assertEqual(undrawn[index].name, deck.draw(self.game).name)
+            undrawn[index].drawn = True
+            self.assertEqual(len(undrawn) - 1, deck.left)
+
+    def test_cards_created_when_needed(self):
+        copied = self.deck.copy()
+        self.assertEqual([None] * 30, copied._cards)
+        card = copied.draw(self.game)
+        self.assertEqual(1, len([c for c in copied._cards if c is not None]))
+        self.assertIs(card, copied.copy()._cards[copied._cards.index(card)])
+        self.assertEqual(self.deck.card_names(), copied.card_names())
+
+    def test_draw_matches_checking_every_card(self):
+        expected = self.deck.copy()
+        expected.cards
+        self.check_draws(self.deck, expected)
+        self.check_draws(self.deck.copy(), expected.copy())
+
+    def test_take_and_put_back(self):
+        card = self.deck.undrawn_cards()[5]
+        self.deck.take(card)
+        self.assertTrue(card.drawn)
+        self.assertEqual(29, self.deck.left)
+        self.assertNotIn(card, self.deck.undrawn_cards())
+        self.assertRaises(GameException, self.deck.take, card)
+        self.assertRaises(GameException, self.deck.take, StonetuskBoar())
+
+        copied = self.deck.copy()
+        self.deck.put_back(card)
+        self.assertEqual(30, self.deck.left)
+        self.assertEqual(card.name, self.deck.undrawn_cards()[5].name)
+        self.assertIsNot(card, self.deck.undrawn_cards()[5])
+        self.assertEqual(29, len(copied.undrawn_cards()))
+        self.assertRaises(GameException, self.deck.put_back, self.deck.undrawn_cards()[0])
+
+    def test_cards_marked_drawn_directly(self):
+        for card in self.deck.cards[1:]:
+            card.drawn = True
+        self.assertEqual([self.deck.cards[0]], self.deck.undrawn_cards())
+        self.assertIs(self.deck.cards[0], self.deck.draw(self.game))
+        copied = self.deck.copy()
+        copied.left = 1
+        self.assertRaises(GameException, copied.draw, self.game)
+
+    def test_serialization(self):
+        card = self.deck.draw(self.game)
+        deck = Deck.__from__to_json__(json.loads(json.dumps(self.deck.__to_json__())), CHARACTER_CLASS.MAGE)
+        self.assertEqual(self.deck.__to_json__(), deck.__to_json__())
+        self.assertEqual(29, deck.left)
+        self.assertEqual([c.name for c in self.deck.undrawn_cards()], [c.name for c in deck.undrawn_cards()])
+        self.assertEqual(card.name, deck.cards[self.deck.cards.index(card)].name)
+
+
+class TestCardPrototypes(unittest.TestCase):
+    def test_create_matches_constructor(self):
+        for card_type in [AbusiveSergeant, Naturalize, AnubarAmbusher, AncientOfLore, MirrorEntity, ArcaniteReaper]:
+            made = card_type()
+            created = card_type.create()
+            self.assertIs(card_type, type(created))
+            for name in ["name", "mana", "character_class", "rarity", "targetable", "get_targets", "filter_func",
+                         "overload", "drawn", "option_count"]:
+                self.assertEqual(getattr(made, name), getattr(created, name))
+            self.assertIsNot(created.events, card_type.create().events)
+            self.assertIsNot(created.targets, card_type.create().targets)
+
+    def test_played_tags_not_shared(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        game.play_single_turn()
+        player = game.current_player
+        player.mana = 10
+        first = StonetuskBoar().summon(player, game, 0)
+        second = StonetuskBoar().summon(player, game, 1)
+        player.agent.choose_target = mock.Mock(side_effect=[first, second])
+        sergeants = [AbusiveSergeant.create(), AbusiveSergeant.create()]
+        for card in sergeants:
+            player.hand.append(card)
+            game.play_card(card)
+        self.assertEqual(3, first.calculate_attack())
+        self.assertEqual(3, second.calculate_attack())
+
+        game.play_single_turn()
+        game.play_single_turn()
+        self.assertEqual(1, first.calculate_attack())
+        self.assertEqual(1, second.calculate_attack())
+        self.assertIsNot(sergeants[0].battlecry, sergeants[1].battlecry)
+
+
+class TestDelayedTriggers(unittest.TestCase):
+    def setUp(self):
+        self.game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        player = self.game.players[0]
+        self.minions = [StonetuskBoar().summon(player, self.game, index) for index in range(0, 3)]
+        self.order = []
+        for minion in self.minions:
+            minion.bind("test", lambda value, minion=minion: self.order.append((self.minions.index(minion), value)))
+
+    def test_activated_in_order_born(self):
+        self.minions[2].delayed_trigger("test", "a")
+        self.minions[0].delayed_trigger("test", "b")
+        self.minions[2].delayed_trigger("test", "c")
+        self.minions[1].delayed_trigger("test", "d")
+        self.assertEqual([], self.order)
+        self.game.check_delayed()
+        self.assertEqual([(0, "b"), (1, "d"), (2, "a"), (2, "c")], self.order)
+        self.game.check_delayed()
+        self.assertEqual(4, len(self.order))
+
+    def test_triggers_queued_while_activating(self):
+        # Events for characters which haven't been activated yet are part of the same pass, the rest wait for the next
+        self.minions[0].bind_once("test", lambda value: self.minions[2].delayed_trigger("test", "later"))
+        self.minions[1].bind_once("test", lambda value: self.minions[0].delayed_trigger("test", "next"))
+        self.minions[1].bind_once("test", lambda value: self.minions[1].delayed_trigger("test", "again"))
+        self.minions[0].delayed_trigger("test", "a")
+        self.minions[1].delayed_trigger("test", "b")
+        self.game.check_delayed()
+        self.assertEqual([(0, "a"), (1, "b"), (1, "again")], self.order)
+        self.game.check_delayed()
+        self.assertEqual([(0, "a"), (1, "b"), (1, "again"), (0, "next"), (2, "later")], self.order)
+
+
+class TestPlayabilityCache(unittest.TestCase):
+    def setUp(self):
+        self.game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        self.game.play_single_turn()
+        self.player = self.game.current_player
+        self.player.mana = 10
+
+    def test_targets_follow_board(self):
+        fireball = Fireball()
+        self.assertTrue(fireball.can_use(self.player, self.game))
+        self.assertEqual(2, len(fireball.targets))
+        checkpoint = self.game.checkpoint()
+
+        boar = StonetuskBoar().summon(self.player, self.game, 0)
+        self.assertTrue(fireball.can_use(self.player, self.game))
+        self.assertEqual(3, len(fireball.targets))
+        self.assertIn(boar, fireball.targets)
+
+        self.game.rollback(checkpoint)
+        self.assertTrue(fireball.can_use(self.player, self.game))
+        self.assertEqual(2, len(fireball.targets))
+
+    def test_other_games_keep_caches(self):
+        fireball = Fireball()
+        self.assertTrue(fireball.can_use(self.player, self.game))
+        targets = fireball.targets
+        version = self.game.state_version
+        other = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        other.play_single_turn()
+        self.assertEqual(version, self.game.state_version)
+        self.assertTrue(fireball.can_use(self.player, self.game))
+        self.assertIs(targets, fireball.targets)
+
+        # Rolling back never takes the version back to one which cached results could have been kept for
+        checkpoint = self.game.checkpoint()
+        self.player.hero.damage(1, None)
+        changed = self.game.state_version
+        self.game.rollback(checkpoint)
+        self.assertGreater(self.game.state_version, changed)
+
+    def test_mana_cost_follows_auras(self):
+        giant = MountainGiant()
+        cost = giant.mana_cost(self.player)
+        mercenary = VentureCoMercenary().summon(self.player, self.game, 0)
+        self.assertEqual(cost + 3, giant.mana_cost(self.player))
+        self.assertEqual(4, AbusiveSergeant().mana_cost(self.player))
+        mercenary.die(None)
+        self.game.check_delayed()
+        self.assertEqual(cost, giant.mana_cost(self.player))
+        self.assertEqual(1, AbusiveSergeant().mana_cost(self.player))
+
+
+class TestStateHash(unittest.TestCase):
+    def setUp(self):
+        self.game = Game([load_deck("example.hsdeck"), load_deck("zoo.hsdeck")], [RandomAgent(), RandomAgent()], 41)
+        self.game.pre_game()
+        self.game.current_player = self.game.players[1]
+        for turn in range(0, 10):
+            self.game.play_single_turn()
+
+    def test_same_for_copies_and_json(self):
+        player = self.game.current_player
+        reaper = ArcaniteReaper()
+        weapon = reaper.create_weapon(player)
+        weapon.card = reaper
+        weapon.equip(player)
+        state_hash = self.game.state_hash()
+        self.assertEqual(state_hash, self.game.state_hash())
+        copied = self.game.copy()
+        self.assertEqual(state_hash, copied.state_hash())
+        copied.state_changed()
+        self.assertEqual(state_hash, copied.state_hash())
+        game_json = json.loads(json.dumps(self.game, default=lambda o: o.__to_json__()))
+        loaded = Game.__from_json__(game_json, [DoNothingAgent(), DoNothingAgent()])
+        self.assertEqual(state_hash, loaded.state_hash())
+
+    def test_follows_changes(self):
+        state_hash = self.game.state_hash()
+        checkpoint = self.game.checkpoint()
+        StonetuskBoar().summon(self.game.current_player, self.game, 0)
+        summoned = self.game.state_hash()
+        self.assertNotEqual(state_hash, summoned)
+        self.game.current_player.minions[0].damage(1, None)
+        self.assertNotEqual(summoned, self.game.state_hash())
+        self.game.rollback(checkpoint)
+        self.assertEqual(state_hash, self.game.state_hash())
+
+    def test_deck_order_ignored(self):
+        decks = [Deck([StonetuskBoar(), RiverCrocolisk()] * 15, CHARACTER_CLASS.MAGE),
+                 Deck([RiverCrocolisk(), StonetuskBoar()] * 15, CHARACTER_CLASS.MAGE)]
+        game = Game(decks, [DoNothingAgent(), DoNothingAgent()], 0)
+        game.players[0].deck, game.players[1].deck = game.players[1].deck, game.players[0].deck
+        swapped = game.state_hash()
+        game.players[0].deck, game.players[1].deck = game.players[1].deck, game.players[0].deck
+        game.state_changed()
+        self.assertEqual(swapped, game.state_hash())
+
+    def test_covers_what_can_be_done(self):
+        player = self.game.current_player
+        player.mana = 10
+        player.hero.power.used = False
+        self.game.state_changed()
+        fresh = self.game.copy()
+        used = self.game.copy()
+        used.current_player.hero.power.use()
+        used.current_player.mana = 10
+        used.current_player.overload = 2
+        used.state_changed()
+        self.assertNotEqual(len(fresh.legal_moves()), len(used.legal_moves()))
+        self.assertNotEqual(fresh.state_hash(), used.state_hash())
+
+        # The differences survive being copied and saved
+        self.assertEqual(used.state_hash(), used.copy().state_hash())
+        game_json = json.loads(json.dumps(used, default=lambda o: o.__to_json__()))
+        loaded = Game.__from_json__(game_json, [DoNothingAgent(), DoNothingAgent()])
+        self.assertEqual(used.state_hash(), loaded.state_hash())
+        self.assertEqual(2, loaded.current_player.overload)
+        self.assertTrue(loaded.current_player.hero.power.used)
+
+    def test_covers_deathrattles(self):
+        StonetuskBoar().summon(self.game.current_player, self.game, 0)
+        plain = self.game.copy()
+        forest = self.game.copy()
+        SoulOfTheForest().use(forest.current_player, forest)
+        forest.state_changed()
+        self.assertEqual(plain.current_player.minions[0].calculate_attack(),
+                         forest.current_player.minions[0].calculate_attack())
+        self.assertNotEqual(plain.state_hash(), forest.state_hash())
+
+        game_json = json.loads(json.dumps(forest, default=lambda o: o.__to_json__()))
+        loaded = Game.__from_json__(game_json, [DoNothingAgent(), DoNothingAgent()])
+        self.assertEqual(forest.state_hash(), loaded.state_hash())
+
+
+class TestLegalMoves(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _start_turn(self, game, turn):
+        for index in range(0, turn):
+            game.play_single_turn()
+        game._start_turn()
+        game.current_player.agent = PlayoutAgent()
+        return game
+
+    def test_plays_attacks_and_power(self):
+        game = self._start_turn(generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent), 2)
+        moves = [move.to_output_string() for move in game.legal_moves()]
+        self.assertEqual(['summon(0,0)', 'summon(1,0)', 'summon(2,0)', 'summon(3,0)', 'summon(4,0)',
+                          'power(p2)', 'power(p1)', 'end()'], moves)
+
+        game.legal_moves()[0].play(game)
+        moves = [move.to_output_string() for move in game.legal_moves()]
+        self.assertIn('summon(0,1)', moves)
+        self.assertIn('attack(p1:0,p2)', moves)
+        self.assertNotIn('power(p2)', moves)
+
+        game.legal_moves()[moves.index('attack(p1:0,p2)')].play(game)
+        self.assertEqual(29, game.other_player.hero.health)
+        moves = [move.to_output_string() for move in game.legal_moves()]
+        self.assertNotIn('attack(p1:0,p2)', moves)
+        self.assertEqual(['summon(0,0)', 'summon(0,1)'], moves[:2])
+
+    def test_choose_one(self):
+        game = self._start_turn(generate_game_for(Nourish, StonetuskBoar, DoNothingAgent, DoNothingAgent), 0)
+        game.current_player.mana = 5
+        moves = game.legal_moves()
+        self.assertEqual(['play(0:0)', 'play(0:1)', 'play(1:0)', 'play(1:1)', 'play(2:0)', 'play(2:1)', 'play(3:0)',
+                          'play(3:1)', 'power()', 'end()'], [move.to_output_string() for move in moves])
+
+        moves[1].play(game)
+        self.assertEqual(6, len(game.current_player.hand))
+        self.assertEqual(1, game.current_player.max_mana)
+
+    def test_moves_compare_equal(self):
+        game = self._start_turn(generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent), 2)
+        self.assertEqual(game.legal_moves(), game.copy().legal_moves())
+        self.assertEqual(len(game.legal_moves()), len(set(game.legal_moves())))
+
+        game.game_ended = True
+        self.assertEqual([], game.legal_moves())
+
+
+class TestSeededGame(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _make_game(self, seed):
+        deck1 = load_deck("example.hsdeck")
+        deck2 = load_deck("zoo.hsdeck")
+        return Game([deck1, deck2], [RandomAgent(), RandomAgent()], seed)
+
+    def _describe(self, game):
+        return [(player.hero.health, player.hero.armor, len(player.hand), player.deck.left,
+                 [(minion.card.name, minion.health, minion.calculate_attack()) for minion in player.minions])
+                for player in game.players]
+
+    def test_seeded_games_match(self):
+        game1 = self._make_game(42)
+        game2 = self._make_game(42)
+        game1.pre_game()
+        game2.pre_game()
+        game1.current_player = game1.players[1]
+        game2.current_player = game2.players[1]
+        while not game1.game_ended:
+            game1.play_single_turn()
+            random.random()  # Using the global generator shouldn't affect a seeded game
+            game2.play_single_turn()
+            self.assertEqual(self._describe(game1), self._describe(game2))
+        self.assertTrue(game2.game_ended)
+
+    def test_seeded_copies_match(self):
+        game = self._make_game(1234)
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, 8):
+            game.play_single_turn()
+
+        copy1 = game.copy()
+        copy2 = game.copy()
+        self.assertIsNot(copy1.rng, copy2.rng)
+        copy1.start()
+        copy2.start()
+        self.assertEqual(self._describe(copy1), self._describe(copy2))
+
+    def test_seed_survives_serialization(self):
+        game = self._make_game(77)
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, 6):
+            game.play_single_turn()
+
+        game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+        loaded = Game.__from_json__(game_json, [RandomAgent(), RandomAgent()])
+        self.assertEqual(game.rng.getstate(), loaded.rng.getstate())
+        self.assertEqual(game.rng.random(), loaded.rng.random())
+
+    def test_unseeded_game_uses_global_random(self):
+        game = self._make_game(None)
+        self.assertNotIn('random_state', game.__to_json__())
+        random.seed(99)
+        first = game.random_amount(0, 1000)
+        random.seed(99)
+        self.assertEqual(first, game.copy().random_amount(0, 1000))
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _make_game(self, seed, turns):
+        game = Game([load_deck("example.hsdeck"), load_deck("zoo.hsdeck")], [RandomAgent(), RandomAgent()], seed)
+        game.pre_game()
+        game.current_player = game.players[1]
+        for turn in range(0, turns):
+            game.play_single_turn()
+        return game
+
+    def _state(self, game):
+        game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+        for player in game_json['players']:
+            player['graveyard'].sort()
+        return game_json
+
+    def test_rollback_restores_state(self):
+        game = self._make_game(31, 10)
+        minions = [minion for player in game.players for minion in player.minions]
+        before = self._state(game)
+
+        checkpoint = game.checkpoint()
+        while not game.game_ended:
+            game.play_single_turn()
+        self.assertNotEqual(before, self._state(game))
+
+        game.rollback(checkpoint)
+        self.assertEqual(before, self._state(game))
+        self.assertEqual(minions, [minion for player in game.players for minion in player.minions])
+
+    def test_rollback_replays_identically(self):
+        game = self._make_game(5, 8)
+        checkpoint = game.checkpoint()
+        while not game.game_ended:
+            game.play_single_turn()
+        result = self._state(game)
+
+        for attempt in range(0, 2):
+            game.rollback(checkpoint)
+            while not game.game_ended:
+                game.play_single_turn()
+            self.assertEqual(result, self._state(game))
+
+    def test_rollback_other_game(self):
+        game = self._make_game(2, 0)
+        checkpoint = game.checkpoint()
+        self.assertRaises(GameException, game.copy().rollback, checkpoint)
+
+    def test_rollback_restores_slots(self):
+        game = self._make_game(31, 10)
+        minion = [minion for player in game.players for minion in player.minions][0]
+        hero = game.players[1].hero
+        health = minion.health
+        armor = hero.armor
+        del hero.current_target
+        checkpoint = game.checkpoint()
+
+        minion.health = 100
+        del minion.current_target
+        hero.armor = 7
+        hero.current_target = minion
+        minion.can_attack = lambda: False
+        game.rollback(checkpoint)
+
+        self.assertEqual(health, minion.health)
+        self.assertIsNone(minion.current_target)
+        self.assertEqual(armor, hero.armor)
+        self.assertFalse(hasattr(hero, 'current_target'))
+        self.assertNotIn('can_attack', minion.__dict__)
+
+
 class TestBinding(unittest.TestCase):
     def test_bind(self):
         event = mock.Mock()
@@ -189,3 +673,139 @@ class TestBinding(unittest.TestCase):
         binder.trigger("test")
         event.assert_called_once_with(1, 5, 6)
         self.assertEqual(event2.call_count, 2)
+
+    def test_changes_during_trigger(self):
+        calls = []
+        binder = Bindable()
+
+        def first():
+            calls.append("first")
+            binder.unbind("test", third)
+            binder.bind("test", fourth)
+
+        def second():
+            calls.append("second")
+
+        def third():
+            calls.append("third")
+
+        def fourth():
+            calls.append("fourth")
+            binder.unbind("test", first)
+
+        binder.bind("test", first)
+        binder.bind_once("test", second)
+        binder.bind("test", third)
+        binder.trigger("test")
+        self.assertEqual(["first", "second"], calls)
+        # The copy of fourth bound during this trigger isn't called until the next one
+        binder.trigger("test")
+        self.assertEqual(["first", "second", "first", "fourth"], calls)
+        binder.trigger("test")
+        self.assertEqual(["first", "second", "first", "fourth", "fourth", "fourth"], calls)
+
+        binder.unbind("test", fourth)
+        self.assertNotIn("test", binder.events)
+        binder.bind_once("test", second)
+        binder.trigger("test")
+        self.assertNotIn("test", binder.events)
+
+    def test_trigger_without_copying(self):
+        binder = Bindable()
+        handlers = [mock.Mock() for i in range(0, 5)]
+        for handler in handlers:
+            binder.bind("test", handler)
+        bound = binder.events["test"].handlers
+        with mock.patch("copy.copy") as copy_mock:
+            binder.trigger("test", 1)
+        self.assertFalse(copy_mock.called)
+        self.assertIs(bound, binder.events["test"].handlers)
+        for handler in handlers:
+            handler.assert_called_once_with(1)
+
+    def test_unbind_without_searching(self):
+        compared = []
+
+        class Handler:
+            def __call__(self):
+                pass
+
+            def __eq__(self, other):
+                compared.append(self)
+                return self is other
+
+            def __hash__(self):
+                return id(self)
+
+        binder = Bindable()
+        handlers = [Handler() for i in range(0, 100)]
+        for handler in handlers:
+            binder.bind("test", handler)
+        bound = binder.events["test"].handlers
+
+        # Functions are found through the index rather than by comparing them with each bound one, and the list of
+        # handlers is only rebuilt once most of it has been unbound
+        for handler in handlers[-10:]:
+            binder.unbind("test", handler)
+        self.assertEqual([], compared)
+        self.assertIs(bound, binder.events["test"].handlers)
+        self.assertEqual(90, binder.events["test"].live)
+
+
+class TestAuras(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def test_stable_selectors(self):
+        self.assertTrue(MinionSelector().stable)
+        self.assertTrue(MinionSelector(Not(IsType(MINION_TYPE.BEAST)), EnemyPlayer()).stable)
+        self.assertFalse(MinionSelector(Adjacent()).stable)
+        self.assertFalse(MinionSelector(players=CurrentPlayer()).stable)
+
+    def test_placing_and_removing_minions(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        player = game.players[0]
+        for card in [RiverCrocolisk(), RaidLeader(), StormwindChampion(), DireWolfAlpha()]:
+            card.summon(player, game, len(player.minions))
+        RiverCrocolisk().summon(game.players[1], game, 0)
+        self.assertEqual([4, 3, 8, 4], [minion.calculate_attack() for minion in player.minions])
+        self.assertEqual([4, 3, 6, 3], [minion.calculate_max_health() for minion in player.minions])
+        self.assertEqual([2], [minion.calculate_attack() for minion in game.players[1].minions])
+
+        RiverCrocolisk().summon(player, game, 3)
+        self.assertEqual([4, 3, 7, 5, 4], [minion.calculate_attack() for minion in player.minions])
+        self.assertEqual([4, 3, 6, 4, 3], [minion.calculate_max_health() for minion in player.minions])
+
+        player.minions[2].die(None)
+        game.check_delayed()
+        self.assertEqual([3, 2, 4, 3], [minion.calculate_attack() for minion in player.minions])
+        self.assertEqual([3, 2, 3, 2], [minion.calculate_max_health() for minion in player.minions])
+
+        player.minions[1].silence()
+        self.assertEqual([2, 2, 3, 2], [minion.calculate_attack() for minion in player.minions])
+
+    def test_removing_duplicate_auras(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        player = game.players[0]
+        RaidLeader().summon(player, game, 0)
+        RaidLeader().summon(player, game, 1)
+        player.minions[0].die(None)
+        game.check_delayed()
+
+        RiverCrocolisk().summon(player, game, 1)
+        self.assertEqual(1, len(player.minion_auras))
+        self.assertEqual([2, 3], [minion.calculate_attack() for minion in player.minions])
+
+    def test_structure(self):
+        aura = Aura(ChangeAttack(1), MinionSelector(IsType(MINION_TYPE.BEAST)))
+        same = Aura(ChangeAttack(1), MinionSelector(IsType(MINION_TYPE.BEAST)))
+        different = Aura(ChangeAttack(1), MinionSelector(IsType(MINION_TYPE.MURLOC)))
+        self.assertTrue(aura.eq(same))
+        self.assertEqual(hash(aura.structure()), hash(same.structure()))
+        self.assertFalse(aura.eq(different))
+        self.assertIs(aura.selector.structure(), aura.selector.structure())
+
+        amount = ChangeAttack(1)
+        before = amount.structure()
+        amount.amount = 2
+        self.assertNotEqual(before, amount.structure())
@@ -0,0 +1,84 @@
+import io
+import json
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import PredictableAgent
+from hearthbreaker.cards import StonetuskBoar
+from hearthbreaker.game_objects import Bindable, Game, GameException
+from hearthbreaker.profiling import Profiler
+from hearthbreaker.simulation import run_batch
+from tests.testing_utils import generate_game_for
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def test_counts_events_and_handlers(self):
+        calls = []
+
+        def handler(value):
+            calls.append(value)
+
+        bindable = Bindable()
+        bindable.bind("test", handler)
+        profiler = Profiler()
+        with profiler:
+            bindable.trigger("test", 1)
+            bindable.trigger("test", 2)
+            bindable.trigger("nothing bound")
+
+        self.assertEqual([1, 2], calls)
+        report = profiler.report()
+        self.assertEqual(2, report['events']['test']['count'])
+        self.assertEqual(1, report['events']['nothing bound']['count'])
+        self.assertEqual(2, report['handlers'][handler.__qualname__])
+
+    def test_disable_restores_engine(self):
+        trigger = Bindable.__dict__["trigger"]
+        copy = Game.__dict__["copy"]
+        from_json = Game.__dict__["__from_json__"]
+        profiler = Profiler()
+        profiler.enable()
+        self.assertRaises(GameException, Profiler().enable)
+        profiler.disable()
+
+        self.assertIs(trigger, Bindable.__dict__["trigger"])
+        self.assertIs(copy, Game.__dict__["copy"])
+        self.assertIs(from_json, Game.__dict__["__from_json__"])
+        Bindable().trigger("test")
+        self.assertEqual({}, profiler.report()['events'])
+
+    def test_times_agents_and_copies(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, PredictableAgent, PredictableAgent)
+        profiler = Profiler()
+        with profiler:
+            profiler.watch(game)
+            for turn in range(0, 6):
+                game.play_single_turn()
+            game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+            Game.__from_json__(game_json, [PredictableAgent(), PredictableAgent()])
+            game.copy()
+
+        timings = profiler.report()['timings']
+        self.assertEqual(6, timings['do_turn']['count'])
+        self.assertEqual(1, timings['copy']['count'])
+        self.assertEqual(1, timings['deserialize']['count'])
+        self.assertGreater(timings['serialize']['count'], 1)
+        self.assertIn("turn_started", profiler.report()['events'])
+
+        dumped = io.StringIO()
+        profiler.dump(dumped)
+        self.assertEqual(profiler.report(), json.loads(dumped.getvalue()))
+
+    def test_batch(self):
+        for workers in [1, 2]:
+            profiler = Profiler()
+            results = [result for chunk in run_batch("example.hsdeck", "zoo.hsdeck", 6, workers=workers,
+                                                     chunk_size=2, profiler=profiler)
+                       for result in chunk]
+            report = profiler.report()
+            self.assertEqual(sum(result['turns'] for result in results), report['timings']['do_turn']['count'])
+            self.assertEqual(6, report['timings']['copy']['count'])
+            self.assertGreater(report['events']['turn_started']['count'], 0)
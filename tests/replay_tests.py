@@ -1,4 +1,7 @@
 import json
+import os
+import shutil
+import tempfile
 import unittest
 from io import StringIO
 from os import listdir
@@ -7,11 +10,12 @@ import re
 import random
 from hearthbreaker.game_objects import Game, Deck
 
-from hearthbreaker.replay import Replay, record, playback
+from hearthbreaker.replay import Replay, record, playback, ReplayWriter, read_replays
 from hearthbreaker.agents.basic_agents import PredictableAgent, RandomAgent
 from hearthbreaker.constants import CHARACTER_CLASS
 from hearthbreaker.cards import *
 import hearthbreaker.game_objects
+import hearthbreaker.simulation
 from tests.agents.testing_agents import PlayAndAttackAgent, OneCardPlayingAgent
 from tests.testing_utils import StackedDeck
 
@@ -189,3 +193,79 @@ class TestReplay(unittest.TestCase):
         replay = record(game)
         game.start()
         replay.write(StringIO())
+
+
+class TestStreamingReplay(unittest.TestCase):
+    def _make_game(self, seed):
+        decks = [hearthbreaker.simulation.load_deck("example.hsdeck"), hearthbreaker.simulation.load_deck("zoo.hsdeck")]
+        return Game(decks, [RandomAgent(), RandomAgent()], seed)
+
+    def _replay_json(self, replay):
+        output = StringIO()
+        replay.write_json(output)
+        return json.loads(output.getvalue())
+
+    def test_streamed_replays_match(self):
+        expected = []
+        for seed in range(0, 3):
+            game = self._make_game(seed)
+            replay = record(game)
+            game.start()
+            expected.append(self._replay_json(replay))
+
+        output = StringIO()
+        with ReplayWriter(output) as writer:
+            for seed in range(0, 3):
+                game = self._make_game(seed)
+                replay = writer.record(game)
+                game.start()
+                writer.finish(replay)
+
+        replays = read_replays(StringIO(output.getvalue()))
+        self.assertEqual(expected, [self._replay_json(replay) for replay in replays])
+
+    def test_truncated_replay(self):
+        output = StringIO()
+        writer = ReplayWriter(output)
+        game = self._make_game(5)
+        replay = writer.record(game)
+        game.pre_game()
+        for turn in range(0, 6):
+            game.play_single_turn()
+        writer.close()
+
+        lines = output.getvalue().splitlines()
+        self.assertIn('header', json.loads(lines[0]))
+        replays = list(read_replays(StringIO(output.getvalue())))
+        self.assertEqual(1, len(replays))
+        self.assertEqual(len(replay._moves) - 1, len(replays[0]._moves))
+        self.assertEqual(len(lines) - 1, len(replays[0]._moves))
+
+    def test_broken_record(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "replays.jsonl")
+            for seed in range(0, 2):
+                with ReplayWriter(path) as writer:
+                    game = self._make_game(seed)
+                    replay = writer.record(game)
+                    game.start()
+                    writer.finish(replay)
+                if seed == 0:
+                    with open(path) as replay_file:
+                        lines = replay_file.read().splitlines(True)
+                    # Cut the game off half way through one of its moves, as if the writer had been killed
+                    cut = len(lines) // 2
+                    broken = "".join(lines[:cut]) + lines[cut][:len(lines[cut]) // 2]
+                    with open(path, "w") as replay_file:
+                        replay_file.write(broken)
+
+            game = self._make_game(1)
+            expected = record(game)
+            game.start()
+            replays = list(read_replays(path))
+            self.assertEqual(2, len(replays))
+            self.assertEqual(cut - 1, len(replays[0]._moves))
+            self.assertEqual(self._replay_json(expected), self._replay_json(replays[1]))
+        finally:
+            shutil.rmtree(directory)
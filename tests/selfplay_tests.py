@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy
+    from hearthbreaker.environment import ACTION_COUNT, END_TURN
+    from hearthbreaker.selfplay import generate, read_shards, read_manifest, MANIFEST
+except ImportError:  # NumPy is optional
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestSelfPlay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _generate(self, games, directory=None, **kwargs):
+        settings = {"workers": 1, "chunk_size": 2, "shard_rows": 60}
+        settings.update(kwargs)
+        return generate(directory or self.directory, "example.hsdeck", "zoo.hsdeck", games, **settings)
+
+    def test_records_legal_moves(self):
+        manifest = self._generate(5, masks=True)
+        self.assertEqual([0, 2, 4], [chunk["seed"] for chunk in manifest["chunks"]])
+        self.assertEqual([2, 2, 1], [chunk["games"] for chunk in manifest["chunks"]])
+
+        rows = 0
+        for chunk in manifest["chunks"]:
+            for shard in chunk["shards"]:
+                self.assertLessEqual(shard["rows"], 60)
+                rows += shard["rows"]
+        seeds = set()
+        ends = 0
+        for shard in read_shards(self.directory):
+            rows -= len(shard["actions"])
+            masks = numpy.unpackbits(shard["masks"], axis=1)[:, :ACTION_COUNT].astype(bool)
+            self.assertTrue(masks[numpy.arange(len(shard["actions"])), shard["actions"]].all())
+            self.assertEqual(len(shard["actions"]), len(shard["players"]))
+            self.assertTrue(set(shard["outcomes"]) <= {-1, 0, 1})
+            seeds.update(shard["seeds"])
+            ends += (shard["actions"] == END_TURN).sum()
+        self.assertEqual(0, rows)
+        self.assertEqual(set(range(0, 5)), seeds)
+        self.assertGreater(ends, 5 * 8)
+
+    def test_repeatable_across_workers(self):
+        self._generate(4, compression="lzma")
+        other = tempfile.mkdtemp()
+        try:
+            self._generate(4, other, workers=2, compression="lzma")
+            shards = [shard for chunk in read_manifest(other)["chunks"] for shard in chunk["shards"]]
+            self.assertTrue(all(shard["file"].endswith(".npz.xz") for shard in shards))
+            for first, second in zip(read_shards(self.directory), read_shards(other)):
+                self.assertEqual(sorted(first), sorted(second))
+                for name in first:
+                    numpy.testing.assert_array_equal(first[name], second[name])
+        finally:
+            shutil.rmtree(other)
+
+    def test_resume(self):
+        self._generate(4)
+        manifest_path = os.path.join(self.directory, MANIFEST)
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        # Pretend the run was interrupted during the second chunk
+        first_shard = os.path.join(self.directory, manifest["chunks"][0]["shards"][0]["file"])
+        modified = os.path.getmtime(first_shard)
+        del manifest["chunks"][1]
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        manifest = self._generate(6)
+        self.assertEqual([0, 2, 4], [chunk["seed"] for chunk in manifest["chunks"]])
+        self.assertEqual(manifest, read_manifest(self.directory))
+        self.assertEqual(modified, os.path.getmtime(first_shard))
+        self.assertEqual(set(range(0, 6)), {seed for shard in read_shards(self.directory) for seed in shard["seeds"]})
+
+        self.assertRaises(ValueError, self._generate, 6, agents=("Trade", "Random"))
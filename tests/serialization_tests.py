@@ -1,6 +1,13 @@
 import json
-from hearthbreaker.game_objects import Game
+import marshal
+import random
+import unittest
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.cards import StonetuskBoar, FlameImp
+from hearthbreaker.game_objects import Game, card_table
+from hearthbreaker.serialization import binary
 import tests.copy_tests
+from tests.testing_utils import generate_game_for, mock
 
 
 class TestGameSerialization(tests.copy_tests.TestGameCopying):
@@ -43,3 +50,87 @@ class TestMinionSerialization(tests.copy_tests.TestMinionCopying):
     def tearDown(self):
         super().tearDown()
         Game.copy = self._old_copy
+
+
+def binary_copy(old_game):
+    data = binary.serialize(old_game, compress=True)
+    game = binary.deserialize(data, [player.agent for player in old_game.players])
+    game._has_turn_ended = old_game._has_turn_ended
+    return game
+
+
+class TestGameBinarySerialization(tests.copy_tests.TestGameCopying):
+    def setUp(self):
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = binary_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestMinionBinarySerialization(tests.copy_tests.TestMinionCopying):
+    def setUp(self):
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = binary_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def test_matches_json(self):
+        random.seed(1857)
+        game = generate_game_for(StonetuskBoar, FlameImp, RandomAgent, RandomAgent)
+        for turn in range(0, 8):
+            game.play_single_turn()
+
+        game_json = json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+        for compress in [False, True]:
+            for fast in [False, True]:
+                self.assertEqual(game_json, binary.decode(binary.encode(game, compress, fast)))
+        self.assertLess(len(binary.encode(game)), len(json.dumps(game, default=lambda o: o.__to_json__())))
+        self.assertLess(len(binary.encode(game)), len(binary.encode(game, fast=True)))
+
+    def test_strings(self):
+        # Card names are written as numbers, and other strings in full only the first time
+        data = binary.encode(["Stonetusk Boar", "Flame Imp"])
+        self.assertNotIn(b"Stonetusk", data)
+        self.assertEqual(["Stonetusk Boar", "Flame Imp"], binary.decode(data))
+        self.assertLess(len(binary.encode(["Stonetusk Boar"] * 50)), 50 * 3 + 20)
+        self.assertLess(len(binary.encode(["not a card"] * 50)), len(binary.encode(["not a card"])) + 50 * 3)
+        self.assertEqual(["not a card", {"not a card": "é"}] * 3,
+                         binary.decode(binary.encode(["not a card", {"not a card": "é"}] * 3)))
+
+    def test_stable_encoding(self):
+        tree = {"a": [1, -200, 2.5, None, True, False, "b", "a", 300, [2 ** 32 - 1] * 16]}
+        data = binary.encode(tree)
+        fast_data = binary.encode(tree, fast=True)
+        self.assertEqual(b"\x0a\x01\x06\x01a\x09\x0a\x11\x04\xc8\x01\x05\x00\x00\x00\x00\x00\x00\x04@"
+                         b"\x00\x02\x01\x06\x01b\x07\x00\x03\xac\x02\x0b\x10" + b"\xff" * 64, data[9:])
+        # Only the fast format depends on the version of Python
+        with mock.patch("marshal.version", marshal.version + 1):
+            self.assertEqual(tree, binary.decode(data))
+            self.assertRaises(ValueError, binary.decode, fast_data)
+
+    def test_card_table(self):
+        names = binary.card_names()
+        self.assertIsNone(names[0])
+        self.assertEqual(len(card_table) + 1, len(names))
+        data = binary.encode(["Wisp", "Stonetusk Boar"])
+        # Data written before the cards changed can still be read with the names from then
+        changed = names[:1] + names[2:] + names[1:2]
+        self.assertRaises(ValueError, binary.decode, data, changed)
+        self.assertEqual(["Wisp", "Stonetusk Boar"], binary.decode(data, names))
+
+    def test_bad_data(self):
+        data = binary.encode({"a": [1, -200, 2.5, None, True, "b"]})
+        self.assertEqual({"a": [1, -200, 2.5, None, True, "b"]}, binary.decode(data))
+        self.assertRaises(ValueError, binary.decode, b"{}")
+        self.assertRaises(ValueError, binary.decode, data[:3] + bytes([data[3] + 1]) + data[4:])
+        self.assertRaises(ValueError, binary.decode, data[:-1])
+        self.assertRaises(ValueError, binary.decode, data + b"\x00")
+        self.assertRaises(ValueError, binary.decode, data[:9] + b"\x0f")
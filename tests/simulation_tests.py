@@ -0,0 +1,40 @@
+import unittest
+from hearthbreaker.simulation import run_batch, GameRunner, load_deck
+from hearthbreaker.constants import CHARACTER_CLASS
+
+
+class TestBatchSimulation(unittest.TestCase):
+
+    def test_load_deck(self):
+        deck = load_deck("zoo.hsdeck")
+        self.assertEqual(30, len(deck.cards))
+        self.assertEqual(CHARACTER_CLASS.WARLOCK, deck.character_class)
+
+    def test_single_process_batch(self):
+        results = [result for chunk in run_batch("example.hsdeck", "zoo.hsdeck", 10, workers=1, chunk_size=4)
+                   for result in chunk]
+        self.assertEqual(10, len(results))
+        self.assertEqual(list(range(0, 10)), [result['seed'] for result in results])
+        for result in results:
+            self.assertIn(result['winner'], [0, 1, None])
+            self.assertGreater(result['turns'], 0)
+            self.assertGreater(len(result['cards_played']), 0)
+
+    def test_chunks(self):
+        chunks = [chunk for chunk in run_batch("example.hsdeck", "zoo.hsdeck", 10, workers=1, chunk_size=4)]
+        self.assertEqual([4, 4, 2], [len(chunk) for chunk in chunks])
+
+    def test_multiple_processes_match_single_process(self):
+        single = [result for chunk in run_batch("example.hsdeck", "zoo.hsdeck", 12, workers=1, chunk_size=3, seed=50)
+                  for result in chunk]
+        multiple = [result for chunk in run_batch("example.hsdeck", "zoo.hsdeck", 12, workers=2, chunk_size=3,
+                                                  seed=50)
+                    for result in chunk]
+        multiple.sort(key=lambda r: r['seed'])
+        self.assertEqual(single, multiple)
+
+    def test_reproduce_single_seed(self):
+        results = [result for chunk in run_batch("example.hsdeck", "zoo.hsdeck", 5, workers=1, seed=20)
+                   for result in chunk]
+        runner = GameRunner(["example.hsdeck", "zoo.hsdeck"], ["Random", "Random"], 20)
+        self.assertEqual(results[3], runner.play(23))